@@ -1,7 +1,14 @@
-from .mechanical import RobotArm, ArmRotation, ClawControl, WheelServoController, SolarPanel
-from .sensors import EnvironmentalSensors, EnvironmentalSensor, LiDARScanner
-from .ai import AIModule, VisionAIModule, ShapeVolumeDetection
-from .control import RobotController, AutonomousDecisionEngine, SafetySystem, PowerMonitor
+from .mechanical import RobotArm, ArmRotation, ClawControl, WheelServoController, SolarPanel, ArmTrajectory
+from .sensors import EnvironmentalSensors, EnvironmentalSensor, LiDARScanner, EnvironmentRuleTable, SensorTimeSeries
+from .ai import AIModule, VisionAIModule, ShapeVolumeDetection, StreamingAnomalyDetector
+from .control import RobotController, AutonomousDecisionEngine, SafetySystem, PowerMonitor, SafetyRuleEngine
+from .perception import PerceptionPipeline
+from .acquisition import AcquisitionScheduler, AcquisitionSource, SharedFrameRing
+from .eventlog import EventLog
+from .mission_log import MissionRecorder, MissionLog, MissionReplay
+from .metrics import MetricsRegistry, REGISTRY
+from .profiler import SamplingProfiler
+from .telemetry import telemetry, Telemetry, RingSink, JsonLinesSink, ConsoleSink
 
 __all__ = [
     'RobotArm',
@@ -9,14 +16,35 @@ __all__ = [
     'ClawControl',
     'WheelServoController',
     'SolarPanel',
+    'ArmTrajectory',
     'EnvironmentalSensors',
     'EnvironmentalSensor',
     'LiDARScanner',
+    'EnvironmentRuleTable',
+    'SensorTimeSeries',
     'AIModule',
     'VisionAIModule',
     'ShapeVolumeDetection',
+    'StreamingAnomalyDetector',
     'RobotController',
     'AutonomousDecisionEngine',
     'SafetySystem',
-    'PowerMonitor'
+    'PowerMonitor',
+    'SafetyRuleEngine',
+    'PerceptionPipeline',
+    'AcquisitionScheduler',
+    'AcquisitionSource',
+    'SharedFrameRing',
+    'EventLog',
+    'MissionRecorder',
+    'MissionLog',
+    'MissionReplay',
+    'MetricsRegistry',
+    'REGISTRY',
+    'SamplingProfiler',
+    'telemetry',
+    'Telemetry',
+    'RingSink',
+    'JsonLinesSink',
+    'ConsoleSink'
 ] 
\ No newline at end of file
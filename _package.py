@@ -0,0 +1,43 @@
+"""
+Load the repository root as the ``robotics`` package.
+
+The root is itself the package (see __init__.py), but vehicle.py and app.py
+run as top-level scripts and import their sibling modules directly. Modules
+with process-wide state, such as the metrics registry, must still be loaded
+only once, under their package name, or the dashboard would serve a
+different registry from the one the package records into. Scripts, tests
+and benchmarks reach the package through load_package().
+
+Kept free of package-relative imports so scripts can use it directly.
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PACKAGE_NAME = "robotics"
+
+
+def load_package():
+    """Import the repository root as the ``robotics`` package (once per process)."""
+    if PACKAGE_NAME in sys.modules:
+        return sys.modules[PACKAGE_NAME]
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE_NAME, os.path.join(ROOT, "__init__.py"), submodule_search_locations=[ROOT]
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE_NAME] = package
+    try:
+        spec.loader.exec_module(package)
+    except BaseException:
+        del sys.modules[PACKAGE_NAME]
+        raise
+    return package
+
+
+def load_module(name):
+    """Import one module of the package, e.g. ``load_module("metrics")``."""
+    load_package()
+    return importlib.import_module(f"{PACKAGE_NAME}.{name}")
@@ -0,0 +1,362 @@
+"""
+Fixed-rate sensor acquisition.
+
+AcquisitionScheduler samples each registered source at its own rate on a
+worker thread and publishes timestamped frames into a SharedFrameRing, a
+ring buffer in multiprocessing.shared_memory. Readers in the same process
+(the control loop) or another one (app.py) attach to the ring by name and
+read frames through NumPy views without copying through a pipe.
+
+This module only depends on NumPy and the standard library so that app.py
+can import it directly.
+"""
+
+import heapq
+import os
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+MAX_SOURCES = 16
+NAME_BYTES = 32
+
+HEADER_DTYPE = np.dtype([
+    ("write_seq", np.int64),
+    ("capacity", np.int64),
+    ("max_values", np.int64),
+    ("n_sources", np.int64),
+    ("latest", np.int64, (MAX_SOURCES,)),
+    ("names", f"S{NAME_BYTES}", (MAX_SOURCES,)),
+])
+HEADER_BYTES = (HEADER_DTYPE.itemsize + 63) // 64 * 64
+
+# Rings created by this process (or the one it was forked from), which share
+# its resource tracker registration.
+_OWNED = set()
+
+
+def _attach_untracked(name):
+    """
+    Open an existing segment without handing it to this process's resource
+    tracker, which would otherwise unlink the producer's ring when a reader
+    exits (Python < 3.13 registers every SharedMemory, not just creators).
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    shm = shared_memory.SharedMemory(name=name)
+    if os.name == "posix" and shm.name not in _OWNED:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _slot_dtype(max_values):
+    return np.dtype([
+        ("seq", np.int64),
+        ("source", np.int32),
+        ("count", np.int32),
+        ("deadline", np.float64),
+        ("timestamp", np.float64),
+        ("values", np.float64, (max_values,)),
+    ])
+
+
+class SharedFrameRing:
+    """
+    Single-writer ring of sensor frames in shared memory.
+
+    Each slot holds a sequence number, source id, value count, the
+    scheduled deadline (monotonic clock), the wall-clock timestamp and up
+    to max_values float64 values. The writer marks a slot with seq = -1
+    while filling it, so readers can detect torn reads and retry.
+    """
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((), dtype=HEADER_DTYPE, buffer=shm.buf)
+        self.capacity = int(self.header["capacity"])
+        self.max_values = int(self.header["max_values"])
+        self.slots = np.ndarray(
+            (self.capacity,), dtype=_slot_dtype(self.max_values), buffer=shm.buf, offset=HEADER_BYTES
+        )
+
+    @classmethod
+    def create(cls, source_names, capacity=1024, max_values=360, name=None):
+        if len(source_names) > MAX_SOURCES:
+            raise ValueError(f"At most {MAX_SOURCES} sources are supported")
+        size = HEADER_BYTES + capacity * _slot_dtype(max_values).itemsize
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=shm.buf)
+        header["write_seq"] = -1
+        header["capacity"] = capacity
+        header["max_values"] = max_values
+        header["n_sources"] = len(source_names)
+        header["latest"] = -1
+        for i, source in enumerate(source_names):
+            header["names"][i] = source.encode()[:NAME_BYTES]
+        _OWNED.add(shm.name)
+        ring = cls(shm, owner=True)
+        ring.slots["seq"] = -1
+        return ring
+
+    @classmethod
+    def attach(cls, name):
+        """Open an existing ring created by another process or thread."""
+        return cls(_attach_untracked(name), owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def source_names(self):
+        n = int(self.header["n_sources"])
+        return [raw.decode() for raw in self.header["names"][:n]]
+
+    def source_id(self, source):
+        return self.source_names.index(source)
+
+    def publish(self, source_id, values, timestamp, deadline=0.0):
+        """Write one frame; values beyond max_values are dropped."""
+        seq = int(self.header["write_seq"]) + 1
+        slot = self.slots[seq % self.capacity]
+        slot["seq"] = -1
+        count = min(len(values), self.max_values)
+        slot["values"][:count] = values[:count]
+        slot["count"] = count
+        slot["source"] = source_id
+        slot["deadline"] = deadline
+        slot["timestamp"] = timestamp
+        slot["seq"] = seq
+        self.header["latest"][source_id] = seq
+        self.header["write_seq"] = seq
+        return seq
+
+    def _read(self, seq):
+        slot = self.slots[seq % self.capacity]
+        if int(slot["seq"]) != seq:
+            return None
+        frame = {
+            "seq": seq,
+            "source": self.source_names[int(slot["source"])],
+            "timestamp": float(slot["timestamp"]),
+            "values": slot["values"][: int(slot["count"])].copy(),
+        }
+        return frame if int(slot["seq"]) == seq else None
+
+    def latest(self, source):
+        """Most recent frame for a source as a dict, or None."""
+        seq = int(self.header["latest"][self.source_id(source)])
+        return self._read(seq) if seq >= 0 else None
+
+    def latest_view(self, source):
+        """
+        Zero-copy view of the newest values for a source, plus its sequence
+        number. The view is overwritten once the ring wraps; compare
+        slot_seq(seq) with seq after use to detect that.
+        """
+        seq = int(self.header["latest"][self.source_id(source)])
+        if seq < 0:
+            return None, -1
+        slot = self.slots[seq % self.capacity]
+        return slot["values"][: int(slot["count"])], seq
+
+    def slot_seq(self, seq):
+        return int(self.slots[seq % self.capacity]["seq"])
+
+    def read_since(self, cursor=-1):
+        """
+        Frames published after cursor, oldest first.
+
+        Returns:
+            (frames, cursor): list of frame dicts and the cursor to pass next
+            time. Frames overwritten before they could be read are skipped.
+        """
+        write_seq = int(self.header["write_seq"])
+        start = max(cursor + 1, write_seq - self.capacity + 1, 0)
+        frames = []
+        for seq in range(start, write_seq + 1):
+            frame = self._read(seq)
+            if frame is not None:
+                frames.append(frame)
+        return frames, write_seq
+
+    def close(self):
+        # Drop NumPy views before closing the mapping.
+        self.header = None
+        self.slots = None
+        self.shm.close()
+        if self.owner:
+            _OWNED.discard(self.shm.name)
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                # Already removed (e.g. by a reader's tracker on an older
+                # Python); still withdraw our own cleanup registration.
+                if os.name == "posix":
+                    resource_tracker.unregister(self.shm._name, "shared_memory")
+
+
+class AcquisitionSource:
+    def __init__(self, name, rate_hz, sample):
+        if rate_hz <= 0:
+            raise ValueError("rate_hz must be positive")
+        self.name = name
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.sample = sample
+
+
+def environment_source(sensor, rate_hz=1.0):
+    """Sample EnvironmentalSensor.read_all_sensors(); values follow the readings key order."""
+    channels = tuple(sensor.readings)
+
+    def sample():
+        readings = sensor.read_all_sensors()
+        return [readings[channel] for channel in channels]
+
+    return AcquisitionSource("environment", rate_hz, sample)
+
+
+def lidar_source(scanner):
+    """Run LiDARScanner.perform_scan() at scanner.scan_frequency; values are distances by angle."""
+    def sample():
+        scanner.perform_scan()
+        return [distance for _, distance in scanner.last_scan_data]
+
+    return AcquisitionSource("lidar", scanner.scan_frequency, sample)
+
+
+def power_source(monitor, read_level, rate_hz=1.0):
+    """Feed read_level() into PowerMonitor.update_battery_level()."""
+    def sample():
+        monitor.update_battery_level(read_level())
+        return [monitor.battery_level]
+
+    return AcquisitionSource("power", rate_hz, sample)
+
+
+def encoder_source(wheels, read_encoder, rate_hz=50.0):
+    """Feed read_encoder() into WheelServoController.update_encoder_feedback()."""
+    def sample():
+        wheels.update_encoder_feedback(read_encoder())
+        return [wheels.encoder_feedback, wheels.current_speed]
+
+    return AcquisitionSource("encoder", rate_hz, sample)
+
+
+class AcquisitionScheduler:
+    """
+    Samples every source on its own fixed-rate schedule.
+
+    Deadlines are kept on the monotonic clock and advance by whole periods,
+    so a slow sample does not shift later deadlines; any periods that are
+    already past when a sample finishes are counted as missed and skipped.
+    """
+
+    def __init__(self, sources, ring=None, capacity=1024, max_values=360, clock=time.monotonic):
+        self.sources = list(sources)
+        names = [source.name for source in self.sources]
+        if len(set(names)) != len(names):
+            raise ValueError("Source names must be unique")
+        self.ring = ring or SharedFrameRing.create(names, capacity=capacity, max_values=max_values)
+        self._source_ids = {name: self.ring.source_id(name) for name in names}
+        self.clock = clock
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {name: self._new_stats() for name in names}
+
+    @staticmethod
+    def _new_stats():
+        return {
+            "samples": 0,
+            "missed_deadlines": 0,
+            "errors": 0,
+            "jitter_sum": 0.0,
+            "jitter_max": 0.0,
+            "sample_time_max": 0.0,
+        }
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="acquisition", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_for(self, seconds):
+        """Run the schedule on the calling thread for the given duration."""
+        self._stop.clear()
+        self._run(until=self.clock() + seconds)
+
+    def _run(self, until=None):
+        now = self.clock()
+        queue = [(now, i) for i in range(len(self.sources))]
+        heapq.heapify(queue)
+        while not self._stop.is_set():
+            deadline, index = queue[0]
+            if until is not None and deadline >= until:
+                return
+            delay = deadline - self.clock()
+            if delay > 0 and self._stop.wait(delay):
+                return
+            source = self.sources[index]
+            stats = self._stats[source.name]
+            started = self.clock()
+            try:
+                values = source.sample()
+            except Exception:
+                stats["errors"] += 1
+                values = None
+            finished = self.clock()
+            if values is not None:
+                self.ring.publish(self._source_ids[source.name], values, time.time(), deadline)
+                stats["samples"] += 1
+            jitter = started - deadline
+            stats["jitter_sum"] += jitter
+            stats["jitter_max"] = max(stats["jitter_max"], jitter)
+            stats["sample_time_max"] = max(stats["sample_time_max"], finished - started)
+
+            next_deadline = deadline + source.period
+            if finished > next_deadline:
+                skipped = int((finished - next_deadline) // source.period) + 1
+                stats["missed_deadlines"] += skipped
+                next_deadline += skipped * source.period
+            heapq.heapreplace(queue, (next_deadline, index))
+
+    def get_stats(self):
+        """
+        Per-source timing statistics.
+
+        Returns:
+            Dictionary of source name to samples, missed_deadlines, errors,
+            mean/max start jitter (seconds) and max sample duration
+        """
+        report = {}
+        for source in self.sources:
+            stats = self._stats[source.name]
+            attempts = stats["samples"] + stats["errors"]
+            report[source.name] = {
+                "rate_hz": source.rate_hz,
+                "samples": stats["samples"],
+                "missed_deadlines": stats["missed_deadlines"],
+                "errors": stats["errors"],
+                "jitter_mean": stats["jitter_sum"] / attempts if attempts else 0.0,
+                "jitter_max": stats["jitter_max"],
+                "sample_time_max": stats["sample_time_max"],
+            }
+        return report
+
+    def close(self):
+        self.stop()
+        self.ring.close()
@@ -1,39 +1,192 @@
 import time
 import random
 import math
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+
+from .sensors import EnvironmentRuleTable
+from .telemetry import telemetry
+
+# First matching rule wins; anything else is "normal".
+ENVIRONMENT_PATTERN_RULES = [
+    ("fire_risk", [("temperature", ">", 70), ("humidity", "<", 20)]),
+    ("anomaly_noise", [("sound_level", ">", 90)]),
+]
+
+_PATTERN_MESSAGES = {
+    "fire_risk": "Possible fire conditions detected.",
+    "anomaly_noise": "Possible wildlife or machinery detected.",
+}
+
+class StreamingAnomalyDetector:
+    """
+    Online per-sensor z-score outlier detector.
+
+    Keeps a running count, mean and sum of squared deviations per sensor
+    (Welford's algorithm), so memory and per-sample cost stay constant no
+    matter how long the mission runs. Each sample is scored against the
+    statistics of the samples before it, then folded in. Flagged samples go
+    into a fixed-size ring buffer.
+
+    The standard deviation used for scoring is floored at the larger of
+    min_std and min_relative_std * |mean|, so a sensor that has been
+    perfectly constant (std 0) still flags its first jump instead of never
+    being scored. min_std is a number, or a dict of per-sensor floors with
+    DEFAULT_MIN_STD for sensors not in it.
+    """
+
+    DEFAULT_MIN_STD = 1e-6
+
+    def __init__(self, z_threshold=4.0, min_samples=30, log_size=1000, min_std=DEFAULT_MIN_STD,
+                 min_relative_std=1e-6):
+        self.z_threshold = z_threshold
+        self.min_samples = min_samples
+        self.min_std = min_std
+        self.min_relative_std = min_relative_std
+        self.stats = {}  # sensor -> [count, mean, m2]
+        self.anomalies = deque(maxlen=log_size)
+
+    def _min_std(self, sensor):
+        if isinstance(self.min_std, dict):
+            return self.min_std.get(sensor, self.DEFAULT_MIN_STD)
+        return self.min_std
+
+    def update(self, readings, timestamp=None):
+        """Score one reading dict, fold it into the statistics and return the anomalous sensors."""
+        timestamp = time.time() if timestamp is None else timestamp
+        flagged = []
+        for key, value in readings.items():
+            state = self.stats.get(key)
+            if state is None:
+                state = self.stats[key] = [0, 0.0, 0.0]
+            count, mean, m2 = state
+            if count >= self.min_samples:
+                std = max(math.sqrt(m2 / (count - 1)), self._min_std(key), self.min_relative_std * abs(mean))
+                z = abs(value - mean) / std if std > 0.0 else 0.0
+                if z > self.z_threshold:
+                    flagged.append(key)
+                    self.anomalies.append((timestamp, key, value, z))
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            state[0] = count
+            state[1] = mean
+            state[2] = m2 + delta * (value - mean)
+        return flagged
+
+    def update_batch(self, sensors, values, timestamps=None):
+        """
+        Score and fold in a batch of readings in one vectorized pass.
+
+        Args:
+            sensors: Sequence of sensor names, one per column
+            values: Array of shape (n_samples, len(sensors))
+            timestamps: Optional array of n_samples timestamps
+
+        Returns:
+            Boolean array of shape (n_samples, len(sensors)) marking outliers
+
+        Results match calling update() row by row: sample i is scored
+        against the existing statistics combined with rows 0..i-1.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim != 2 or values.shape[1] != len(sensors):
+            raise ValueError("values must have shape (n_samples, len(sensors))")
+        n = values.shape[0]
+        if n == 0:
+            return np.zeros((0, len(sensors)), dtype=bool)
+        if timestamps is None:
+            timestamps = np.full(n, time.time())
+
+        prior = np.array([self.stats.get(key, (0, 0.0, 0.0)) for key in sensors], dtype=np.float64).reshape(-1, 3)
+        count0, mean0, m2_0 = prior[:, 0], prior[:, 1], prior[:, 2]
+
+        # Exclusive prefix sums of deviations from the prior mean. Combining
+        # the prior (count0, mean0, m2_0) with i new samples gives
+        #   mean = mean0 + s1 / N,  m2 = m2_0 + s2 - s1**2 / N,  N = count0 + i
+        dev = values - mean0
+        s1 = np.zeros((n + 1, len(sensors)))
+        s2 = np.zeros((n + 1, len(sensors)))
+        np.cumsum(dev, axis=0, out=s1[1:])
+        np.cumsum(dev * dev, axis=0, out=s2[1:])
+        counts = count0 + np.arange(n + 1)[:, None]
+        safe_counts = np.maximum(counts, 1)
+        means = mean0 + s1 / safe_counts
+        m2s = np.maximum(m2_0 + s2 - s1 * s1 / safe_counts, 0.0)
+
+        before_counts, before_means, before_m2 = counts[:-1], means[:-1], m2s[:-1]
+        floors = np.array([self._min_std(key) for key in sensors], dtype=np.float64)
+        std = np.sqrt(before_m2 / np.maximum(before_counts - 1, 1))
+        std = np.maximum(np.maximum(std, floors), self.min_relative_std * np.abs(before_means))
+        ready = (before_counts >= self.min_samples) & (std > 0.0)
+        z = np.abs(values - before_means) / np.where(ready, std, 1.0)
+        flagged = ready & (z > self.z_threshold)
+
+        for col, key in enumerate(sensors):
+            self.stats[key] = [int(counts[-1, col]), float(means[-1, col]), float(m2s[-1, col])]
+        for row, col in zip(*np.nonzero(flagged)):
+            self.anomalies.append((float(timestamps[row]), sensors[col], float(values[row, col]), float(z[row, col])))
+        return flagged
+
+    def get_stats(self, sensor):
+        """Return mean and standard deviation seen so far for sensor, or None if unseen."""
+        state = self.stats.get(sensor)
+        if state is None:
+            return None
+        count, mean, m2 = state
+        std = math.sqrt(m2 / (count - 1)) if count > 1 else 0.0
+        return {"count": count, "mean": mean, "std": std}
+
+    def reset(self, sensor=None):
+        if sensor is None:
+            self.stats.clear()
+        else:
+            self.stats.pop(sensor, None)
 
 class AIModule:
-    def __init__(self):
-        self.anomaly_log = []
+    def __init__(self, anomaly_log_size=1000):
+        self.anomaly_log = deque(maxlen=anomaly_log_size)
+        self.anomaly_detector = StreamingAnomalyDetector(log_size=anomaly_log_size)
+        self._last_anomaly_sample = None
+        self.pattern_rules = EnvironmentRuleTable(ENVIRONMENT_PATTERN_RULES)
 
     def detect_environment_pattern(self, env_readings):
-        if env_readings["temperature"] > 70 and env_readings["humidity"] < 20:
-            print("[AI] Possible fire conditions detected.")
-            return "fire_risk"
-        if env_readings["sound_level"] > 90:
-            print("[AI] Possible wildlife or machinery detected.")
-            return "anomaly_noise"
-        return "normal"
+        pattern = self.pattern_rules.classify(env_readings)
+        if pattern in _PATTERN_MESSAGES:
+            telemetry.warning("AI", pattern, _PATTERN_MESSAGES[pattern])
+        return pattern
+
+    def detect_environment_pattern_batch(self, columns):
+        """
+        Classify a columnar batch of readings (channel -> array) in one pass.
+
+        Returns:
+            (labels, counts): per-row pattern labels and a {pattern: count} dict
+        """
+        return self.pattern_rules.classify_batch(columns)
 
     def detect_sensor_anomaly(self, history):
-        if len(history) < 2:
+        if not history:
             return None
-        prev = history[-2][1]
-        latest = history[-1][1]
-        anomalies = []
-        for key in latest:
-            if abs(latest[key] - prev.get(key, latest[key])) > 30:
-                anomalies.append(key)
+        timestamp, latest = history[-1]
+        # Callers pass the whole history each time; only fold in new samples.
+        if timestamp == self._last_anomaly_sample:
+            return None
+        self._last_anomaly_sample = timestamp
+        anomalies = self.anomaly_detector.update(latest, timestamp)
         if anomalies:
             msg = f"[AI] Sudden change in: {', '.join(anomalies)}"
-            print(msg)
+            telemetry.warning("AI", "sensor_anomaly", "Sudden change in: {sensors}", sensors=", ".join(anomalies))
             self.anomaly_log.append((time.time(), msg))
             return msg
         return None
 
     def predict_action(self, battery_level, light_level):
         if battery_level < 25 and light_level < 100:
-            print("[AI] Predicting: Enter low power mode.")
+            telemetry.info("AI", "predict_pause", "Predicting: Enter low power mode.",
+                           battery_level=battery_level, light_level=light_level)
             return "pause_mission"
         return "continue"
 
@@ -44,49 +197,116 @@ class VisionAIModule:
     def detect_shape(self):
         return random.choice(self.detected_shapes)
 
+    def detect_batch(self, frames):
+        """Detector backend hook for PerceptionPipeline: one shape per frame."""
+        return [self.detect_shape() for _ in frames]
+
+# shape -> (default dimensions, volume formula). Formulas only use arithmetic
+# and math.pi, so they work on floats and NumPy arrays alike.
+SHAPE_VOLUMES = {
+    "cube": ({"edge_length": 10.0}, lambda edge_length: edge_length ** 3),
+    "rectangular_prism": ({"length": 10.0, "width": 8.0, "height": 6.0},
+                          lambda length, width, height: length * width * height),
+    "sphere": ({"radius": 5.0}, lambda radius: (4 / 3) * math.pi * radius ** 3),
+    "cylinder": ({"radius": 5.0, "height": 20.0}, lambda radius, height: math.pi * radius ** 2 * height),
+    "cone": ({"radius": 5.0, "height": 20.0}, lambda radius, height: (1 / 3) * math.pi * radius ** 2 * height),
+}
+
+GRASP_TOO_LIGHT = "too_light"
+GRASP_OK = "graspable"
+GRASP_TOO_HEAVY = "too_heavy"
+GRASP_UNKNOWN = "unknown"
+
+@lru_cache(maxsize=4096)
+def _shape_volume(shape, dimensions):
+    defaults, formula = SHAPE_VOLUMES[shape]
+    params = dict(defaults)
+    params.update(dimensions)
+    return float(formula(**params))
+
 class ShapeVolumeDetection:
     def __init__(self, claw_volume_min_kg=0.0, claw_volume_max_kg=10.0):
         self.claw_volume_min_kg = claw_volume_min_kg
         self.claw_volume_max_kg = claw_volume_max_kg
 
+    def supports(self, shape):
+        return shape in SHAPE_VOLUMES
+
+    def volume(self, shape, **dimensions):
+        """Volume of a shape; unspecified dimensions use the shape's defaults. Results are memoized."""
+        if shape not in SHAPE_VOLUMES:
+            raise ValueError(f"Unknown shape: {shape}")
+        return _shape_volume(shape, tuple(sorted(dimensions.items())))
+
+    def grasp_verdict(self, volume):
+        if volume < self.claw_volume_min_kg:
+            return GRASP_TOO_LIGHT
+        if volume > self.claw_volume_max_kg:
+            return GRASP_TOO_HEAVY
+        return GRASP_OK
+
+    def evaluate(self, shape, **dimensions):
+        """Volume and grasp verdict for one object."""
+        volume = self.volume(shape, **dimensions)
+        self.evaluate_claw_grip(volume)
+        return volume, self.grasp_verdict(volume)
+
+    def evaluate_batch(self, shapes, dimensions=None):
+        """
+        Volumes and grasp verdicts for many detected objects at once.
+
+        Args:
+            shapes: Sequence or array of shape names, one per object
+            dimensions: Mapping of dimension name (edge_length, length,
+                width, height, radius) to per-object arrays; missing
+                dimensions use the shape defaults
+
+        Returns:
+            Dict with "volume" (NaN for unknown shapes), "verdict" (string
+            array), "graspable" (boolean mask) and "graspable_order"
+            (indices of graspable objects, largest volume first)
+        """
+        shapes = np.asarray(shapes)
+        dimensions = {name: np.asarray(values, dtype=np.float64) for name, values in (dimensions or {}).items()}
+        volumes = np.full(len(shapes), np.nan)
+        for shape, (defaults, formula) in SHAPE_VOLUMES.items():
+            mask = shapes == shape
+            if not mask.any():
+                continue
+            params = {name: dimensions[name][mask] if name in dimensions else default
+                      for name, default in defaults.items()}
+            volumes[mask] = formula(**params)
+
+        known = ~np.isnan(volumes)
+        too_light = known & (volumes < self.claw_volume_min_kg)
+        too_heavy = known & (volumes > self.claw_volume_max_kg)
+        graspable = known & ~too_light & ~too_heavy
+        verdict = np.select([too_light, too_heavy, graspable], [GRASP_TOO_LIGHT, GRASP_TOO_HEAVY, GRASP_OK],
+                            default=GRASP_UNKNOWN)
+        candidates = np.flatnonzero(graspable)
+        order = candidates[np.argsort(-volumes[candidates], kind="stable")]
+        return {"volume": volumes, "verdict": verdict, "graspable": graspable, "graspable_order": order}
+
     def evaluate_claw_grip(self, volume):
         if volume < self.claw_volume_min_kg:
-            print("The object is too light to be picked up by the claw.")
+            verdict = "too light to be picked up by"
         elif volume > self.claw_volume_max_kg:
-            print("The object is too heavy to be picked up by the claw.")
+            verdict = "too heavy to be picked up by"
         else:
-            print("The object can be picked up by the claw.")
+            verdict = "can be picked up by"
+        telemetry.debug("AI", "grip_verdict", "The object is {verdict} the claw.", verdict=verdict, volume=volume)
 
-    def cube_volume(self):
-        edge_length = 10.0
-        volume = pow(edge_length, 3)
-        self.evaluate_claw_grip(volume)
-        return volume
+    def cube_volume(self, edge_length=10.0):
+        return self.evaluate("cube", edge_length=edge_length)[0]
 
-    def rectangular_prism_volume(self):
-        length = 10.0
-        width = 8.0
-        height = 6.0
-        volume = length * width * height
-        self.evaluate_claw_grip(volume)
-        return volume
+    def rectangular_prism_volume(self, length=10.0, width=8.0, height=6.0):
+        return self.evaluate("rectangular_prism", length=length, width=width, height=height)[0]
 
-    def sphere_volume(self):
-        radius = 5.0
-        volume = (4 / 3) * math.pi * pow(radius, 3)
-        self.evaluate_claw_grip(volume)
-        return volume
+    def sphere_volume(self, radius=5.0):
+        return self.evaluate("sphere", radius=radius)[0]
 
-    def cylinder_volume(self):
-        radius = 5.0
-        height = 20.0
-        volume = math.pi * pow(radius, 2) * height
-        self.evaluate_claw_grip(volume)
-        return volume
+    def cylinder_volume(self, radius=5.0, height=20.0):
+        return self.evaluate("cylinder", radius=radius, height=height)[0]
 
-    def cone_volume(self):
-        radius = 5.0
-        height = 20.0
-        volume = (1 / 3) * math.pi * pow(radius, 2) * height
-        self.evaluate_claw_grip(volume)
-        return volume 
\ No newline at end of file
+    def cone_volume(self, radius=5.0, height=20.0):
+        return self.evaluate("cone", radius=radius, height=height)[0]
@@ -1,11 +1,19 @@
 import os
-import json
 from fastapi import FastAPI, Request, HTTPException, Depends, Form
-from fastapi.responses import JSONResponse, HTMLResponse, FileResponse
+from fastapi.responses import JSONResponse, HTMLResponse, FileResponse, Response
 from fastapi.security.api_key import APIKeyHeader
 from typing import Optional
+from acquisition import SharedFrameRing
+from fleet import FileHandlePool, VehicleHandle, VehicleRegistry
+from images import RECON_IMAGE_PATTERN, ImageNotReady, ImageService, not_modified, parse_range
+from _package import load_package
+
+# metrics through the package, so /metrics serves the one registry the package records into.
+load_package()
+from robotics.metrics import CONTENT_TYPE, REGISTRY, MetricsMiddleware  # noqa: E402
 
 app = FastAPI(title="Vehicle Standalone Dashboard")
+app.add_middleware(MetricsMiddleware, registry=REGISTRY, prefix="dashboard")
 
 # Config
 DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../roadmesh'))
@@ -13,12 +21,32 @@ STATUS_FILE = os.path.join(DATA_DIR, 'vehicle_status.json')
 LOG_FILE = os.path.join(DATA_DIR, 'vehicle_logs.txt')
 COMMAND_FILE = os.path.join(DATA_DIR, 'vehicle_commands.json')
 SNAPSHOT_FILE = os.path.join(DATA_DIR, 'latest_image.jpg')
+# Name of the shared-memory ring published by AcquisitionScheduler, if any
+ACQUISITION_RING = os.environ.get("VEHICLE_ACQUISITION_RING")
+# One subdirectory per vehicle, each laid out like DATA_DIR
+FLEET_DIR = os.environ.get("VEHICLE_FLEET_DIR", os.path.join(DATA_DIR, 'vehicles'))
 API_KEY = "changemeapikey"  # Change for production
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+file_pool = FileHandlePool()
+default_vehicle = VehicleHandle("default", DATA_DIR, file_pool)
+fleet = VehicleRegistry(FLEET_DIR)
+images = ImageService()
+
+# The latest snapshot changes in place, so clients must revalidate; recon
+# images are named by timestamp and never rewritten.
+SNAPSHOT_CACHE_CONTROL = "no-cache"
+RECON_CACHE_CONTROL = "private, max-age=86400"
+
+AUTH_OUTCOMES = REGISTRY.counter("dashboard_auth", "API key checks by outcome", ("outcome",))
+_AUTH_ACCEPTED = AUTH_OUTCOMES.labels("accepted")
+_AUTH_REJECTED = AUTH_OUTCOMES.labels("rejected")
+
 def get_api_key(api_key_header: Optional[str] = Depends(api_key_header)):
     if api_key_header != API_KEY:
+        _AUTH_REJECTED.inc()
         raise HTTPException(status_code=403, detail="Invalid API Key")
+    _AUTH_ACCEPTED.inc()
     return api_key_header
 
 @app.get("/", response_class=HTMLResponse)
@@ -36,24 +64,132 @@ def dashboard():
       <button type='submit'>Manual Control</button>
     </form>
     <a href='/logs'>View Logs</a><br>
-    <a href='/camera/snapshot'>Latest Camera Snapshot</a>
+    <a href='/camera/snapshot'>Latest Camera Snapshot</a><br>
+    <a href='/recon/images'>Recon Images</a>
     </body></html>
     """
 
+def _status(vehicle):
+    status = vehicle.status()
+    if status is None:
+        return {"error": "No status available"}
+    return status
+
+def _logs(vehicle):
+    return {"logs": vehicle.logs()}
+
+def _image_response(request, image, cache_control):
+    headers = {
+        "ETag": image.etag,
+        "Last-Modified": image.http_date,
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+    }
+    if not_modified(image, request.headers.get("if-none-match"), request.headers.get("if-modified-since")):
+        return Response(status_code=304, headers=headers)
+    size = len(image.data)
+    if_range = request.headers.get("if-range")
+    # A stale If-Range (the client holds a different version) gets the whole image.
+    if if_range is None or if_range == image.etag:
+        try:
+            span = parse_range(request.headers.get("range"), size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        if span is not None:
+            start, end = span
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            return Response(image.data[start:end + 1], status_code=206, media_type="image/jpeg", headers=headers)
+    return Response(image.data, media_type="image/jpeg", headers=headers)
+
+def _thumbnail_response(request, path, cache_control):
+    if not os.path.exists(path):
+        return JSONResponse({"error": "No image available"}, status_code=404)
+    try:
+        thumbnail = images.thumbnail(path)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=422)
+    if thumbnail is None:
+        return _not_ready("Thumbnail not ready")
+    return _image_response(request, thumbnail, cache_control)
+
+def _not_ready(message):
+    return JSONResponse({"error": message}, status_code=503, headers={"Retry-After": "1"})
+
+def _snapshot(vehicle, request):
+    try:
+        image = images.get(vehicle.snapshot_file)
+    except ImageNotReady as e:
+        return _not_ready(str(e))
+    if image is None:
+        return JSONResponse({"error": "No snapshot available"}, status_code=404)
+    return _image_response(request, image, SNAPSHOT_CACHE_CONTROL)
+
+def _snapshot_thumbnail(vehicle, request):
+    return _thumbnail_response(request, vehicle.snapshot_file, SNAPSHOT_CACHE_CONTROL)
+
+def _recon_images(vehicle, base_url, limit, before):
+    page = images.recon_images(vehicle.data_dir, limit, before)
+    for entry in page["images"]:
+        entry["url"] = f"{base_url}/{entry['name']}"
+        entry["thumbnail_url"] = f"{base_url}/{entry['name']}/thumbnail"
+    # The dashboard asks for these next; start decoding now.
+    images.prefetch_thumbnails(os.path.join(vehicle.data_dir, entry["name"]) for entry in page["images"])
+    return page
+
+def _recon_image_path(vehicle, name):
+    if not RECON_IMAGE_PATTERN.match(name):
+        raise HTTPException(status_code=404, detail=f"Unknown recon image: {name}")
+    return os.path.join(vehicle.data_dir, name)
+
+def _recon_image(vehicle, name, request):
+    try:
+        image = images.get(_recon_image_path(vehicle, name))
+    except ImageNotReady as e:
+        return _not_ready(str(e))
+    if image is None:
+        raise HTTPException(status_code=404, detail=f"Unknown recon image: {name}")
+    return _image_response(request, image, RECON_CACHE_CONTROL)
+
+def _recon_thumbnail(vehicle, name, request):
+    return _thumbnail_response(request, _recon_image_path(vehicle, name), RECON_CACHE_CONTROL)
+
+def _metrics(*textfiles):
+    # The vehicle process has no server of its own; it leaves its exposition in a file.
+    parts = [REGISTRY.render()]
+    for path in textfiles:
+        try:
+            with open(path) as f:
+                parts.append(f.read())
+        except FileNotFoundError:
+            continue
+    return Response("".join(parts), media_type=CONTENT_TYPE)
+
+def _profile(vehicle, duration, interval):
+    cmd = {"action": "profile", "duration": duration}
+    if interval is not None:
+        cmd["interval"] = interval
+    vehicle.send_command(cmd)
+
+def _latest_profile(vehicle):
+    path = vehicle.latest_profile()
+    if path is None:
+        return JSONResponse({"error": "No profile available"}, status_code=404)
+    # Collapsed stacks: feed to flamegraph.pl, speedscope or inferno.
+    return FileResponse(path, media_type="text/plain", filename=os.path.basename(path))
+
+def _fleet_vehicle(vehicle_id):
+    vehicle = fleet.get(vehicle_id)
+    if vehicle is None:
+        raise HTTPException(status_code=404, detail=f"Unknown vehicle: {vehicle_id}")
+    return vehicle
+
 @app.get("/status")
 def get_status():
-    if not os.path.exists(STATUS_FILE):
-        return {"error": "No status available"}
-    with open(STATUS_FILE) as f:
-        return json.load(f)
+    return _status(default_vehicle)
 
 @app.get("/logs")
 def get_logs():
-    if not os.path.exists(LOG_FILE):
-        return {"logs": []}
-    with open(LOG_FILE) as f:
-        logs = f.readlines()
-    return {"logs": logs[-100:]}
+    return _logs(default_vehicle)
 
 @app.post("/control/start")
 def start_vehicle(api_key: str = Depends(get_api_key)):
@@ -70,21 +206,139 @@ def manual_control(direction: str = Form(...), speed: str = Form(...), api_key:
     _write_command({"action": "manual", "direction": direction, "speed": speed})
     return {"result": f"Manual control: {direction} at {speed}"}
 
+@app.post("/control/profile")
+def profile_vehicle(duration: float = Form(10.0), interval: Optional[float] = Form(None),
+                    api_key: str = Depends(get_api_key)):
+    _profile(default_vehicle, duration, interval)
+    return {"result": f"Profile requested for {duration:g} s"}
+
+@app.get("/profile/latest")
+def latest_profile(api_key: str = Depends(get_api_key)):
+    return _latest_profile(default_vehicle)
+
 @app.get("/camera/snapshot")
-def camera_snapshot():
-    if not os.path.exists(SNAPSHOT_FILE):
-        return JSONResponse({"error": "No snapshot available"}, status_code=404)
-    return FileResponse(SNAPSHOT_FILE, media_type="image/jpeg")
+def camera_snapshot(request: Request):
+    return _snapshot(default_vehicle, request)
+
+@app.get("/camera/snapshot/thumbnail")
+def camera_snapshot_thumbnail(request: Request):
+    return _snapshot_thumbnail(default_vehicle, request)
+
+@app.get("/recon/images")
+def list_recon_images(limit: int = 50, before: Optional[int] = None):
+    return _recon_images(default_vehicle, "/recon/images", limit, before)
+
+@app.get("/recon/images/{name}")
+def recon_image(name: str, request: Request):
+    return _recon_image(default_vehicle, name, request)
+
+@app.get("/recon/images/{name}/thumbnail")
+def recon_image_thumbnail(name: str, request: Request):
+    return _recon_thumbnail(default_vehicle, name, request)
+
+@app.get("/metrics")
+def metrics():
+    return _metrics(default_vehicle.metrics_file)
+
+@app.get("/fleet/summary")
+def fleet_summary():
+    return fleet.fleet_summary()
+
+@app.get("/vehicles")
+def list_vehicles():
+    fleet.refresh_if_stale()
+    return {"vehicles": fleet.vehicle_ids()}
+
+@app.get("/vehicles/{vehicle_id}/status")
+def get_vehicle_status(vehicle_id: str):
+    return _status(_fleet_vehicle(vehicle_id))
+
+@app.get("/vehicles/{vehicle_id}/logs")
+def get_vehicle_logs(vehicle_id: str):
+    return _logs(_fleet_vehicle(vehicle_id))
+
+@app.post("/vehicles/{vehicle_id}/control/start")
+def start_fleet_vehicle(vehicle_id: str, api_key: str = Depends(get_api_key)):
+    _fleet_vehicle(vehicle_id).send_command({"action": "start"})
+    return {"result": f"Vehicle {vehicle_id} start command sent"}
+
+@app.post("/vehicles/{vehicle_id}/control/stop")
+def stop_fleet_vehicle(vehicle_id: str, api_key: str = Depends(get_api_key)):
+    _fleet_vehicle(vehicle_id).send_command({"action": "stop"})
+    return {"result": f"Vehicle {vehicle_id} stop command sent"}
+
+@app.post("/vehicles/{vehicle_id}/control/manual")
+def manual_control_fleet_vehicle(vehicle_id: str, direction: str = Form(...), speed: str = Form(...),
+                                 api_key: str = Depends(get_api_key)):
+    _fleet_vehicle(vehicle_id).send_command({"action": "manual", "direction": direction, "speed": speed})
+    return {"result": f"Vehicle {vehicle_id} manual control: {direction} at {speed}"}
+
+@app.post("/vehicles/{vehicle_id}/control/profile")
+def profile_fleet_vehicle(vehicle_id: str, duration: float = Form(10.0), interval: Optional[float] = Form(None),
+                          api_key: str = Depends(get_api_key)):
+    _profile(_fleet_vehicle(vehicle_id), duration, interval)
+    return {"result": f"Vehicle {vehicle_id} profile requested for {duration:g} s"}
+
+@app.get("/vehicles/{vehicle_id}/profile/latest")
+def fleet_vehicle_latest_profile(vehicle_id: str, api_key: str = Depends(get_api_key)):
+    return _latest_profile(_fleet_vehicle(vehicle_id))
+
+@app.get("/vehicles/{vehicle_id}/metrics")
+def fleet_vehicle_metrics(vehicle_id: str):
+    vehicle = _fleet_vehicle(vehicle_id)
+    try:
+        with open(vehicle.metrics_file) as f:
+            return Response(f.read(), media_type=CONTENT_TYPE)
+    except FileNotFoundError:
+        return Response("", media_type=CONTENT_TYPE)
+
+@app.get("/vehicles/{vehicle_id}/camera/snapshot")
+def fleet_vehicle_snapshot(vehicle_id: str, request: Request):
+    return _snapshot(_fleet_vehicle(vehicle_id), request)
+
+@app.get("/vehicles/{vehicle_id}/camera/snapshot/thumbnail")
+def fleet_vehicle_snapshot_thumbnail(vehicle_id: str, request: Request):
+    return _snapshot_thumbnail(_fleet_vehicle(vehicle_id), request)
+
+@app.get("/vehicles/{vehicle_id}/recon/images")
+def list_fleet_vehicle_recon_images(vehicle_id: str, limit: int = 50, before: Optional[int] = None):
+    return _recon_images(_fleet_vehicle(vehicle_id), f"/vehicles/{vehicle_id}/recon/images", limit, before)
+
+@app.get("/vehicles/{vehicle_id}/recon/images/{name}")
+def fleet_vehicle_recon_image(vehicle_id: str, name: str, request: Request):
+    return _recon_image(_fleet_vehicle(vehicle_id), name, request)
+
+@app.get("/vehicles/{vehicle_id}/recon/images/{name}/thumbnail")
+def fleet_vehicle_recon_image_thumbnail(vehicle_id: str, name: str, request: Request):
+    return _recon_thumbnail(_fleet_vehicle(vehicle_id), name, request)
+
+_sensor_ring = None
+
+def _get_sensor_ring():
+    global _sensor_ring
+    if _sensor_ring is None and ACQUISITION_RING:
+        try:
+            _sensor_ring = SharedFrameRing.attach(ACQUISITION_RING)
+        except FileNotFoundError:
+            return None
+    return _sensor_ring
+
+@app.get("/sensors/latest")
+def latest_sensor_frames():
+    ring = _get_sensor_ring()
+    if ring is None:
+        return JSONResponse({"error": "No sensor acquisition available"}, status_code=404)
+    frames = {}
+    for source in ring.source_names:
+        frame = ring.latest(source)
+        if frame is not None:
+            frames[source] = {
+                "seq": frame["seq"],
+                "timestamp": frame["timestamp"],
+                "values": frame["values"].tolist(),
+            }
+    return frames
 
 def _write_command(cmd):
     # Append command to command file (as a list of commands)
-    commands = []
-    if os.path.exists(COMMAND_FILE):
-        with open(COMMAND_FILE) as f:
-            try:
-                commands = json.load(f)
-            except Exception:
-                commands = []
-    commands.append(cmd)
-    with open(COMMAND_FILE, 'w') as f:
-        json.dump(commands, f) 
\ No newline at end of file
+    default_vehicle.send_command(cmd) 
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""
+Shared helpers for the standalone benchmark scripts.
+
+The repository root is itself the package (see __init__.py), so the
+benchmarks load it under the name used in the README, ``robotics``,
+through the same _package.py helper the scripts and tests use.
+"""
+
+import importlib
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+from _package import PACKAGE_NAME, load_module, load_package  # noqa: E402,F401
+
+
+def load_script(name):
+    """
+    Import a top-level script such as ``vehicle`` or ``app``. These use
+    plain imports of their sibling modules, which the root on sys.path
+    provides.
+    """
+    return importlib.import_module(name)
+
+
+def timed(fn, repeat=1):
+    """Run fn repeat times and return the elapsed wall time in seconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return time.perf_counter() - start
+
+
+def report(name, results):
+    """Print one benchmark's results as aligned key/value lines."""
+    print(f"== {name} ==")
+    width = max(len(k) for k in results)
+    for key, value in results.items():
+        if isinstance(value, float):
+            value = f"{value:,.3f}"
+        print(f"  {key.ljust(width)}  {value}")
@@ -0,0 +1,72 @@
+"""
+Run the acquisition scheduler against the simulated sensors and report
+per-source jitter / missed deadlines plus shared-ring read cost.
+
+    python benchmarks/bench_acquisition.py [--seconds S]
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _common import load_package, load_module, report, timed  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--encoder-hz', type=float, default=500.0)
+    args = parser.parse_args()
+
+    robotics = load_package()
+    acquisition = load_module('acquisition')
+    encoder_ticks = itertools.count()
+    sources = [
+        acquisition.environment_source(robotics.EnvironmentalSensor(), rate_hz=10.0),
+        acquisition.lidar_source(robotics.LiDARScanner(scan_frequency=20.0)),
+        acquisition.power_source(robotics.PowerMonitor(), lambda: 87.5, rate_hz=5.0),
+        acquisition.encoder_source(robotics.WheelServoController(), lambda: next(encoder_ticks), args.encoder_hz),
+    ]
+    scheduler = acquisition.AcquisitionScheduler(sources)
+    try:
+        scheduler.start()
+        reader = acquisition.SharedFrameRing.attach(scheduler.ring.name)
+        cursor = -1
+        frames_read = 0
+
+        def drain():
+            nonlocal cursor, frames_read
+            frames, cursor = reader.read_since(cursor)
+            frames_read += len(frames)
+
+        end = time.monotonic() + args.seconds
+        while time.monotonic() < end:
+            drain()
+            time.sleep(0.01)
+        scheduler.stop()
+        drain()
+
+        latest_repeat = 10_000
+        latest_s = timed(lambda: reader.latest_view('lidar'), latest_repeat)
+        reader.close()
+
+        results = {
+            'seconds': args.seconds,
+            'frames_read': frames_read,
+            'latest_view_us': latest_s / latest_repeat * 1e6,
+        }
+        for name, stats in scheduler.get_stats().items():
+            results[f'{name}_samples'] = stats['samples']
+            results[f'{name}_missed'] = stats['missed_deadlines']
+            results[f'{name}_jitter_mean_us'] = stats['jitter_mean'] * 1e6
+            results[f'{name}_jitter_max_us'] = stats['jitter_max'] * 1e6
+        report('acquisition', results)
+    finally:
+        scheduler.close()
+
+
+if __name__ == '__main__':
+    main()
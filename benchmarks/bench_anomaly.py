@@ -0,0 +1,82 @@
+"""
+Per-sample and batched cost of the streaming anomaly detector in ai.py.
+
+    python benchmarks/bench_anomaly.py [--samples N]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _common import load_module, report, timed  # noqa: E402
+
+BASELINE = {
+    "temperature": (25.0, 2.0),
+    "humidity": (40.0, 5.0),
+    "air_quality": (50.0, 8.0),
+    "radiation": (0.01, 0.001),
+    "light_level": (300.0, 20.0),
+    "sound_level": (30.0, 4.0),
+    "pressure": (1013.25, 1.5),
+}
+
+
+def make_readings(n, seed):
+    rng = np.random.default_rng(seed)
+    means = np.array([m for m, _ in BASELINE.values()])
+    stds = np.array([s for _, s in BASELINE.values()])
+    values = rng.normal(means, stds, size=(n, len(BASELINE)))
+    spikes = rng.choice(n, size=max(1, n // 1000), replace=False)
+    values[spikes, rng.integers(0, len(BASELINE), size=len(spikes))] += 10 * stds.max()
+    return list(BASELINE), values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--samples', type=int, default=200_000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    ai = load_module('ai')
+    sensors, values = make_readings(args.samples, args.seed)
+    rows = [dict(zip(sensors, map(float, row))) for row in values]
+
+    detector = ai.StreamingAnomalyDetector()
+
+    def per_sample():
+        for row in rows:
+            detector.update(row, 0.0)
+
+    batch_detector = ai.StreamingAnomalyDetector()
+
+    def batched():
+        batch_detector.update_batch(sensors, values)
+
+    module = ai.AIModule()
+    history = [(i, row) for i, row in enumerate(rows[:20_000])]
+
+    def via_ai_module():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(1, len(history) + 1):
+                module.detect_sensor_anomaly(history[max(0, i - 2):i])
+
+    per_sample_s = timed(per_sample)
+    batched_s = timed(batched)
+    module_s = timed(via_ai_module)
+    report('anomaly', {
+        'samples': args.samples,
+        'per_sample_us': per_sample_s / args.samples * 1e6,
+        'batched_us_per_sample': batched_s / args.samples * 1e6,
+        'ai_module_us_per_sample': module_s / len(history) * 1e6,
+        'anomalies_flagged': len(detector.anomalies),
+        'anomaly_log_len': len(module.anomaly_log),
+    })
+
+
+if __name__ == '__main__':
+    main()
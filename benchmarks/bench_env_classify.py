@@ -0,0 +1,78 @@
+"""
+Throughput of batched environment classification (AIModule and
+EnvironmentalSensor rule tables) against the per-reading functions.
+
+    python benchmarks/bench_env_classify.py [--rows N]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _common import load_module, report, timed  # noqa: E402
+
+
+def make_columns(n, seed):
+    rng = np.random.default_rng(seed)
+    return {
+        "temperature": rng.uniform(-10, 90, n),
+        "humidity": rng.uniform(0, 100, n),
+        "air_quality": rng.uniform(0, 150, n),
+        "radiation": rng.uniform(0, 0.1, n),
+        "light_level": rng.uniform(0, 500, n),
+        "sound_level": rng.uniform(0, 120, n),
+        "pressure": rng.normal(1013.25, 2.0, n),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--scalar-rows', type=int, default=50_000)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    ai = load_module('ai')
+    sensors = load_module('sensors')
+    columns = make_columns(args.rows, args.seed)
+    module = ai.AIModule()
+    sensor = sensors.EnvironmentalSensor()
+
+    rows = [{k: float(v[i]) for k, v in columns.items()} for i in range(args.scalar_rows)]
+
+    def scalar_patterns():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for row in rows:
+                module.detect_environment_pattern(row)
+
+    def scalar_conditions():
+        for row in rows:
+            sensor.readings = row
+            sensor.evaluate_conditions()
+
+    counts = {}
+
+    def batch_patterns():
+        counts['patterns'] = module.detect_environment_pattern_batch(columns)[1]
+
+    def batch_conditions():
+        counts['conditions'] = sensor.evaluate_conditions_batch(columns)[1]
+
+    report('env_classify', {
+        'rows': args.rows,
+        'scalar_patterns_rows_per_s': args.scalar_rows / timed(scalar_patterns),
+        'batch_patterns_rows_per_s': args.rows / timed(batch_patterns),
+        'scalar_conditions_rows_per_s': args.scalar_rows / timed(scalar_conditions),
+        'batch_conditions_rows_per_s': args.rows / timed(batch_conditions),
+        'pattern_counts': counts['patterns'],
+        'condition_counts': counts['conditions'],
+    })
+
+
+if __name__ == '__main__':
+    main()
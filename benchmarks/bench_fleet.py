@@ -0,0 +1,145 @@
+"""
+Load test of the fleet dashboard endpoints with many simulated vehicles.
+
+Each vehicle is a VehicleSim writing into its own directory under a
+temporary VEHICLE_FLEET_DIR. Requests go through FastAPI's in-process
+TestClient from several threads while a writer thread keeps stepping random
+vehicles, so statuses change under the readers. The fleet summary is
+compared with a naive full scan of every status file.
+
+    python benchmarks/bench_fleet.py [--vehicles N] [--requests N] [--threads N]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _common import load_script, report, timed  # noqa: E402
+
+
+def naive_summary(root):
+    statuses = []
+    for vehicle_id in os.listdir(root):
+        path = os.path.join(root, vehicle_id, 'vehicle_status.json')
+        if os.path.exists(path):
+            with open(path) as f:
+                statuses.append(json.load(f))
+    batteries = [s['battery'] for s in statuses]
+    return {"reporting": len(statuses), "battery_mean": sum(batteries) / len(batteries)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vehicles', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--writes-per-s', type=float, default=500.0, help="Vehicle status updates per second")
+    parser.add_argument('--seed', type=int, default=13)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        os.environ['VEHICLE_FLEET_DIR'] = root
+        vehicle = load_script('vehicle')
+        app_module = load_script('app')
+        from fastapi.testclient import TestClient
+        client = TestClient(app_module.app)
+        headers = {"X-API-Key": app_module.API_KEY}
+
+        ids = [f"rv-{i:04d}" for i in range(args.vehicles)]
+        sims = {}
+        for i, vehicle_id in enumerate(ids):
+            data_dir = os.path.join(root, vehicle_id)
+            os.makedirs(data_dir)
+            sim = vehicle.VehicleSim(seed=args.seed + i, data_dir=data_dir)
+            sim.step(commands=[{'action': 'start'}])
+            sims[vehicle_id] = sim
+
+        cold_s = timed(lambda: client.get("/fleet/summary"))
+        naive_s = timed(lambda: naive_summary(root), repeat=5) / 5
+
+        stop = threading.Event()
+        writes = [0]
+
+        def writer():
+            rng = random.Random(args.seed)
+            period = 1.0 / args.writes_per_s
+            while not stop.is_set():
+                sims[rng.choice(ids)].step()
+                writes[0] += 1
+                time.sleep(period)
+
+        rng = random.Random(args.seed)
+        plan = []
+        for _ in range(args.requests):
+            roll = rng.random()
+            vehicle_id = rng.choice(ids)
+            if roll < 0.6:
+                plan.append(("status", "GET", f"/vehicles/{vehicle_id}/status"))
+            elif roll < 0.8:
+                plan.append(("summary", "GET", "/fleet/summary"))
+            elif roll < 0.9:
+                plan.append(("logs", "GET", f"/vehicles/{vehicle_id}/logs"))
+            else:
+                plan.append(("control", "POST", f"/vehicles/{vehicle_id}/control/stop"))
+
+        latencies = {kind: [] for kind in ("status", "summary", "logs", "control")}
+        errors = [0]
+
+        def issue(item):
+            kind, method, url = item
+            start = time.perf_counter()
+            response = client.request(method, url, headers=headers)
+            latencies[kind].append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors[0] += 1
+
+        writer_thread = threading.Thread(target=writer, daemon=True)
+        writer_thread.start()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            list(pool.map(issue, plan))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        writer_thread.join()
+
+        app_module.fleet.refresh()
+        summary = client.get("/fleet/summary").json()
+        expected = naive_summary(root)
+
+        fleet = app_module.fleet
+        warm_us = timed(fleet.summary.snapshot, repeat=1000) / 1000 * 1e6
+        sweep_ms = timed(fleet.refresh, repeat=5) / 5 * 1e3
+
+        results = {
+            "vehicles": args.vehicles,
+            "requests_per_s": args.requests / elapsed,
+            "errors": errors[0],
+            "status_writes": writes[0],
+            "cold_summary_ms": cold_s * 1e3,
+            "naive_scan_ms": naive_s * 1e3,
+            "summary_snapshot_us": warm_us,
+            "refresh_sweep_ms": sweep_ms,
+        }
+        for kind, values in latencies.items():
+            if values:
+                results[f"{kind}_p50_ms"] = float(np.percentile(values, 50)) * 1e3
+                results[f"{kind}_p99_ms"] = float(np.percentile(values, 99)) * 1e3
+        results["open_log_handles"] = len(fleet.pool)
+        results["summary_matches_scan"] = (
+            summary["reporting"] == expected["reporting"]
+            and abs(summary["battery_mean"] - expected["battery_mean"]) < 1e-9
+        )
+        report(f"fleet dashboard ({args.threads} threads)", results)
+
+
+if __name__ == '__main__':
+    main()
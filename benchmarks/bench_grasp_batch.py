@@ -0,0 +1,65 @@
+"""
+Batch grasp evaluation of many detected objects with
+ShapeVolumeDetection.evaluate_batch versus one evaluate() call per object.
+
+    python benchmarks/bench_grasp_batch.py [--objects N]
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _common import load_module, report, timed  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--objects', type=int, default=200_000)
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    ai = load_module('ai')
+    detector = ai.ShapeVolumeDetection(claw_volume_min_kg=0.5, claw_volume_max_kg=10.0)
+    rng = np.random.default_rng(args.seed)
+    n = args.objects
+    shapes = rng.choice(list(ai.SHAPE_VOLUMES), size=n)
+    dims = {
+        "edge_length": rng.uniform(0.2, 3.0, n),
+        "length": rng.uniform(0.2, 3.0, n),
+        "width": rng.uniform(0.2, 3.0, n),
+        "height": rng.uniform(0.2, 3.0, n),
+        "radius": rng.uniform(0.1, 1.5, n),
+    }
+    rounded = {k: np.round(v, 1) for k, v in dims.items()}
+
+    result = {}
+
+    def batched():
+        result.update(detector.evaluate_batch(shapes, dims))
+
+    def per_object(values):
+        def run():
+            for i, shape in enumerate(shapes):
+                defaults = ai.SHAPE_VOLUMES[shape][0]
+                detector.evaluate(shape, **{name: float(values[name][i]) for name in defaults})
+        return run
+
+    batch_s = timed(batched)
+    scalar_s = timed(per_object(dims))
+    ai._shape_volume.cache_clear()
+    memo_s = timed(per_object(rounded))
+    report('grasp_batch', {
+        'objects': n,
+        'batch_objects_per_s': n / batch_s,
+        'per_object_objects_per_s': n / scalar_s,
+        'per_object_memo_hits_objects_per_s': n / memo_s,
+        'cache': str(ai._shape_volume.cache_info()),
+        'graspable': int(result['graspable'].sum()),
+    })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Per-observation cost of the metrics hot paths: a bound histogram child's
+observe(), a histogram timer and a counter increment.
+
+Each is timed over --rounds rounds and the fastest round counts, so a GC
+pause or preemption does not fail the run. Exits non-zero if a histogram
+observation costs more than the budget (the README promises under a
+microsecond).
+
+    python benchmarks/bench_metrics.py [--observations N] [--budget-us US]
+"""
+
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _common import load_module, report, timed  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--observations', type=int, default=200_000)
+    parser.add_argument('--rounds', type=int, default=7)
+    parser.add_argument('--budget-us', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    metrics = load_module('metrics')
+    registry = metrics.MetricsRegistry()
+    histogram = registry.histogram('bench_seconds', 'Benchmark latencies', ('phase',)).labels('tick')
+    counter = registry.counter('bench_events', 'Benchmark events', ('kind',)).labels('tick')
+    rng = random.Random(args.seed)
+    # Tick-like latencies spanning the resolved range, plus a few out-of-range values.
+    values = [rng.lognormvariate(-7.0, 1.5) for _ in range(args.observations - 2)] + [0.0, 1e3]
+
+    def observe():
+        for value in values:
+            histogram.observe(value)
+
+    def time_block():
+        for _ in values:
+            with histogram.time():
+                pass
+
+    def increment():
+        for _ in values:
+            counter.inc()
+
+    def loop():
+        for _ in values:
+            pass
+
+    def per_op_us(fn):
+        return min(timed(fn) for _ in range(args.rounds)) / len(values) * 1e6
+
+    overhead = per_op_us(loop)
+    observe_us = per_op_us(observe) - overhead
+    results = {
+        'observations': len(values),
+        'budget_us': args.budget_us,
+        'histogram_observe_us': observe_us,
+        'histogram_time_us': per_op_us(time_block) - overhead,
+        'counter_inc_us': per_op_us(increment) - overhead,
+        'p99_s': histogram.quantile(0.99),
+    }
+    report('metrics', results)
+    if observe_us > args.budget_us:
+        print(f"FAIL: histogram observe costs {observe_us:.3f}us, above the {args.budget_us}us budget")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
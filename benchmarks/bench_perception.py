@@ -0,0 +1,90 @@
+"""
+Throughput and latency of PerceptionPipeline at several batch sizes.
+
+The detector is a CPU-free stub that sleeps a fixed per-batch overhead plus
+a per-frame cost, like an accelerator where launching a batch dominates.
+Frames are offered at a fixed rate from a simulated control loop; the
+report includes how long submit() held that loop up.
+
+    python benchmarks/bench_perception.py [--frames N] [--rate HZ] [--batch-sizes 1,4,16,64]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _common import load_module, report  # noqa: E402
+
+
+class StubDetector:
+    def __init__(self, batch_overhead, per_frame):
+        self.batch_overhead = batch_overhead
+        self.per_frame = per_frame
+
+    def detect_batch(self, frames):
+        time.sleep(self.batch_overhead + self.per_frame * len(frames))
+        return [int(frame[0, 0]) % 5 for frame in frames]
+
+
+def run(perception, detector, frames, rate, batch_size, workers, queue_size):
+    pipeline = perception.PerceptionPipeline(
+        detector, batch_size=batch_size, max_batch_delay=0.002, queue_size=queue_size, workers=workers
+    )
+    futures = []
+    submit_times = np.empty(len(frames))
+    period = 1.0 / rate
+    with pipeline:
+        start = time.perf_counter()
+        for i, frame in enumerate(frames):
+            delay = start + i * period - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            t0 = time.perf_counter()
+            future = pipeline.submit(frame)
+            submit_times[i] = time.perf_counter() - t0
+            if future is not None:
+                futures.append(future)
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - start
+        stats = pipeline.get_stats()
+    return {
+        "frames_per_s": stats["completed"] / elapsed,
+        "completed": stats["completed"],
+        "rejected": stats["rejected"],
+        "mean_batch_size": stats["mean_batch_size"],
+        "latency_mean_ms": stats["latency_mean"] * 1e3,
+        "latency_max_ms": stats["latency_max"] * 1e3,
+        "submit_p99_us": float(np.percentile(submit_times, 99)) * 1e6,
+        "submit_max_us": float(submit_times.max()) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--rate', type=float, default=2000.0, help="Frames offered per second")
+    parser.add_argument('--batch-sizes', default="1,4,16,64")
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--queue-size', type=int, default=256)
+    parser.add_argument('--batch-overhead-ms', type=float, default=2.0)
+    parser.add_argument('--per-frame-ms', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=9)
+    args = parser.parse_args()
+
+    perception = load_module('perception')
+    rng = np.random.default_rng(args.seed)
+    frames = list(rng.integers(0, 255, size=(args.frames, 32, 32), dtype=np.uint8))
+    detector = StubDetector(args.batch_overhead_ms / 1e3, args.per_frame_ms / 1e3)
+
+    for batch_size in (int(b) for b in args.batch_sizes.split(",")):
+        report(f"perception batch_size={batch_size}",
+               run(perception, detector, frames, args.rate, batch_size, args.workers, args.queue_size))
+
+
+if __name__ == '__main__':
+    main()
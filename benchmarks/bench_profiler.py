@@ -0,0 +1,69 @@
+"""
+Cost of the on-demand sampling profiler on the vehicle tick.
+
+Times VehicleSim.step (in memory, no files) with the profiler idle and
+while it samples the stepping thread at a few intervals, and checks that
+the collapsed stacks point at the simulation code.
+
+    python benchmarks/bench_profiler.py [--steps N] [--intervals MS,MS,...]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _common import load_script, report, timed  # noqa: E402
+
+
+def make_sim(vehicle, seed):
+    sim = vehicle.VehicleSim(seed=seed, write_files=False)
+    # Far enough that the sim never reaches a waypoint while being timed.
+    sim.route = [(37.7749, -122.4194), (47.6062, -122.3321)]
+    sim.position = sim.route[0]
+    sim.step(commands=[{'action': 'start'}])
+    return sim
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--steps', type=int, default=20000)
+    parser.add_argument('--intervals', default="1,5,20", help="Sampling intervals to try, in milliseconds")
+    parser.add_argument('--seed', type=int, default=17)
+    args = parser.parse_args()
+
+    vehicle = load_script('vehicle')
+    profiler = load_script('profiler')
+
+    def steps(sim):
+        for _ in range(args.steps):
+            sim.step(commands=[])
+
+    # A fresh sim per measurement so every run steps through the same states.
+    steps(make_sim(vehicle, args.seed))  # warm up
+    idle_s = min(timed(lambda: steps(make_sim(vehicle, args.seed))) for _ in range(3))
+    results = {"idle_step_us": idle_s / args.steps * 1e6}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for interval_ms in (float(ms) for ms in args.intervals.split(',')):
+            sampler = profiler.SamplingProfiler(interval=interval_ms / 1000)
+            path = os.path.join(tmp, f"profile_{interval_ms:g}.folded")
+            sampler.start(profiler.MAX_DURATION, path)
+            sampled_s = min(timed(lambda: steps(make_sim(vehicle, args.seed))) for _ in range(3))
+            sampler.stop()
+            result = sampler.last_result
+            with open(path) as f:
+                hot = sum(int(line.rsplit(' ', 1)[1]) for line in f if 'step (vehicle.py' in line)
+            label = f"{interval_ms:g}ms"
+            results[f"{label}_step_us"] = sampled_s / args.steps * 1e6
+            results[f"{label}_overhead_pct"] = (sampled_s / idle_s - 1) * 100
+            results[f"{label}_samples"] = result["samples"]
+            results[f"{label}_sampler_cpu_us"] = result["sampler_cpu_us_per_sample"]
+            results[f"{label}_in_step_pct"] = hot / result["samples"] * 100 if result["samples"] else 0.0
+
+    report(f"sampling profiler ({args.steps} steps)", results)
+
+
+if __name__ == '__main__':
+    main()
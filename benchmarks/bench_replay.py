@@ -0,0 +1,86 @@
+"""
+Record a synthetic multi-hour mission to a binary mission log, then replay
+it in full (verifying every status and decision) and seek to random
+timestamps the way a bisecting investigation would.
+
+    python benchmarks/bench_replay.py [--hours H] [--seeks N] [--checkpoint-interval S]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _common import load_module, load_script, report, timed  # noqa: E402
+
+
+def record(vehicle, control, mission_log, path, ticks, checkpoint_interval, seed):
+    start = 1_700_000_000.0
+    now = start
+    sim = vehicle.VehicleSim(seed=seed, write_files=False)
+    engine = control.AutonomousDecisionEngine(clock=lambda: now)
+    engine.timeout_limit = ticks * vehicle.TICK_INTERVAL + 1
+    engine.set_mission_objective("survey")
+    rng = random.Random(seed)
+    schedule = {1: [{'action': 'start'}], 5: [{'action': 'recon'}]}
+    for tick in range(50, ticks, 700):
+        schedule[tick] = [{'action': 'reroute', 'reason': f'hazard-{tick}'}]
+    with mission_log.MissionRecorder(path, sim=sim, engine=engine, tick_interval=vehicle.TICK_INTERVAL,
+                                     start_time=start, checkpoint_interval=checkpoint_interval):
+        for tick in range(ticks):
+            now = start + tick * vehicle.TICK_INTERVAL
+            sim.step(commands=schedule.get(tick, []), now=now)
+            engine.update_sensor_input({"obstacle_detected": rng.random() < 0.05, "battery": sim.battery})
+            engine.evaluate_mission()
+    return start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--hours', type=float, default=6.0)
+    parser.add_argument('--seeks', type=int, default=50)
+    parser.add_argument('--checkpoint-interval', type=float, default=60.0)
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    vehicle = load_script('vehicle')
+    control = load_module('control')
+    mission_log = load_module('mission_log')
+    ticks = int(args.hours * 3600 / vehicle.TICK_INTERVAL)
+
+    def sim_factory(**kwargs):
+        return vehicle.VehicleSim(**kwargs)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'mission.rvml')
+        record_s = timed(lambda: record(vehicle, control, mission_log, path, ticks,
+                                        args.checkpoint_interval, args.seed))
+        log = mission_log.MissionLog(path)
+        index_s = timed(lambda: log.checkpoints)
+
+        replay = mission_log.MissionReplay(log, sim_factory, control.AutonomousDecisionEngine)
+        full_s = timed(replay.run)
+
+        rng = random.Random(args.seed)
+        targets = [rng.uniform(log.start_time, log.end_time) for _ in range(args.seeks)]
+        seeker = mission_log.MissionReplay(log, sim_factory, control.AutonomousDecisionEngine)
+        seek_s = timed(lambda: [seeker.seek(t) for t in targets])
+
+        report("mission replay", {
+            "mission_hours": args.hours,
+            "ticks": log.ticks,
+            "log_bytes": os.path.getsize(path),
+            "checkpoints": len(log.checkpoints),
+            "record_s": record_s,
+            "index_scan_ms": index_s * 1e3,
+            "full_replay_s": full_s,
+            "speedup_vs_realtime": (log.end_time - log.start_time) / full_s,
+            "divergences": len(replay.divergences) + len(seeker.divergences),
+            "seek_mean_ms": seek_s / args.seeks * 1e3,
+        })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Per-frame latency of the compiled SafetyRuleEngine with hundreds of rules.
+Frames are drawn uniformly at random, so a large share of rules trips or
+clears on every frame (the worst case for building the result lists).
+
+The same frame sequence is replayed for several rounds from a reset engine,
+so every round does identical work. A frame's cost is its fastest round,
+which strips out GC pauses and preemption without hiding slow code paths;
+the run fails if any frame's cost exceeds the budget. Raw p99, worst frame
+and over-budget counts (all rounds) are reported alongside.
+
+    python benchmarks/bench_safety_rules.py [--rules N] [--rounds N] [--budget-us US]
+"""
+
+import argparse
+import os
+import random
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _common import load_module, report  # noqa: E402
+
+CHANNELS = ["temperature", "humidity", "air_quality", "radiation", "light_level",
+            "sound_level", "pressure", "battery_level", "collision_risk", "system_fault"]
+
+
+def make_rules(n, rng):
+    rules = []
+    for i in range(n):
+        rules.append({
+            "name": f"rule_{i}",
+            "channel": rng.choice(CHANNELS),
+            "op": rng.choice([">", ">=", "<", "<="]),
+            "threshold": rng.uniform(0, 100),
+            "hysteresis": rng.choice([0.0, 1.0, 5.0]),
+            "debounce": rng.choice([0.0, 0.0, 0.5]),
+            "action": "warn",
+        })
+    return rules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rules', type=int, default=500)
+    parser.add_argument('--frames', type=int, default=20_000)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--budget-us', type=float, default=50.0)
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    control = load_module('control')
+    rng = random.Random(args.seed)
+    engine = control.SafetyRuleEngine(make_rules(args.rules, rng), latency_budget_us=args.budget_us)
+    np_rng = np.random.default_rng(args.seed)
+    dict_frames = [{c: float(v) for c, v in zip(CHANNELS, np_rng.uniform(0, 100, len(CHANNELS)))}
+                   for _ in range(args.frames)]
+    vector_frames = [engine.frame_vector(frame) for frame in dict_frames]
+
+    results = {'rules': args.rules, 'frames': args.frames, 'budget_us': args.budget_us}
+    failed = False
+    for label, frames in (('dict', dict_frames), ('vector', vector_frames)):
+        latencies = np.empty((args.rounds, len(frames)))
+        over_budget = 0
+        for round_latencies in latencies:
+            engine.reset()
+            for i, frame in enumerate(frames):
+                engine.evaluate(frame, i * 0.01)
+                round_latencies[i] = engine.last_latency_us
+            over_budget += engine.over_budget
+        cost = latencies.min(axis=0)
+        worst_cost = float(cost.max())
+        results[f'{label}_p50_us'] = float(np.percentile(latencies, 50))
+        results[f'{label}_p99_us'] = float(np.percentile(latencies, 99))
+        results[f'{label}_worst_us'] = float(latencies.max())
+        results[f'{label}_over_budget'] = f"{over_budget}/{latencies.size}"
+        results[f'{label}_worst_frame_cost_us'] = worst_cost
+        failed |= worst_cost > args.budget_us
+    report('safety_rules', results)
+    if failed:
+        print(f"FAIL: a frame's evaluation cost exceeds the {args.budget_us}us budget")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
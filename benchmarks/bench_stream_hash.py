@@ -0,0 +1,88 @@
+"""
+Streaming chunked hashing and Merkle manifests versus the whole-string path
+(VehicleSecurity.encrypt_data on a decoded str).
+
+    python benchmarks/bench_stream_hash.py [--size-mb N] [--chunk-kb N]
+"""
+
+import argparse
+import os
+import pathlib
+import random
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _common import load_module, report, timed  # noqa: E402
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size-mb', type=int, default=256)
+    parser.add_argument('--chunk-kb', type=int, default=1024)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    security = load_module('security')
+    vehicle_security = security.VehicleSecurity()
+    chunk_size = args.chunk_kb * 1024
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp, 'recon_archive.bin')
+        # 1 MiB of ASCII so the whole-string path can decode it as str.
+        block = bytes(rng.getrandbits(8) for _ in range(512 * 1024)).hex().encode()
+        with open(path, 'wb') as f:
+            for _ in range(args.size_mb):
+                f.write(block)
+
+        def whole_string():
+            with open(path, 'r') as f:
+                vehicle_security.encrypt_data(f.read())
+
+        def streamed():
+            vehicle_security.hash_stream(path, chunk_size)
+
+        manifest = vehicle_security.build_integrity_manifest(path, chunk_size)
+
+        def manifest_build():
+            vehicle_security.build_integrity_manifest(path, chunk_size)
+
+        bad_index = len(manifest['chunks']) // 2
+        with open(path, 'r+b') as f:
+            f.seek(bad_index * chunk_size + 17)
+            f.write(b'!')
+
+        def locate():
+            assert vehicle_security.find_corrupted_chunks(path, manifest) == [bad_index]
+
+        def reverify():
+            vehicle_security.verify_chunk(path, bad_index, manifest)
+
+        size_mb = args.size_mb
+        whole_s = timed(whole_string)
+        stream_s = timed(streamed)
+        report('stream_hash', {
+            'size_mb': size_mb,
+            'chunk_kb': args.chunk_kb,
+            'whole_string_mb_per_s': size_mb / whole_s,
+            'streamed_mb_per_s': size_mb / stream_s,
+            'manifest_mb_per_s': size_mb / timed(manifest_build),
+            'locate_corruption_s': timed(locate),
+            'reverify_one_chunk_ms': timed(reverify) * 1000,
+            'whole_string_peak_mb': peak_memory(whole_string),
+            'streamed_peak_mb': peak_memory(streamed),
+        })
+
+
+if __name__ == '__main__':
+    main()
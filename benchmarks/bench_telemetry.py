@@ -0,0 +1,75 @@
+"""
+Cost of a simulated control loop with telemetry output on versus off.
+
+Each tick moves the arm, updates wheels, power and the decision engine, and
+evaluates the mission -- the calls that used to print unconditionally.
+
+    python benchmarks/bench_telemetry.py [--ticks N]
+"""
+
+import argparse
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _common import load_package, load_module, report, timed  # noqa: E402
+
+
+def build_loop(robotics):
+    arm = robotics.RobotArm()
+    controller = robotics.RobotController(
+        arm, robotics.ArmRotation(arm), robotics.VisionAIModule(), robotics.ShapeVolumeDetection()
+    )
+    wheels = robotics.WheelServoController()
+    power = robotics.PowerMonitor()
+    engine = robotics.AutonomousDecisionEngine()
+    sensor_input = {"obstacle_detected": False, "temperature": 25.0, "battery": 90.0}
+    controller.power_button(power_on=True)
+
+    def tick(i):
+        controller.directional_movement_robotarm(right_move=True, up_move=i % 2 == 0)
+        wheels.set_speed(i % 10)
+        wheels.update_encoder_feedback(i)
+        power.update_battery_level(90 - (i % 50) * 0.1)
+        engine.update_sensor_input(sensor_input)
+        engine.evaluate_mission()
+
+    return tick
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--ticks', type=int, default=20_000)
+    args = parser.parse_args()
+
+    robotics = load_package()
+    telemetry_module = load_module('telemetry')
+    telemetry = robotics.telemetry
+    tick = build_loop(robotics)
+    saved_sinks, saved_level = list(telemetry.sinks), telemetry.level
+
+    def run():
+        for i in range(args.ticks):
+            tick(i)
+
+    results = {'ticks': args.ticks}
+    scenarios = [
+        ('off', telemetry_module.OFF, []),
+        ('warning_console', telemetry_module.WARNING, [robotics.ConsoleSink(io.StringIO())]),
+        ('debug_ring', telemetry_module.DEBUG, [robotics.RingSink(4096)]),
+        ('debug_console', telemetry_module.DEBUG, [robotics.ConsoleSink(io.StringIO())]),
+        ('debug_jsonl', telemetry_module.DEBUG, [robotics.JsonLinesSink(io.StringIO())]),
+    ]
+    try:
+        for name, level, sinks in scenarios:
+            telemetry.set_level(level)
+            telemetry.sinks = sinks
+            results[f'{name}_us_per_tick'] = timed(run) / args.ticks * 1e6
+    finally:
+        telemetry.sinks, telemetry.level = saved_sinks, saved_level
+    report('telemetry', results)
+
+
+if __name__ == '__main__':
+    main()
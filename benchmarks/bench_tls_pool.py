@@ -0,0 +1,160 @@
+"""
+Messages/sec through VehicleSecurity's pooled TLS connections versus a fresh
+TCP + TLS handshake per message, against a local self-signed echo server.
+A send-only case against a server that never replies checks that pooled
+connections stay reusable when the client never reads (TLS 1.3 servers send
+session tickets after the handshake that such a client leaves unread).
+
+    python benchmarks/bench_tls_pool.py [--messages N]
+"""
+
+import argparse
+import datetime
+import os
+import socket
+import ssl
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _common import load_module, report, timed  # noqa: E402
+
+from cryptography import x509  # noqa: E402
+from cryptography.hazmat.primitives import hashes, serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import ec  # noqa: E402
+from cryptography.x509.oid import NameOID  # noqa: E402
+
+HOST = 'localhost'
+PAYLOAD = b'{"lat": 37.7749, "lon": -122.4194, "battery": 87.5}\n'
+
+
+def write_self_signed_cert(directory):
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, HOST)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=5))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName(HOST)]), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+    cert_path = os.path.join(directory, 'cert.pem')
+    key_path = os.path.join(directory, 'key.pem')
+    with open(cert_path, 'wb') as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, 'wb') as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ))
+    return cert_path, key_path
+
+
+def start_echo_server(cert_path, key_path, echo=True):
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    listener = socket.create_server((HOST, 0))
+    port = listener.getsockname()[1]
+
+    def serve(conn):
+        try:
+            with context.wrap_socket(conn, server_side=True) as tls:
+                reader = tls.makefile('rb')
+                for line in reader:
+                    if echo:
+                        tls.sendall(line)
+        except (OSError, ssl.SSLError):
+            pass
+
+    def accept_loop():
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=serve, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=accept_loop, daemon=True).start()
+    return listener, port
+
+
+def roundtrip(sock):
+    sock.sendall(PAYLOAD)
+    received = b''
+    while not received.endswith(b'\n'):
+        chunk = sock.recv(4096)
+        if not chunk:
+            raise ConnectionError('server closed connection')
+        received += chunk
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=500)
+    args = parser.parse_args()
+
+    security = load_module('security')
+    with tempfile.TemporaryDirectory() as tmp:
+        cert_path, key_path = write_self_signed_cert(tmp)
+        listener, port = start_echo_server(cert_path, key_path)
+        client_context = ssl.create_default_context(cafile=cert_path)
+
+        def per_call():
+            raw = socket.create_connection((HOST, port))
+            with client_context.wrap_socket(raw, server_hostname=HOST) as sock:
+                roundtrip(sock)
+
+        vehicle_security = security.VehicleSecurity(tls_context=client_context)
+
+        def pooled():
+            sock = vehicle_security.secure_communication(HOST, port)
+            roundtrip(sock)
+            vehicle_security.release_connection(sock)
+
+        per_call_s = timed(per_call, args.messages)
+        pooled_s = timed(pooled, args.messages)
+
+        # Fresh connections against a warm pool: exercises session resumption.
+        pool = security.TLSConnectionPool(context=client_context, max_idle_per_host=0)
+
+        def resumed():
+            with pool.connection(HOST, port) as sock:
+                roundtrip(sock)
+
+        resumed_s = timed(resumed, args.messages)
+        listener.close()
+
+        # Telemetry uplink: send and release without ever reading a reply.
+        sink, sink_port = start_echo_server(cert_path, key_path, echo=False)
+        uplink = security.TLSConnectionPool(context=client_context)
+
+        def send_only():
+            with uplink.connection(HOST, sink_port) as sock:
+                sock.sendall(PAYLOAD)
+
+        send_only_s = timed(send_only, args.messages)
+        sink.close()
+
+    report('tls_pool', {
+        'messages': args.messages,
+        'per_call_msgs_per_s': args.messages / per_call_s,
+        'pooled_msgs_per_s': args.messages / pooled_s,
+        'reconnect_with_resumption_msgs_per_s': args.messages / resumed_s,
+        'send_only_msgs_per_s': args.messages / send_only_s,
+        'speedup': per_call_s / pooled_s,
+        'pool_stats': vehicle_security.get_security_status()['tls_pool'],
+        'resumption_stats': pool.get_stats(),
+        'send_only_stats': uplink.get_stats(),
+    })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+A long arm motion via RobotController.move_arm_to (one planned trajectory)
+versus repeated directional_movement_robotarm flag steps.
+
+    python benchmarks/bench_trajectory.py [--steps N]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _common import load_package, report, timed  # noqa: E402
+
+
+def make_controller(robotics):
+    arm = robotics.RobotArm()
+    controller = robotics.RobotController(
+        arm, robotics.ArmRotation(arm), robotics.VisionAIModule(), robotics.ShapeVolumeDetection()
+    )
+    controller.power_button(power_on=True)
+    return controller
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--steps', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    robotics = load_package()
+    stepped = make_controller(robotics)
+    planned = make_controller(robotics)
+    n = args.steps
+
+    def flag_stepping():
+        stepped.robotarm.position = (0, 0, 0)
+        for _ in range(n):
+            stepped.directional_movement_robotarm(right_move=True, up_move=True, forward_move=True)
+
+    def trajectory():
+        planned.robotarm.position = (0, 0, 0)
+        planned.move_arm_to((n, n, n))
+
+    def timed_trajectory():
+        planned.robotarm.position = (0, 0, 0)
+        planned.move_arm_to(waypoints=[(n / 2, 0, 0, 90), (n, n, n, 0)], max_speed=50.0, max_angular_speed=30.0)
+
+    flag_s = timed(flag_stepping, args.repeat) / args.repeat
+    plan_s = timed(trajectory, args.repeat) / args.repeat
+    assert stepped.robotarm.position == (n, n, n)
+    assert planned.robotarm.position == (n, n, n)
+    report('trajectory', {
+        'steps': n,
+        'flag_stepping_ms': flag_s * 1000,
+        'trajectory_ms': plan_s * 1000,
+        'timed_waypoints_ms': timed(timed_trajectory, args.repeat) / args.repeat * 1000,
+        'speedup': flag_s / plan_s,
+    })
+
+
+if __name__ == '__main__':
+    main()
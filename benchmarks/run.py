@@ -0,0 +1,176 @@
+"""
+Run the hot-path benchmark suite and emit JSON, optionally comparing
+against a stored baseline.
+
+    python benchmarks/run.py                          # print JSON results
+    python benchmarks/run.py --output baseline.json   # store a baseline
+    python benchmarks/run.py --compare baseline.json  # flag regressions (exit 1)
+    python benchmarks/run.py --filter vehicle --repeat 10
+
+Every scenario (see scenarios.py) is built with the same seed, warmed up,
+then timed for --repeat rounds; the suite does that --passes times, so
+the rounds of one scenario are spread over the whole run rather than
+sharing a single burst of machine noise. Per-operation times are reported
+in microseconds. Comparisons use the fastest round, since a noisy
+neighbour or a slow disk only ever adds time, and widen --threshold for
+scenarios whose fast rounds spread more than that (file I/O, mostly): a
+change counts only if it exceeds NOISE_FACTOR times the gap between the
+fastest round and the lower quartile in either run. (The standard
+deviation would be dominated by the occasional stalled round.)
+The focused bench_*.py scripts remain the place for detailed,
+single-feature studies.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(__file__))
+from scenarios import SCENARIOS  # noqa: E402
+
+NOISE_FACTOR = 2.0
+
+
+def measure(build, seed, workdir, repeat, warmup):
+    """Per-operation times in microseconds for each of repeat rounds, and ops per round."""
+    run, ops = build(seed, workdir)
+    for _ in range(warmup):
+        run()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) / ops * 1e6)
+    return samples, ops
+
+
+def summarize(samples, ops):
+    return {
+        "ops_per_round": ops,
+        "rounds": len(samples),
+        "median_us": statistics.median(samples),
+        "mean_us": statistics.fmean(samples),
+        "min_us": min(samples),
+        "q1_us": statistics.quantiles(samples, n=4)[0] if len(samples) > 1 else samples[0],
+        "stdev_us": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def noise(result):
+    """How far the lower quartile of rounds lies above the fastest, relative to it."""
+    if result["min_us"] <= 0:
+        return 0.0
+    # Baselines stored before q1_us was recorded only have the median.
+    return result.get("q1_us", result["median_us"]) / result["min_us"] - 1
+
+
+def compare(results, baseline, threshold):
+    """
+    Fastest-round comparison with a per-scenario noise allowance.
+
+    Returns:
+        Dictionary of scenario name to ratio (current / baseline), the
+        threshold applied and a verdict of "regression", "improvement",
+        "ok" or "new"
+    """
+    verdicts = {}
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            verdicts[name] = {"ratio": None, "threshold": None, "verdict": "new"}
+            continue
+        ratio = result["min_us"] / previous["min_us"]
+        allowed = max(threshold, NOISE_FACTOR * max(noise(result), noise(previous)))
+        if ratio > 1 + allowed:
+            verdict = "regression"
+        elif ratio < 1 / (1 + allowed):
+            verdict = "improvement"
+        else:
+            verdict = "ok"
+        verdicts[name] = {"ratio": ratio, "threshold": allowed, "verdict": verdict}
+    return verdicts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', default=None, help="Only run scenarios whose name contains this text")
+    parser.add_argument('--repeat', type=int, default=7, help="Timed rounds per scenario in each pass")
+    parser.add_argument('--passes', type=int, default=3, help="Times the whole suite is run")
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', default=None, help="Write results JSON here instead of stdout")
+    parser.add_argument('--compare', default=None, help="Baseline results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="Relative slowdown of the fastest round counted as a regression "
+                             "(widened per scenario for noisy ones)")
+    parser.add_argument('--list', action='store_true', help="List scenario names and exit")
+    args = parser.parse_args()
+
+    names = [name for name in SCENARIOS if args.filter is None or args.filter in name]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    samples = {name: [] for name in names}
+    ops = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for number in range(args.passes):
+            for name in names:
+                workdir = os.path.join(tmp, f"{number}_{name.replace('/', '_')}")
+                os.makedirs(workdir)
+                # Third-party deprecation notices would otherwise repeat every round.
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    rounds, ops[name] = measure(SCENARIOS[name], args.seed, workdir, args.repeat, args.warmup)
+                samples[name].extend(rounds)
+    results = {name: summarize(samples[name], ops[name]) for name in names}
+    for name, result in results.items():
+        print(f"{name:45s} {result['min_us']:12.2f} us/op", file=sys.stderr)
+
+    document = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "passes": args.passes,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("machine") != document["meta"]["machine"]:
+            print("warning: baseline was recorded on a different machine type", file=sys.stderr)
+        verdicts = compare(results, baseline["results"], args.threshold)
+        document["comparison"] = {"baseline": args.compare, "threshold": args.threshold, "scenarios": verdicts}
+        for name, verdict in verdicts.items():
+            if verdict["verdict"] != "ok":
+                ratio = "-"
+                if verdict["ratio"] is not None:
+                    ratio = f"{verdict['ratio']:.2f}x, threshold {verdict['threshold']:.2f}"
+                print(f"{verdict['verdict'].upper():12s} {name} ({ratio})", file=sys.stderr)
+        if any(v["verdict"] == "regression" for v in verdicts.values()):
+            exit_code = 1
+
+    text = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
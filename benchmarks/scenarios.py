@@ -0,0 +1,254 @@
+"""
+Seeded hot-path scenarios for benchmarks/run.py.
+
+Each scenario is a function taking (seed, workdir) and returning a
+(run, ops) pair: run() performs ops operations and is what gets timed.
+Setup that should not be measured happens before returning. Scenarios
+that touch files do so under workdir, never the repository's data files.
+"""
+
+import json
+import os
+import random
+
+import numpy as np
+
+from _common import load_module, load_script
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    def register(fn):
+        SCENARIOS[name] = fn
+        return fn
+    return register
+
+
+def _far_route():
+    # Far enough that the sim never reaches a waypoint while being timed.
+    return [(37.7749, -122.4194), (47.6062, -122.3321)]
+
+
+def _vehicle(seed, workdir):
+    vehicle = load_script('vehicle')
+    data_dir = os.path.join(workdir, 'vehicle')
+    os.makedirs(data_dir, exist_ok=True)
+    sim = vehicle.VehicleSim(seed=seed, data_dir=data_dir)
+    sim.route = _far_route()
+    sim.position = sim.route[0]
+    sim.status = 'enroute'
+    return vehicle, sim
+
+
+@scenario("vehicle.move_towards_next_waypoint")
+def move_towards_next_waypoint(seed, workdir):
+    _, sim = _vehicle(seed, workdir)
+    ops = 1000
+
+    def run():
+        sim.position = sim.route[0]
+        sim.current_idx = 0
+        sim.battery = 100.0
+        for _ in range(ops):
+            sim.move_towards_next_waypoint()
+    return run, ops
+
+
+@scenario("vehicle.perform_recon_scan")
+def perform_recon_scan(seed, workdir):
+    _, sim = _vehicle(seed, workdir)
+    for _ in range(100):
+        sim.perform_recon_scan(sim.position)
+    history, hazards = list(sim.recon_data), list(sim.hazards)
+    ops = 20
+
+    def run():
+        # Each scan rewrites the whole recon file, so keep its size fixed.
+        sim.recon_data, sim.hazards = list(history), list(hazards)
+        for _ in range(ops):
+            sim.perform_recon_scan(sim.position)
+    return run, ops
+
+
+@scenario("vehicle.write_status")
+def write_status(seed, workdir):
+    _, sim = _vehicle(seed, workdir)
+    while len(sim.hazards) < 10:
+        sim.perform_recon_scan(sim.position)
+    ops = 200
+
+    def run():
+        for _ in range(ops):
+            sim.write_status()
+    return run, ops
+
+
+def _handle_commands(depth):
+    def build(seed, workdir):
+        _, sim = _vehicle(seed, workdir)
+        rng = random.Random(seed)
+        actions = [
+            lambda i: {'action': 'manual', 'direction': rng.choice('NSEW'), 'speed': i},
+            lambda i: {'action': 'start', 'seq': i},
+            lambda i: {'action': 'stop', 'seq': i},
+            lambda i: {'action': 'recon', 'seq': i},
+            lambda i: {'action': 'stop_recon', 'seq': i},
+        ]
+        payload = json.dumps([rng.choice(actions)(i) for i in range(depth)])
+        ops = 20
+
+        def run():
+            for _ in range(ops):
+                # What the dashboard leaves behind, then one vehicle tick's worth of handling.
+                with open(sim.command_file, 'w') as f:
+                    f.write(payload)
+                sim.handle_commands()
+        return run, ops
+    return build
+
+
+for _depth in (1, 10, 100):
+    scenario(f"vehicle.handle_commands[depth={_depth}]")(_handle_commands(_depth))
+
+
+def _app_client(seed, workdir):
+    vehicle, sim = _vehicle(seed, workdir)
+    app_module = load_script('app')
+    fleet = load_script('fleet')
+    from fastapi.testclient import TestClient
+    app_module.default_vehicle = fleet.VehicleHandle("default", os.path.dirname(sim.status_file),
+                                                     app_module.file_pool)
+    return sim, TestClient(app_module.app)
+
+
+@scenario("app.status")
+def app_status(seed, workdir):
+    sim, client = _app_client(seed, workdir)
+    sim.write_status()
+    ops = 200
+
+    def run():
+        for _ in range(ops):
+            client.get("/status")
+    return run, ops
+
+
+@scenario("app.logs")
+def app_logs(seed, workdir):
+    sim, client = _app_client(seed, workdir)
+    for i in range(10_000):
+        sim.log_event(f"Seeded log line {i}")
+    ops = 200
+
+    def run():
+        for i in range(ops):
+            sim.log_event(f"Appended line {i}")
+            client.get("/logs")
+    return run, ops
+
+
+def _snapshot_client(seed, workdir):
+    from PIL import Image
+    sim, client = _app_client(seed, workdir)
+    pixels = np.random.default_rng(seed).integers(0, 256, (720, 1280, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(os.path.join(os.path.dirname(sim.status_file), 'latest_image.jpg'), quality=85)
+    etag = client.get("/camera/snapshot").headers["etag"]
+    return client, etag
+
+
+@scenario("app.camera_snapshot")
+def app_camera_snapshot(seed, workdir):
+    client, _ = _snapshot_client(seed, workdir)
+    ops = 200
+
+    def run():
+        for _ in range(ops):
+            client.get("/camera/snapshot")
+    return run, ops
+
+
+@scenario("app.camera_snapshot[304]")
+def app_camera_snapshot_not_modified(seed, workdir):
+    client, etag = _snapshot_client(seed, workdir)
+    headers = {"If-None-Match": etag}
+    ops = 200
+
+    def run():
+        for _ in range(ops):
+            client.get("/camera/snapshot", headers=headers)
+    return run, ops
+
+
+@scenario("sensors.lidar_perform_scan")
+def lidar_perform_scan(seed, workdir):
+    sensors = load_module('sensors')
+    random.seed(seed)
+    scanner = sensors.LiDARScanner()
+    ops = 100
+
+    def run():
+        for _ in range(ops):
+            scanner.perform_scan()
+    return run, ops
+
+
+@scenario("ai.detect_sensor_anomaly")
+def detect_sensor_anomaly(seed, workdir):
+    ai = load_module('ai')
+    rng = np.random.default_rng(seed)
+    channels = ("temperature", "humidity", "air_quality", "pressure")
+    values = rng.normal([25.0, 40.0, 50.0, 1013.25], [2.0, 5.0, 8.0, 1.5], size=(2000, len(channels)))
+    history = [(float(i), dict(zip(channels, row))) for i, row in enumerate(values.tolist())]
+    ops = len(history)
+
+    def run():
+        module = ai.AIModule()
+        for i in range(1, ops + 1):
+            module.detect_sensor_anomaly(history[max(0, i - 2):i])
+    return run, ops
+
+
+@scenario("metrics.histogram_observe")
+def histogram_observe(seed, workdir):
+    metrics = load_module('metrics')
+    rng = random.Random(seed)
+    histogram = metrics.MetricsRegistry().histogram("bench_seconds", "Benchmark latencies", ("phase",))
+    child = histogram.labels("tick")
+    values = [rng.lognormvariate(-7.0, 1.5) for _ in range(5000)]
+    ops = len(values)
+
+    def run():
+        for value in values:
+            child.observe(value)
+    return run, ops
+
+
+def _security():
+    security = load_module('security')
+    return security.VehicleSecurity()
+
+
+@scenario("security.authenticate_user")
+def authenticate_user(seed, workdir):
+    guard = _security()
+    ops = 200
+
+    def run():
+        for i in range(ops):
+            guard.authenticate_user(f"operator{i}", "secret", "10.0.0.1")
+    return run, ops
+
+
+@scenario("security.verify_token")
+def verify_token(seed, workdir):
+    guard = _security()
+    rng = random.Random(seed)
+    tokens = [guard.authenticate_user(f"operator{i}", "secret", "10.0.0.1") for i in range(100)]
+    checks = [(rng.choice(tokens) if rng.random() < 0.9 else f"unknown-{i}", "10.0.0.1") for i in range(2000)]
+    ops = len(checks)
+
+    def run():
+        for token, ip in checks:
+            guard.verify_token(token, ip)
+    return run, ops
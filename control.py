@@ -1,7 +1,13 @@
 import time
-from .mechanical import RobotArm, ArmRotation, WheelServoController
-from .sensors import EnvironmentalSensor, LiDARScanner
+from concurrent.futures import Future
+
+import numpy as np
+from .mechanical import RobotArm, ArmRotation, WheelServoController, ArmTrajectory
+from .sensors import EnvironmentalSensor, LiDARScanner, ENVIRONMENT_CONDITION_RULES
 from .ai import AIModule, VisionAIModule, ShapeVolumeDetection
+from .telemetry import telemetry
+from .eventlog import EventLog
+from .power_model import DrainRateEstimator
 
 class RobotController:
     def __init__(self, robotarm, armrotation, vision_ai_module, shape_volume_detector):
@@ -9,38 +15,36 @@ class RobotController:
         self.armrotation = armrotation
         self.vision_ai_module = vision_ai_module
         self.shape_volume_detector = shape_volume_detector
+        self.perception = None
 
     def power_button(self, power_on=False, power_off=False):
         if power_off:
-            print("Power is off.")
+            telemetry.info("CONTROL", "power_off", "Power is off.")
             self.robotarm.active = False
             self.armrotation.active = False
             return False
         elif power_on:
-            print("Power is on.")
+            telemetry.info("CONTROL", "power_on", "Power is on.")
             self.robotarm.active = True
             self.armrotation.active = True
             return True
 
     def rotational_direction_robotarm(self, delta, right_rotate=False, left_rotate=False, complete_rotate=False):
         if self.armrotation.active:
-            print("Robot arm rotation is active.")
             if right_rotate:
                 self.armrotation.rotation_angle += delta
             if left_rotate:
                 self.armrotation.rotation_angle -= delta
             if complete_rotate:
                 self.armrotation.rotation_angle = 360
-            print(f"Updated rotation angle: {self.armrotation.rotation_angle}°")
+            telemetry.debug("CONTROL", "rotated", "Updated rotation angle: {angle}°", angle=self.armrotation.rotation_angle)
 
     def activate_arm_movement(self):
         if self.robotarm.active:
-            print("Executing arm movement...")
             self.robotarm.arm_movement()
 
     def directional_movement_robotarm(self, right_move=False, left_move=False, up_move=False, down_move=False, forward_move=False, backward_move=False):
         if self.robotarm.active:
-            print("Setting directional movement commands...")
             self.robotarm.right_move = right_move
             self.robotarm.left_move = left_move
             self.robotarm.up_move = up_move
@@ -49,46 +53,128 @@ class RobotController:
             self.robotarm.back_move = backward_move
             self.activate_arm_movement()
 
+    def move_arm_to(self, target=None, waypoints=None, step=1.0, max_speed=None, max_angular_speed=None,
+                    simulate=False, on_pose=None):
+        """
+        Plan and run a whole arm motion in one call.
+
+        Args:
+            target: Final (x, y, z) or (x, y, z, rotation) pose
+            waypoints: Alternatively, a list of poses to pass through in order
+            step, max_speed, max_angular_speed: Passed to ArmTrajectory.plan()
+            simulate: Plan and report without moving the arm
+            on_pose: Optional per-pose callback, see RobotArm.follow_trajectory()
+
+        Returns:
+            The planned ArmTrajectory, or None if the arm is powered off
+        """
+        if not self.robotarm.active:
+            return None
+        if waypoints is None:
+            waypoints = [] if target is None else [target]
+        start = (*self.robotarm.position, self.armrotation.rotation_angle)
+        trajectory = ArmTrajectory.plan(start, waypoints, step=step, max_speed=max_speed,
+                                        max_angular_speed=max_angular_speed)
+        self.robotarm.follow_trajectory(trajectory, rotation=self.armrotation, simulate=simulate, on_pose=on_pose)
+        return trajectory
+
     def analyze_object_with_ai(self):
         detected_shape = self.vision_ai_module.detect_shape()
-        print(f"Detected shape: {detected_shape}")
+        telemetry.debug("CONTROL", "shape_detected", "Detected shape: {shape}", shape=detected_shape)
         
-        shape_volume_map = {
-            "cube": self.shape_volume_detector.cube_volume,
-            "rectangular_prism": self.shape_volume_detector.rectangular_prism_volume,
-            "sphere": self.shape_volume_detector.sphere_volume,
-            "cylinder": self.shape_volume_detector.cylinder_volume,
-            "cone": self.shape_volume_detector.cone_volume
-        }
-        
-        if detected_shape in shape_volume_map:
-            shape_volume_map[detected_shape]()
-        else:
-            print("Shape not Identified.")
+        if self.shape_volume_detector.supports(detected_shape):
+            return self.shape_volume_detector.evaluate(detected_shape)
+        telemetry.warning("CONTROL", "shape_unknown", "Shape not Identified.", shape=detected_shape)
+        return None
+
+    def attach_perception(self, pipeline):
+        """Route request_object_analysis() through a started PerceptionPipeline."""
+        self.perception = pipeline
+
+    def request_object_analysis(self, frame=None, on_result=None):
+        """
+        Non-blocking counterpart of analyze_object_with_ai.
+
+        Args:
+            frame: Camera frame handed to the perception backend
+            on_result: Optional callback((shape, evaluation)) run on a perception worker
+
+        Returns:
+            Future resolving to (shape, (volume, verdict)) or (shape, None) for
+            unknown shapes, or None when the perception queue is full
+        """
+        if self.perception is None:
+            raise RuntimeError("No perception pipeline attached")
+        analysis = Future()
+
+        def evaluate(detection):
+            if not analysis.set_running_or_notify_cancel():
+                return
+            try:
+                if self.shape_volume_detector.supports(detection):
+                    result = (detection, self.shape_volume_detector.evaluate(detection))
+                else:
+                    telemetry.warning("CONTROL", "shape_unknown", "Shape not Identified.", shape=detection)
+                    result = (detection, None)
+            except Exception as e:
+                analysis.set_exception(e)
+                return
+            analysis.set_result(result)
+            if on_result is not None:
+                on_result(result)
+
+        detection = self.perception.submit(frame, callback=evaluate)
+        if detection is None:
+            telemetry.debug("CONTROL", "perception_backpressure", "Perception queue full; frame skipped.")
+            return None
+        detection.add_done_callback(lambda f: self._propagate_failure(f, analysis))
+        return analysis
+
+    @staticmethod
+    def _propagate_failure(detection, analysis):
+        if detection.cancelled():
+            analysis.cancel()
+        elif detection.exception() is not None and analysis.set_running_or_notify_cancel():
+            analysis.set_exception(detection.exception())
 
 class AutonomousDecisionEngine:
-    def __init__(self):
+    def __init__(self, log_capacity=10000, spill_path=None, clock=time.time):
+        self.clock = clock
+        self.recorder = None  # MissionRecorder capturing inputs and decisions
         self.mission_objective = None
         self.last_sensor_input = {}
-        self.actions_log = []
-        self.mission_start_time = time.time()
+        self.actions_log = EventLog(("kind", "value"), capacity=log_capacity, spill_path=spill_path)
+        self.mission_start_time = clock()
         self.timeout_limit = 600  # seconds
 
     def set_mission_objective(self, objective):
         self.mission_objective = objective
-        print(f"[DECISION ENGINE] Mission objective set: {objective}")
+        telemetry.info("DECISION ENGINE", "objective_set", "Mission objective set: {objective}", objective=objective)
 
     def update_sensor_input(self, data):
+        if self.recorder is not None:
+            self.recorder.engine_update(self.clock())
         self.last_sensor_input = data
-        print(f"[DECISION ENGINE] Sensor data updated: {data}")
+        if self.recorder is not None:
+            self.recorder.record_engine_input(self.clock(), data)
+        telemetry.debug("DECISION ENGINE", "sensor_input", "Sensor data updated: {data}", data=data)
 
     def evaluate_mission(self):
+        if self.recorder is not None:
+            self.recorder.engine_update(self.clock())
+        decision = self._evaluate()
+        if self.recorder is not None:
+            self.recorder.record_engine_decision(self.clock(), decision)
+        return decision
+
+    def _evaluate(self):
         if not self.last_sensor_input:
-            print("[DECISION ENGINE] No sensor data to evaluate.")
+            telemetry.debug("DECISION ENGINE", "no_input", "No sensor data to evaluate.")
             return
-        elapsed = time.time() - self.mission_start_time
+        elapsed = self.clock() - self.mission_start_time
         if elapsed > self.timeout_limit:
-            print("[DECISION ENGINE] Mission timeout reached. Triggering retry/abort.")
+            telemetry.warning("DECISION ENGINE", "mission_timeout", "Mission timeout reached. Triggering retry/abort.",
+                              elapsed=elapsed)
             return "mission_timeout"
 
         decision = "continue"
@@ -99,64 +185,326 @@ class AutonomousDecisionEngine:
         elif self.last_sensor_input.get("target_reached"):
             decision = "complete_mission"
             confidence_score = 1.0
-        self.actions_log.append((time.time(), decision, confidence_score))
-        print(f"[DECISION ENGINE] Decision made: {decision} (confidence: {confidence_score})")
+        self.actions_log.append((self.clock(), decision, confidence_score))
+        telemetry.debug("DECISION ENGINE", "decision", "Decision made: {decision} (confidence: {confidence})",
+                        decision=decision, confidence=confidence_score)
         return decision
 
+    def get_state(self):
+        return {
+            "mission_objective": self.mission_objective,
+            "last_sensor_input": self.last_sensor_input,
+            "mission_start_time": self.mission_start_time,
+            "timeout_limit": self.timeout_limit,
+        }
+
+    def restore_state(self, state):
+        self.mission_objective = state["mission_objective"]
+        self.last_sensor_input = state["last_sensor_input"]
+        self.mission_start_time = state["mission_start_time"]
+        self.timeout_limit = state["timeout_limit"]
+
+    def decision_summary(self, start=None, end=None):
+        """Decision counts by type and mean confidence for decisions made between start and end."""
+        return {
+            "counts": self.actions_log.count_by_kind(start, end),
+            "mean_confidence": self.actions_log.mean_value(start, end),
+        }
+
+# Declarative safety rules. A rule trips when `channel op threshold` has held
+# for `debounce` seconds, and clears once the value is back past the threshold
+# by `hysteresis`. A rule may instead list several (channel, op, threshold)
+# "conditions", all of which must hold. Boolean channels are read as 0/1.
+LOW_POWER_THRESHOLD = 20  # battery percent; PowerMonitor's default low-power threshold
+
+def default_safety_rules(low_power_threshold=LOW_POWER_THRESHOLD):
+    """The built-in rule set, with the low_power rule at the given battery level."""
+    return [
+        {"name": "collision_risk", "channel": "collision_risk", "op": ">", "threshold": 0,
+         "action": "emergency_override"},
+        {"name": "system_fault", "channel": "system_fault", "op": ">", "threshold": 0, "action": "mission_abort"},
+        {"name": "overheat", "channel": "temperature", "op": ">", "threshold": 60, "action": "emergency_override",
+         "hysteresis": 2.0},
+        {"name": "low_power", "channel": "battery_level", "op": "<=", "threshold": low_power_threshold,
+         "action": "warn", "hysteresis": 1.0},
+    ] + [
+        {"name": label, "conditions": [tuple(clause) for clause in clauses], "action": "warn"}
+        for label, clauses in ENVIRONMENT_CONDITION_RULES
+    ]
+
+DEFAULT_SAFETY_RULES = default_safety_rules()
+
+class SafetyRuleEngine:
+    """
+    Flat, vectorized evaluator for a declarative safety rule set.
+
+    Rules are compiled into parallel NumPy arrays with one entry per
+    condition (channel index, sign, threshold, hysteresis) and one per rule
+    (debounce, state), so each frame costs a fixed number of array
+    operations regardless of how many rules there are; only the names of
+    rules that changed state are handled in Python. The engine tracks which
+    rules are active and the worst evaluation latency seen.
+
+    A channel missing from a frame (absent, None or NaN) keeps its last
+    reading, so a dropped sample neither clears an active rule nor re-trips
+    it when the channel comes back.
+
+    latency_budget_us bounds the evaluation work: bench_safety_rules.py fails
+    if any frame's best-of-rounds latency exceeds it. It cannot bound time
+    lost to a GC pause or preemption; frames that run over for any reason
+    are counted in over_budget.
+    """
+
+    _SIGNS = {">": (1.0, True), ">=": (1.0, False), "<": (-1.0, True), "<=": (-1.0, False)}
+
+    def __init__(self, rules=DEFAULT_SAFETY_RULES, latency_budget_us=50.0):
+        self.rules = [dict(rule) for rule in rules]
+        self.names = [rule["name"] for rule in self.rules]
+        self._name_array = np.array(self.names, dtype=object)
+        self.actions = [rule.get("action", "warn") for rule in self.rules]
+        self.action_for = dict(zip(self.names, self.actions))
+        if len(self.action_for) != len(self.rules):
+            raise ValueError("Safety rule names must be unique")
+        conditions = [self._conditions(rule) for rule in self.rules]
+        clauses = [clause for rule_conditions in conditions for clause in rule_conditions]
+        self.channels = tuple(dict.fromkeys(channel for channel, _, _ in clauses))
+        channel_index = {channel: i for i, channel in enumerate(self.channels)}
+        signs = np.array([self._SIGNS[op][0] for _, op, _ in clauses])
+        strict = np.array([self._SIGNS[op][1] for _, op, _ in clauses], dtype=bool)
+        self._channel = np.array([channel_index[channel] for channel, _, _ in clauses], dtype=np.intp)
+        self._sign = signs
+        # Compare sign * value against sign * threshold so every condition is
+        # a ">" test; ">=" compares against the next float below the threshold.
+        trip = signs * np.array([float(threshold) for _, _, threshold in clauses])
+        self._trip = np.where(strict, trip, np.nextafter(trip, -np.inf))
+        hysteresis = [float(rule.get("hysteresis", 0.0)) for rule, rule_conditions in zip(self.rules, conditions)
+                      for _ in rule_conditions]
+        self._clear = trip - np.array(hysteresis)
+        self._debounce = np.array([float(rule.get("debounce", 0.0)) for rule in self.rules])
+        self._debounced_rules = bool(self._debounce.any())
+        # Start of each rule's conditions, for AND-reducing multi-condition
+        # rules; None when every rule has exactly one condition.
+        counts = [len(rule_conditions) for rule_conditions in conditions]
+        self._starts = None if all(count == 1 for count in counts) else np.cumsum([0] + counts[:-1])
+        # Scratch buffers reused by every evaluate() call.
+        n, m = len(self.rules), len(clauses)
+        self._missing = np.empty(len(self.channels), dtype=bool)
+        self._scaled = np.empty(m)
+        self._beyond_trip = np.empty(m, dtype=bool)
+        self._above_clear = np.empty(m, dtype=bool)
+        self._below_trip = np.empty(n, dtype=bool)
+        self._candidate = np.empty(n)
+        self._debounced = np.empty(n, dtype=bool)
+        self._next_active = np.empty(n, dtype=bool)
+        self._changed = np.empty(n, dtype=bool)
+        self._edge = np.empty(n, dtype=bool)
+        self.latency_budget_us = latency_budget_us
+        self.reset()
+
+    def _conditions(self, rule):
+        conditions = rule.get("conditions")
+        if conditions is None:
+            conditions = [(rule["channel"], rule["op"], rule["threshold"])]
+        if not conditions:
+            raise ValueError(f"Safety rule {rule['name']} has no conditions")
+        for _, op, _ in conditions:
+            if op not in self._SIGNS:
+                raise ValueError(f"Unsupported safety rule operator: {op}")
+        return [tuple(condition) for condition in conditions]
+
+    def reset(self):
+        """Clear rule state, held channel values and latency statistics."""
+        n = len(self.rules)
+        self.active = np.zeros(n, dtype=bool)
+        # When each rule whose condition holds will have held it for its
+        # debounce time; inf while the condition does not hold.
+        self._deadline = np.full(n, np.inf)
+        self._held = np.full(len(self.channels), np.nan)
+        self.evaluations = 0
+        self.last_latency_us = 0.0
+        self.worst_latency_us = 0.0
+        self.over_budget = 0
+
+    def frame_vector(self, frame):
+        """Convert a sensor dict into a value vector ordered as self.channels (missing -> NaN)."""
+        return np.array([frame.get(channel) for channel in self.channels], dtype=np.float64)
+
+    def evaluate(self, frame, timestamp=None):
+        """
+        Evaluate every rule against one frame.
+
+        Each call is a fixed sequence of NumPy operations on preallocated
+        buffers; a frame that changes no rule's state returns without
+        building any lists.
+
+        Args:
+            frame: Sensor dict, or a value vector ordered as self.channels
+                (NaN for a missing channel)
+            timestamp: Frame time in seconds (defaults to time.monotonic())
+
+        Returns:
+            (tripped, cleared): names of rules that became active / inactive
+        """
+        start = time.perf_counter_ns()
+        now = time.monotonic() if timestamp is None else timestamp
+        values = self.frame_vector(frame) if isinstance(frame, dict) else np.asarray(frame, dtype=np.float64)
+        missing = np.isnan(values, out=self._missing)
+        if missing.any():
+            values = np.where(missing, self._held, values)
+        np.copyto(self._held, values)
+
+        scaled = values.take(self._channel, out=self._scaled)
+        np.multiply(scaled, self._sign, out=scaled)
+        beyond_trip = np.greater(scaled, self._trip, out=self._beyond_trip)
+        above_clear = np.greater(scaled, self._clear, out=self._above_clear)
+        if self._starts is not None:
+            beyond_trip = np.logical_and.reduceat(beyond_trip, self._starts)
+            above_clear = np.logical_and.reduceat(above_clear, self._starts)
+
+        if self._debounced_rules:
+            # A condition that keeps holding keeps its deadline, a new one gets
+            # now + debounce, and one that stopped holding goes back to inf.
+            candidate = np.add(self._debounce, now, out=self._candidate)
+            np.minimum(self._deadline, candidate, out=self._deadline)
+            np.putmask(self._deadline, np.logical_not(beyond_trip, out=self._below_trip), np.inf)
+            debounced = np.less_equal(self._deadline, now, out=self._debounced)
+        else:
+            debounced = beyond_trip
+
+        active = self.active
+        new_active = np.logical_and(active, above_clear, out=self._next_active)
+        np.logical_or(new_active, debounced, out=new_active)
+        changed = np.not_equal(new_active, active, out=self._changed)
+        # Swap buffers: the old state array becomes next frame's scratch.
+        self.active, self._next_active = new_active, active
+        if changed.any():
+            tripped = self._name_array[np.logical_and(changed, new_active, out=self._edge)].tolist()
+            cleared = self._name_array[np.logical_and(changed, active, out=self._edge)].tolist()
+        else:
+            tripped = cleared = []
+
+        elapsed_us = (time.perf_counter_ns() - start) / 1000.0
+        self.evaluations += 1
+        self.last_latency_us = elapsed_us
+        if elapsed_us > self.worst_latency_us:
+            self.worst_latency_us = elapsed_us
+        if elapsed_us > self.latency_budget_us:
+            self.over_budget += 1
+        return tripped, cleared
+
+    def active_rules(self):
+        return [self.names[i] for i in np.flatnonzero(self.active)]
+
+    def get_latency_report(self):
+        return {
+            "rules": len(self.rules),
+            "evaluations": self.evaluations,
+            "last_latency_us": self.last_latency_us,
+            "worst_latency_us": self.worst_latency_us,
+            "latency_budget_us": self.latency_budget_us,
+            "over_budget": self.over_budget,
+        }
+
 class SafetySystem:
-    def __init__(self):
+    def __init__(self, rules=None, log_capacity=10000, spill_path=None, power_monitor=None):
+        """
+        Args:
+            rules: Safety rule set (defaults to default_safety_rules())
+            power_monitor: PowerMonitor whose low_power_threshold the default
+                low_power rule uses
+        """
+        if rules is None:
+            threshold = power_monitor.low_power_threshold if power_monitor is not None else LOW_POWER_THRESHOLD
+            rules = default_safety_rules(threshold)
         self.emergency_override = False
         self.abort_triggered = False
-        self.safety_log = []
+        self.safety_log = EventLog(("kind",), capacity=log_capacity, spill_path=spill_path)
+        self.rule_engine = SafetyRuleEngine(rules)
 
-    def check_conditions(self, sensor_input):
-        if sensor_input.get("collision_risk"):
-            self.activate_emergency_override()
-        if sensor_input.get("system_fault"):
-            self.trigger_mission_abort()
-        if sensor_input.get("temperature") and sensor_input["temperature"] > 60:
-            self.activate_emergency_override()
+    def check_conditions(self, sensor_input, timestamp=None):
+        tripped, _ = self.rule_engine.evaluate(sensor_input, timestamp)
+        for name in tripped:
+            action = self.rule_engine.action_for[name]
+            if action == "emergency_override":
+                self.activate_emergency_override()
+            elif action == "mission_abort":
+                self.trigger_mission_abort()
+            else:
+                self.safety_log.append((time.time(), name))
+                telemetry.warning("SAFETY", "rule_tripped", "Safety rule tripped: {rule}", rule=name)
+        return tripped
 
     def activate_emergency_override(self):
         self.emergency_override = True
         self.safety_log.append((time.time(), "emergency_override"))
-        print("[SAFETY] Emergency override activated.")
+        telemetry.warning("SAFETY", "emergency_override", "Emergency override activated.")
 
     def trigger_mission_abort(self):
         self.abort_triggered = True
         self.safety_log.append((time.time(), "mission_abort"))
-        print("[SAFETY] Mission aborted due to critical fault.")
+        telemetry.error("SAFETY", "mission_abort", "Mission aborted due to critical fault.")
 
     def reset_safety_state(self):
         self.emergency_override = False
         self.abort_triggered = False
-        print("[SAFETY] Safety state reset.")
+        self.rule_engine.reset()
+        telemetry.info("SAFETY", "reset", "Safety state reset.")
 
     def is_safe_to_proceed(self):
         return not self.emergency_override and not self.abort_triggered
 
 class PowerMonitor:
-    def __init__(self, threshold=20):
+    def __init__(self, threshold=LOW_POWER_THRESHOLD, log_capacity=10000, spill_path=None, battery_capacity_wh=100.0):
         self.battery_level = 100
         self.low_power_threshold = threshold
-        self.power_log = []
+        self.power_log = EventLog(("value", "kind"), capacity=log_capacity, spill_path=spill_path)
         self.power_source = "battery"  # or 'solar'
+        self.solar_panel = None
+        # One watt for one minute adds 100 / (capacity_wh * 60) percent.
+        self.drain_estimator = DrainRateEstimator(solar_gain_per_watt_min=100.0 / (battery_capacity_wh * 60.0))
+
+    def attach_solar_panel(self, panel):
+        """Credit this SolarPanel's output when estimating drain."""
+        self.solar_panel = panel
 
-    def update_battery_level(self, level, source="battery"):
+    def current_solar_input(self):
+        return self.solar_panel.power_generated if self.solar_panel is not None else 0.0
+
+    def update_battery_level(self, level, source="battery", timestamp=None):
+        timestamp = time.time() if timestamp is None else timestamp
         self.battery_level = level
         self.power_source = source
-        self.power_log.append((time.time(), level, source))
-        print(f"[POWER] Battery level: {level}%, Source: {source}")
+        self.power_log.append((timestamp, level, source))
+        self.drain_estimator.update(timestamp, level, self.current_solar_input())
+        telemetry.debug("POWER", "battery_level", "Battery level: {level}%, Source: {source}", level=level, source=source)
         if self.battery_level <= self.low_power_threshold:
             self.trigger_low_power_mode()
 
     def trigger_low_power_mode(self):
-        print("[POWER] LOW POWER MODE TRIGGERED. Conserving resources...")
+        telemetry.warning("POWER", "low_power", "LOW POWER MODE TRIGGERED. Conserving resources...",
+                          level=self.battery_level)
 
-    def estimate_runtime(self, drain_rate_per_min=1):
-        if drain_rate_per_min == 0:
+    def estimate_runtime(self, drain_rate_per_min=None):
+        if drain_rate_per_min is None:
+            drain_rate_per_min = self.drain_estimator.net_rate(self.current_solar_input())
+            if drain_rate_per_min is None:
+                drain_rate_per_min = 1
+        if drain_rate_per_min <= 0:
             return float('inf')
         return self.battery_level / drain_rate_per_min
 
+    def predict_runtime(self, threshold=None, z=1.96):
+        """
+        Minutes until the battery reaches threshold (default: the low-power
+        threshold) at the observed net drain rate, with confidence bounds.
+        """
+        threshold = self.low_power_threshold if threshold is None else threshold
+        return self.drain_estimator.runtime(self.battery_level, threshold, self.current_solar_input(), z)
+
+    def can_sustain(self, duration_min, threshold=None, z=1.96):
+        """True if even the pessimistic runtime estimate covers duration_min; None without drain data."""
+        lower = self.predict_runtime(threshold, z)["lower"]
+        return None if lower is None else lower >= duration_min
+
     def is_critical(self):
         return self.battery_level <= self.low_power_threshold 
\ No newline at end of file
@@ -0,0 +1,174 @@
+"""
+Fixed-capacity, array-backed event logs.
+
+EventLog replaces the unbounded lists of tuples kept by the decision engine,
+safety system, power monitor and solar panel. Every entry is stored as a
+(timestamp, kind, value) row in preallocated NumPy arrays, with kind strings
+interned to small integer codes. When the buffer is full each new entry
+overwrites the oldest one, so the log always holds the latest `capacity`
+entries. With spill_path set, the oldest half is instead appended to a
+JSON-lines file in one batch, which keeps file writes infrequent.
+
+The log keeps the tuple shape callers used before: `fields` names what
+follows the timestamp, e.g. ("kind", "value") for (ts, decision, confidence)
+or ("value", "kind") for (ts, level, source). Appending, iterating and
+indexing all use that shape.
+"""
+
+import json
+import math
+
+import numpy as np
+
+
+class EventLog:
+    def __init__(self, fields=("kind", "value"), capacity=10000, spill_path=None):
+        if not set(fields) <= {"kind", "value"} or not fields:
+            raise ValueError("fields must be a non-empty ordering of 'kind' and 'value'")
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.spilled = 0
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._kinds = np.full(capacity, -1, dtype=np.int32)
+        self._values = np.full(capacity, np.nan, dtype=np.float64)
+        self._head = 0
+        self._size = 0
+        self._kind_codes = {}
+        self._kind_names = []
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __iter__(self):
+        for slot in self._ordered_slots():
+            yield self._entry(slot)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._entry(slot) for slot in self._ordered_slots()[index]]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("EventLog index out of range")
+        return self._entry((self._head - self._size + index) % self.capacity)
+
+    def append(self, entry):
+        """Add a (timestamp, ...) tuple shaped like `fields`."""
+        if self._size == self.capacity:
+            if self.spill_path:
+                self._evict(self.capacity // 2 or 1)
+            else:
+                # Full ring: the slot at _head is the oldest entry, overwritten below.
+                self._size -= 1
+        slot = self._head
+        self._timestamps[slot] = entry[0]
+        kind, value = None, math.nan
+        for name, item in zip(self.fields, entry[1:]):
+            if name == "kind":
+                kind = item
+            else:
+                value = math.nan if item is None else float(item)
+        self._kinds[slot] = self._code(kind)
+        self._values[slot] = value
+        self._head = (slot + 1) % self.capacity
+        self._size += 1
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+
+    def _code(self, kind):
+        if kind is None:
+            return -1
+        code = self._kind_codes.get(kind)
+        if code is None:
+            code = self._kind_codes[kind] = len(self._kind_names)
+            self._kind_names.append(kind)
+        return code
+
+    def _ordered_slots(self):
+        return (self._head - self._size + np.arange(self._size)) % self.capacity
+
+    def _entry(self, slot):
+        code = int(self._kinds[slot])
+        parts = {
+            "kind": self._kind_names[code] if code >= 0 else None,
+            "value": float(self._values[slot]),
+        }
+        return (float(self._timestamps[slot]),) + tuple(parts[name] for name in self.fields)
+
+    def _evict(self, count):
+        slots = self._ordered_slots()[:count]
+        if self.spill_path:
+            with open(self.spill_path, "a") as f:
+                for slot in slots:
+                    f.write(json.dumps(self._record(slot)) + "\n")
+            self.spilled += len(slots)
+        self._size -= len(slots)
+
+    def _record(self, slot):
+        timestamp, *rest = self._entry(slot)
+        record = {"timestamp": timestamp}
+        for name, item in zip(self.fields, rest):
+            record[name] = None if isinstance(item, float) and math.isnan(item) else item
+        return record
+
+    def _select(self, start=None, end=None, kind=None):
+        slots = self._ordered_slots()
+        mask = np.ones(len(slots), dtype=bool)
+        if start is not None:
+            mask &= self._timestamps[slots] >= start
+        if end is not None:
+            mask &= self._timestamps[slots] <= end
+        if kind is not None:
+            mask &= self._kinds[slots] == self._kind_codes.get(kind, -2)
+        return slots[mask]
+
+    def query(self, start=None, end=None, kind=None):
+        """Entries with start <= timestamp <= end (and matching kind), oldest first."""
+        return [self._entry(slot) for slot in self._select(start, end, kind)]
+
+    def to_arrays(self, start=None, end=None):
+        """Columnar copy of the in-memory entries: timestamp, kind (str objects) and value arrays."""
+        slots = self._select(start, end)
+        names = np.array(self._kind_names + [None], dtype=object)
+        return {
+            "timestamp": self._timestamps[slots].copy(),
+            "kind": names[self._kinds[slots]],
+            "value": self._values[slots].copy(),
+        }
+
+    def count_by_kind(self, start=None, end=None):
+        """Number of in-memory entries per kind in the time range."""
+        codes = self._kinds[self._select(start, end)]
+        counts = np.bincount(codes[codes >= 0], minlength=len(self._kind_names))
+        return {name: int(count) for name, count in zip(self._kind_names, counts) if count}
+
+    def mean_value(self, start=None, end=None, kind=None):
+        """Mean of the value column over the selected entries, or None if there are none."""
+        values = self._values[self._select(start, end, kind)]
+        values = values[~np.isnan(values)]
+        return float(values.mean()) if len(values) else None
+
+    def export(self, path):
+        """
+        Write every entry (spilled ones first, then in-memory) as JSON lines.
+
+        Returns:
+            Number of entries written
+        """
+        written = 0
+        with open(path, "w") as out:
+            if self.spill_path and self.spilled:
+                with open(self.spill_path) as spilled:
+                    for line in spilled:
+                        out.write(line)
+                        written += 1
+            for slot in self._ordered_slots():
+                out.write(json.dumps(self._record(slot)) + "\n")
+                written += 1
+        return written
@@ -0,0 +1,336 @@
+"""
+Per-vehicle state for a dashboard serving a fleet.
+
+Every vehicle has its own directory holding the files VehicleSim writes
+(vehicle_status.json, vehicle_logs.txt, vehicle_commands.json,
+latest_image.jpg, vehicle_metrics.prom and profile_<ts>.folded).
+VehicleRegistry keeps one
+VehicleHandle per vehicle, which:
+
+- caches the parsed status, keyed on the file's mtime and size, so an
+  unchanged status costs one stat()
+- tails the log incrementally through a shared pool of open file handles
+- serializes command writes to the vehicle's command file
+
+Every status change is applied to FleetSummary as a delta (old status out,
+new status in). The fleet summary therefore never rereads vehicle files.
+
+Kept free of package-relative imports so app.py can use it directly.
+"""
+
+import glob
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+
+STATUS_NAME = 'vehicle_status.json'
+LOG_NAME = 'vehicle_logs.txt'
+COMMAND_NAME = 'vehicle_commands.json'
+SNAPSHOT_NAME = 'latest_image.jpg'
+METRICS_NAME = 'vehicle_metrics.prom'
+PROFILE_GLOB = 'profile_*.folded'
+
+LOG_TAIL_LINES = 100
+LOW_BATTERY = 20.0
+VEHICLE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9_.-]{0,63}$")
+
+
+class FileHandlePool:
+    """LRU-bounded set of open read-only file handles, keyed by path."""
+
+    def __init__(self, max_open=256):
+        self.max_open = max_open
+        self._files = OrderedDict()
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    def read_from(self, path, offset):
+        """
+        Read a file from offset to its end through a pooled handle.
+
+        A handle is reopened when the path now names a different file
+        (e.g. after rotation), and reading restarts at 0 when the file has
+        shrunk below offset.
+
+        Returns:
+            (data, start offset actually used), or (None, 0) if the file is missing
+        """
+        with self._lock:
+            f = self._files.get(path)
+            try:
+                current = os.stat(path)
+            except FileNotFoundError:
+                if f is not None:
+                    self._files.pop(path).close()
+                return None, 0
+            if f is not None:
+                opened = os.fstat(f.fileno())
+                if (opened.st_dev, opened.st_ino) != (current.st_dev, current.st_ino):
+                    self._files.pop(path).close()
+                    f = None
+                    offset = 0
+            if f is None:
+                f = open(path, 'rb')
+                self.opened += 1
+                self._files[path] = f
+                while len(self._files) > self.max_open:
+                    self._files.popitem(last=False)[1].close()
+            else:
+                self._files.move_to_end(path)
+            if current.st_size < offset:
+                offset = 0
+            f.seek(offset)
+            return f.read(), offset
+
+    def __len__(self):
+        return len(self._files)
+
+    def close(self):
+        with self._lock:
+            while self._files:
+                self._files.popitem()[1].close()
+
+
+def _status_group(status):
+    # "manual: left at 5" and "manual: right at 2" count as one state.
+    return str(status).split(':', 1)[0] if status is not None else 'unknown'
+
+
+class FleetSummary:
+    """Fleet-wide aggregates maintained from per-vehicle status deltas."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reporting = 0
+        self.battery_sum = 0.0
+        self.battery_reported = 0
+        self.low_battery = 0
+        self.battery_histogram = [0] * 10
+        self.recon_active = 0
+        self.recent_hazards = 0
+        self.by_status = Counter()
+
+    def update(self, previous, current):
+        """Replace one vehicle's contribution; either side may be None."""
+        with self._lock:
+            if previous is not None:
+                self._apply(previous, -1)
+            if current is not None:
+                self._apply(current, 1)
+
+    def _apply(self, status, sign):
+        self.reporting += sign
+        battery = status.get('battery')
+        if isinstance(battery, (int, float)):
+            self.battery_sum += sign * battery
+            self.battery_reported += sign
+            self.low_battery += sign * (battery <= LOW_BATTERY)
+            self.battery_histogram[min(max(int(battery // 10), 0), 9)] += sign
+        group = _status_group(status.get('status'))
+        self.by_status[group] += sign
+        if not self.by_status[group]:
+            del self.by_status[group]
+        self.recon_active += sign * bool(status.get('recon_mode'))
+        self.recent_hazards += sign * len(status.get('hazards') or ())
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'reporting': self.reporting,
+                'by_status': dict(self.by_status),
+                'battery_mean': self.battery_sum / self.battery_reported if self.battery_reported else None,
+                'low_battery': self.low_battery,
+                'battery_histogram': {f"{10 * i}-{10 * i + 10}": count
+                                      for i, count in enumerate(self.battery_histogram)},
+                'recon_active': self.recon_active,
+                'recent_hazards': self.recent_hazards,
+            }
+
+
+class VehicleHandle:
+    def __init__(self, vehicle_id, data_dir, pool, summary=None):
+        self.vehicle_id = vehicle_id
+        self.data_dir = data_dir
+        self.status_file = os.path.join(data_dir, STATUS_NAME)
+        self.log_file = os.path.join(data_dir, LOG_NAME)
+        self.command_file = os.path.join(data_dir, COMMAND_NAME)
+        self.snapshot_file = os.path.join(data_dir, SNAPSHOT_NAME)
+        self.metrics_file = os.path.join(data_dir, METRICS_NAME)
+        self.pool = pool
+        self.summary = summary
+        self.lock = threading.Lock()
+        self._status = None
+        self._status_stamp = None
+        self._log_lines = deque(maxlen=LOG_TAIL_LINES)
+        self._log_offset = 0
+        self._log_partial = b""
+
+    def status(self):
+        """Parsed status, reread only when the file's mtime or size changes; None if absent."""
+        try:
+            st = os.stat(self.status_file)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            stamp = None
+        with self.lock:
+            if stamp == self._status_stamp:
+                return self._status
+            status = None
+            if stamp is not None:
+                try:
+                    with open(self.status_file) as f:
+                        status = json.load(f)
+                except (OSError, ValueError):
+                    # Caught mid-write; serve the last complete status.
+                    return self._status
+            previous, self._status, self._status_stamp = self._status, status, stamp
+            if self.summary is not None:
+                self.summary.update(previous, status)
+            return status
+
+    def forget(self):
+        """Withdraw this vehicle's contribution from the fleet summary."""
+        with self.lock:
+            if self.summary is not None:
+                self.summary.update(self._status, None)
+            self._status = self._status_stamp = None
+
+    def logs(self):
+        """Last LOG_TAIL_LINES log lines, reading only what was appended since the last call."""
+        with self.lock:
+            data, start = self.pool.read_from(self.log_file, self._log_offset)
+            if data is None:
+                self._log_lines.clear()
+                self._log_offset, self._log_partial = 0, b""
+                return []
+            if start != self._log_offset:
+                self._log_lines.clear()
+                self._log_partial = b""
+            self._log_offset = start + len(data)
+            chunk = self._log_partial + data
+            lines = chunk.split(b"\n")
+            self._log_partial = lines.pop()
+            self._log_lines.extend(line.decode(errors='replace') + "\n" for line in lines)
+            tail = list(self._log_lines)
+            if self._log_partial:
+                tail = tail[1:] if len(tail) == LOG_TAIL_LINES else tail
+                tail.append(self._log_partial.decode(errors='replace'))
+            return tail
+
+    def latest_profile(self):
+        """Path of the most recent collapsed-stack profile the vehicle wrote, or None."""
+        profiles = glob.glob(os.path.join(glob.escape(self.data_dir), PROFILE_GLOB))
+        return max(profiles, key=os.path.getmtime, default=None)
+
+    def send_command(self, cmd):
+        """Append a command, stamped with its issue time, to the vehicle's command file."""
+        cmd = dict(cmd, issued_at=time.time())
+        with self.lock:
+            commands = []
+            if os.path.exists(self.command_file):
+                with open(self.command_file) as f:
+                    try:
+                        commands = json.load(f)
+                    except Exception:
+                        commands = []
+            commands.append(cmd)
+            with open(self.command_file, 'w') as f:
+                json.dump(commands, f)
+
+
+class VehicleRegistry:
+    """
+    Vehicles under root, one subdirectory each, discovered on demand.
+
+    Statuses are polled (stat only, parsed on change) at most once per
+    refresh_interval when the fleet view is requested, so the summary lags
+    vehicle files by at most that long; per-vehicle requests are always
+    current.
+    """
+
+    def __init__(self, root, max_open_files=256, refresh_interval=1.0, clock=time.monotonic):
+        self.root = root
+        self.pool = FileHandlePool(max_open_files)
+        self.summary = FleetSummary()
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+        self._vehicles = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._last_refresh = None
+
+    def __len__(self):
+        return len(self._vehicles)
+
+    @staticmethod
+    def valid_id(vehicle_id):
+        return bool(VEHICLE_ID_PATTERN.match(vehicle_id))
+
+    def _add(self, vehicle_id):
+        with self._lock:
+            handle = self._vehicles.get(vehicle_id)
+            if handle is None:
+                handle = VehicleHandle(vehicle_id, os.path.join(self.root, vehicle_id), self.pool, self.summary)
+                self._vehicles[vehicle_id] = handle
+            return handle
+
+    def get(self, vehicle_id):
+        """Handle for a vehicle with a directory under root, or None."""
+        handle = self._vehicles.get(vehicle_id)
+        if handle is not None:
+            return handle
+        if not self.valid_id(vehicle_id) or not os.path.isdir(os.path.join(self.root, vehicle_id)):
+            return None
+        return self._add(vehicle_id)
+
+    def vehicle_ids(self):
+        return sorted(self._vehicles)
+
+    def discover(self):
+        """Sync the registry with the vehicle directories under root."""
+        try:
+            present = {entry.name for entry in os.scandir(self.root)
+                       if entry.is_dir() and self.valid_id(entry.name)}
+        except FileNotFoundError:
+            present = set()
+        for vehicle_id in present - self._vehicles.keys():
+            self._add(vehicle_id)
+        for vehicle_id in self._vehicles.keys() - present:
+            with self._lock:
+                handle = self._vehicles.pop(vehicle_id, None)
+            if handle is not None:
+                handle.forget()
+
+    def refresh(self):
+        """Discover vehicles and pick up every changed status file."""
+        with self._refresh_lock:
+            self._refresh()
+
+    def _refresh(self):
+        self.discover()
+        for handle in list(self._vehicles.values()):
+            handle.status()
+        self._last_refresh = self.clock()
+
+    def refresh_if_stale(self):
+        if self._last_refresh is not None and self.clock() - self._last_refresh < self.refresh_interval:
+            return
+        # Concurrent callers serve the current aggregates rather than queue
+        # up behind a refresh already in progress.
+        if self._refresh_lock.acquire(blocking=self._last_refresh is None):
+            try:
+                self._refresh()
+            finally:
+                self._refresh_lock.release()
+
+    def fleet_summary(self):
+        self.refresh_if_stale()
+        summary = self.summary.snapshot()
+        summary['vehicles'] = len(self._vehicles)
+        return summary
+
+    def close(self):
+        self.pool.close()
@@ -0,0 +1,365 @@
+"""
+Camera image serving for the dashboard.
+
+ImageService keeps recently served image files in memory, keyed on each
+file's mtime and size, so a snapshot that has not changed costs one stat()
+to serve again. It also supports the pieces of HTTP caching that matter on
+a constrained link:
+
+- ETags (derived from mtime and size, so no hashing) for 304 revalidation
+- single byte-range requests, for resuming a large frame
+- downscaled JPEG thumbnails, produced on a single background worker so
+  bursts of dashboard requests never decode many full frames at once
+- a newest-first, cursor-paginated index of recon_image_<ts>.jpg files,
+  cached until the directory changes
+
+Kept free of package-relative imports so app.py can use it directly.
+"""
+
+import email.utils
+import io
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from PIL import Image
+
+RECON_IMAGE_PATTERN = re.compile(r"^recon_image_(\d+)\.jpg$")
+THUMBNAIL_SIZE = (320, 240)
+THUMBNAIL_QUALITY = 75
+MAX_PAGE_SIZE = 200
+# A file caught mid-write (size or mtime changing under the read) is reread
+# this many times, READ_RETRY_DELAY seconds apart, before giving up.
+READ_ATTEMPTS = 3
+READ_RETRY_DELAY = 0.02
+
+
+class ImageNotReady(Exception):
+    """The image kept changing while being read; try again shortly (HTTP 503)."""
+
+
+class CachedImage:
+    __slots__ = ("data", "etag", "last_modified", "stamp")
+
+    def __init__(self, data, stamp):
+        self.data = data
+        self.stamp = stamp
+        mtime_ns, size = stamp
+        self.etag = f'"{mtime_ns:x}-{size:x}"'
+        self.last_modified = mtime_ns / 1e9
+
+    @property
+    def http_date(self):
+        return email.utils.formatdate(self.last_modified, usegmt=True)
+
+
+def _stamp(st):
+    return st.st_mtime_ns, st.st_size
+
+
+def etag_matches(header, etag):
+    """If-None-Match comparison (weak, so W/ prefixes are ignored)."""
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(_strip_weak(candidate.strip()) == _strip_weak(etag) for candidate in header.split(","))
+
+
+def _strip_weak(etag):
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def not_modified(image, if_none_match=None, if_modified_since=None):
+    """Whether a conditional GET can be answered with 304."""
+    if if_none_match is not None:
+        return etag_matches(if_none_match, image.etag)
+    if if_modified_since is not None:
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(image.last_modified) <= since
+    return False
+
+
+def parse_range(header, size):
+    """
+    Parse a single "bytes=" range.
+
+    Returns:
+        (start, end) inclusive; None to serve the whole file (no header,
+        other units, several ranges, or a syntactically invalid header,
+        which RFC 7233 says to ignore)
+
+    Raises:
+        ValueError: If a well-formed range cannot be satisfied (answer 416)
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = (part.strip() for part in spec.strip().partition("-"))
+    if not sep or not (first or last) or not all(_is_digits(part) for part in (first, last) if part):
+        return None
+    if first:
+        start = int(first)
+        end = int(last) if last else size - 1
+        if last and end < start:
+            return None
+        if start >= size:
+            raise ValueError(f"Unsatisfiable range {header} for {size} bytes")
+        return start, min(end, size - 1)
+    # Suffix range: the last N bytes.
+    suffix = int(last)
+    if suffix == 0 or size == 0:
+        raise ValueError(f"Unsatisfiable range {header} for {size} bytes")
+    return max(size - suffix, 0), size - 1
+
+
+def _is_digits(text):
+    return text.isascii() and text.isdigit()
+
+
+def make_thumbnail(data, size=THUMBNAIL_SIZE, quality=THUMBNAIL_QUALITY):
+    """Downscale JPEG bytes to fit within size, returning JPEG bytes."""
+    with Image.open(io.BytesIO(data)) as image:
+        # draft() lets the JPEG decoder scale by 1/2..1/8 while decoding,
+        # far cheaper than decoding the full frame and resizing.
+        image.draft("RGB", size)
+        image = image.convert("RGB")
+        image.thumbnail(size)
+        out = io.BytesIO()
+        image.save(out, "JPEG", quality=quality, optimize=True)
+        return out.getvalue()
+
+
+class _ReconIndex:
+    __slots__ = ("stamp", "entries")
+
+    def __init__(self, stamp, entries):
+        self.stamp = stamp
+        self.entries = entries  # [(timestamp, name)], newest first
+
+
+class ImageService:
+    """
+    Args:
+        max_cache_bytes: Memory budget for cached full-size images
+        max_entry_bytes: Larger files are served but never cached
+        max_thumbnails: Thumbnails kept in memory
+        thumbnail_size: Bounding box for thumbnails
+    """
+
+    def __init__(self, max_cache_bytes=64 * 2**20, max_entry_bytes=16 * 2**20, max_thumbnails=512,
+                 thumbnail_size=THUMBNAIL_SIZE):
+        self.max_cache_bytes = max_cache_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.max_thumbnails = max_thumbnails
+        self.thumbnail_size = thumbnail_size
+        self._images = OrderedDict()
+        self._cached_bytes = 0
+        self._thumbnails = OrderedDict()
+        self._pending = {}
+        self._indexes = {}
+        self._lock = threading.Lock()
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnails")
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path):
+        """
+        Current contents of path, reread only when its mtime or size changes.
+
+        Returns:
+            CachedImage, or None if path is absent
+
+        Raises:
+            ImageNotReady: If the file kept changing while being read and
+                there is no earlier complete version to serve
+        """
+        for attempt in range(READ_ATTEMPTS):
+            if attempt:
+                time.sleep(READ_RETRY_DELAY)
+            try:
+                stamp = _stamp(os.stat(path))
+            except FileNotFoundError:
+                self._evict(path)
+                return None
+            with self._lock:
+                cached = self._images.get(path)
+                if cached is not None and cached.stamp == stamp:
+                    self._images.move_to_end(path)
+                    self.hits += 1
+                    return cached
+                self.misses += 1
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                    after = _stamp(os.fstat(f.fileno()))
+            except FileNotFoundError:
+                self._evict(path)
+                return None
+            if after == stamp and len(data) == stamp[1]:
+                image = CachedImage(data, stamp)
+                if len(data) <= self.max_entry_bytes:
+                    self._store(path, image)
+                return image
+            # Caught mid-write: serve the last complete image if there is one.
+            if cached is not None:
+                return cached
+        raise ImageNotReady(f"{os.path.basename(path)} is still being written")
+
+    def _store(self, path, image):
+        with self._lock:
+            previous = self._images.pop(path, None)
+            if previous is not None:
+                self._cached_bytes -= len(previous.data)
+            self._images[path] = image
+            self._cached_bytes += len(image.data)
+            while self._cached_bytes > self.max_cache_bytes and len(self._images) > 1:
+                _, evicted = self._images.popitem(last=False)
+                self._cached_bytes -= len(evicted.data)
+
+    def _evict(self, path):
+        with self._lock:
+            previous = self._images.pop(path, None)
+            if previous is not None:
+                self._cached_bytes -= len(previous.data)
+
+    def thumbnail(self, path, timeout=5.0):
+        """
+        Thumbnail of the current contents of path, generated on the
+        background worker if needed and waited for up to timeout seconds.
+
+        Returns:
+            CachedImage, or None if path is absent or the thumbnail is not
+            ready in time
+
+        Raises:
+            ValueError: If path is not a decodable image
+        """
+        future = self.request_thumbnail(path)
+        if future is None:
+            return None
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            return None
+
+    def request_thumbnail(self, path):
+        """Queue a thumbnail for path (deduplicated); returns a Future, or None if path is absent."""
+        try:
+            stamp = _stamp(os.stat(path))
+        except FileNotFoundError:
+            return None
+        key = (path, stamp)
+        with self._lock:
+            thumbnail = self._thumbnails.get(key)
+            if thumbnail is not None:
+                self._thumbnails.move_to_end(key)
+                return _done(thumbnail)
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = self._worker.submit(self._generate, path, key)
+            return future
+
+    def prefetch_thumbnails(self, paths):
+        for path in paths:
+            self.request_thumbnail(path)
+
+    def _generate(self, path, key):
+        try:
+            try:
+                source = self.get(path)
+            except ImageNotReady:
+                return None
+            if source is None or source.stamp != key[1]:
+                return None
+            try:
+                data = make_thumbnail(source.data, self.thumbnail_size)
+            except (OSError, ValueError):
+                raise ValueError(f"{os.path.basename(path)} is not a decodable image")
+            thumbnail = CachedImage(data, source.stamp)
+            thumbnail.etag = source.etag[:-1] + '-t"'
+            with self._lock:
+                self._thumbnails[key] = thumbnail
+                while len(self._thumbnails) > self.max_thumbnails:
+                    self._thumbnails.popitem(last=False)
+            return thumbnail
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def recon_images(self, directory, limit=50, before=None):
+        """
+        One page of the recon images in directory, newest first.
+
+        Args:
+            limit: Page size (capped at MAX_PAGE_SIZE)
+            before: Only images with a timestamp below this (the previous
+                page's next_before); None for the first page
+
+        Returns:
+            Dictionary with "images" (name, timestamp, size), "total" and
+            "next_before" (None on the last page)
+        """
+        limit = min(max(int(limit), 1), MAX_PAGE_SIZE)
+        entries = self._recon_index(directory)
+        start = 0
+        if before is not None:
+            # entries are sorted newest first; skip those at or after the cursor.
+            lo, hi = 0, len(entries)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if entries[mid][0] >= before:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            start = lo
+        page = entries[start:start + limit]
+        images = []
+        for timestamp, name in page:
+            try:
+                size = os.stat(os.path.join(directory, name)).st_size
+            except FileNotFoundError:
+                continue
+            images.append({"name": name, "timestamp": timestamp, "size": size})
+        more = start + limit < len(entries)
+        return {
+            "images": images,
+            "total": len(entries),
+            "next_before": page[-1][0] if more and page else None,
+        }
+
+    def _recon_index(self, directory):
+        # Adding or removing a file updates the directory's mtime.
+        try:
+            stamp = os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            return []
+        index = self._indexes.get(directory)
+        if index is not None and index.stamp == stamp:
+            return index.entries
+        entries = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                match = RECON_IMAGE_PATTERN.match(entry.name)
+                if match:
+                    entries.append((int(match.group(1)), entry.name))
+        entries.sort(reverse=True)
+        self._indexes[directory] = _ReconIndex(stamp, entries)
+        return entries
+
+    def close(self):
+        self._worker.shutdown(wait=False)
+
+
+def _done(value):
+    future = Future()
+    future.set_result(value)
+    return future
@@ -1,3 +1,87 @@
+import time
+
+import numpy as np
+
+from .telemetry import telemetry
+from .eventlog import EventLog
+
+class ArmTrajectory:
+    """
+    A planned arm motion: an (n, 4) array of x, y, z, rotation poses and,
+    when speed limits were given, the time (seconds from start) of each pose.
+    """
+
+    def __init__(self, poses, times=None):
+        self.poses = poses
+        self.times = times
+
+    def __len__(self):
+        return len(self.poses)
+
+    @property
+    def duration(self):
+        return float(self.times[-1]) if self.times is not None and len(self.times) else 0.0
+
+    @property
+    def final_pose(self):
+        return tuple(float(v) for v in self.poses[-1]) if len(self.poses) else None
+
+    @classmethod
+    def plan(cls, start, waypoints, step=1.0, rotation_step=1.0, max_speed=None, max_angular_speed=None):
+        """
+        Plan straight-line segments through waypoints in one vectorized pass.
+
+        Args:
+            start: Current (x, y, z, rotation) pose
+            waypoints: Sequence of (x, y, z) or (x, y, z, rotation) targets;
+                a missing rotation keeps the previous one
+            step: Largest per-axis move between consecutive poses, matching
+                the one-unit moves of RobotArm.arm_movement by default
+            rotation_step: Largest rotation change (degrees) between poses
+            max_speed: Optional linear speed limit (units/s) for timing
+            max_angular_speed: Optional rotation speed limit (degrees/s)
+
+        Returns:
+            ArmTrajectory excluding the start pose
+
+        Raises:
+            ValueError: If step or rotation_step is not positive
+        """
+        if step <= 0 or rotation_step <= 0:
+            raise ValueError("step and rotation_step must be positive")
+        targets = []
+        previous_rotation = float(start[3])
+        for waypoint in waypoints:
+            rotation = float(waypoint[3]) if len(waypoint) > 3 and waypoint[3] is not None else previous_rotation
+            targets.append((*map(float, waypoint[:3]), rotation))
+            previous_rotation = rotation
+        if not targets:
+            return cls(np.empty((0, 4)), np.empty(0) if max_speed or max_angular_speed else None)
+
+        nodes = np.vstack([np.asarray(start, dtype=np.float64), np.asarray(targets)])
+        deltas = np.diff(nodes, axis=0)
+        steps = np.maximum(
+            np.ceil(np.abs(deltas[:, :3]).max(axis=1) / step),
+            np.ceil(np.abs(deltas[:, 3]) / rotation_step),
+        ).astype(np.int64)
+        steps = np.maximum(steps, 1)
+
+        # Fraction of its segment covered by every output pose.
+        segment = np.repeat(np.arange(len(steps)), steps)
+        offsets = np.arange(len(segment)) - np.repeat(np.cumsum(steps) - steps, steps)
+        fraction = (offsets + 1) / steps[segment]
+        poses = nodes[segment] + deltas[segment] * fraction[:, None]
+
+        times = None
+        if max_speed or max_angular_speed:
+            segment_time = np.zeros(len(steps))
+            if max_speed:
+                segment_time = np.maximum(segment_time, np.linalg.norm(deltas[:, :3], axis=1) / max_speed)
+            if max_angular_speed:
+                segment_time = np.maximum(segment_time, np.abs(deltas[:, 3]) / max_angular_speed)
+            times = np.cumsum((segment_time / steps)[segment])
+        return cls(poses, times)
+
 class RobotArm:
     def __init__(self, right_move=False, left_move=False, up_move=False, down_move=False, forward_move=False, backward_move=False):
         self.right_move = right_move
@@ -13,30 +97,63 @@ class RobotArm:
         if not self.active:
             return
 
-        print("Robot arm is active.")
         x, y, z = self.position
 
         if self.right_move:
             x += 1
-            print("Moving right → x += 1")
         if self.left_move:
             x -= 1
-            print("Moving left → x -= 1")
         if self.up_move:
             y += 1
-            print("Moving up → y += 1")
         if self.down_move:
             y -= 1
-            print("Moving down → y -= 1")
         if self.forward_move:
             z += 1
-            print("Moving forward → z += 1")
         if self.back_move:
             z -= 1
-            print("Moving backward → z -= 1")
 
         self.position = (x, y, z)
-        print(f"Updated 3D Position: x={x}, y={y}, z={z}")
+        telemetry.debug("ARM", "moved", "Updated 3D Position: x={x}, y={y}, z={z}", x=x, y=y, z=z)
+
+    def follow_trajectory(self, trajectory, rotation=None, simulate=False, on_pose=None):
+        """
+        Run a planned trajectory in one call, without waiting for its timing.
+
+        With on_pose, the arm (and rotation) is moved to each pose in turn
+        before the callback sees it, so a callback that raises leaves the arm
+        at the last pose it reached. Without one, nothing can observe the
+        intermediate poses and the arm goes straight to the final pose.
+
+        Args:
+            trajectory: ArmTrajectory from ArmTrajectory.plan()
+            rotation: ArmRotation to drive alongside the position, if any
+            simulate: Only validate and return the trajectory, leaving state untouched
+            on_pose: Optional callback(pose, time) invoked for every pose,
+                e.g. to stream setpoints to hardware on the planned schedule
+
+        Returns:
+            The final (x, y, z, rotation) pose, or None if nothing moved
+        """
+        if not self.active or not len(trajectory):
+            return None
+        if rotation is not None and not rotation.active:
+            return None
+        if on_pose is not None:
+            times = trajectory.times if trajectory.times is not None else [None] * len(trajectory)
+            for pose, t in zip(trajectory.poses, times):
+                if not simulate:
+                    self.position = tuple(float(v) for v in pose[:3])
+                    if rotation is not None:
+                        rotation.rotation_angle = float(pose[3])
+                on_pose(pose, t)
+        final = trajectory.final_pose
+        if not simulate:
+            self.position = final[:3]
+            if rotation is not None:
+                rotation.rotation_angle = final[3]
+        telemetry.debug("ARM", "trajectory", "Followed {steps}-step trajectory to {pose} ({duration:.2f}s)",
+                        steps=len(trajectory), pose=final, duration=trajectory.duration, simulated=simulate)
+        return final
 
 class ArmRotation:
     def __init__(self, active_arm):
@@ -48,14 +165,13 @@ class ArmRotation:
         if not self.active:
             return
 
-        print("Robot arm rotation is active.")
         if right_rotate:
             self.rotation_angle += delta
         if left_rotate:
             self.rotation_angle -= delta
         if complete_rotate:
             self.rotation_angle = 360
-        print(f"Updated rotation angle: {self.rotation_angle}°")
+        telemetry.debug("ARM", "rotated", "Updated rotation angle: {angle}°", angle=self.rotation_angle)
 
     def reset_rotation(self):
         self.rotation_angle = 0
@@ -72,38 +188,43 @@ class ClawControl:
 
     def claw_movement(self):
         if self.open_claw:
-            print("Claw is opening.")
+            telemetry.info("CLAW", "opening", "Claw is opening.")
         if self.close_claw:
-            print("Claw is closing.")
+            telemetry.info("CLAW", "closing", "Claw is closing.")
         if self.release_object_from_claw:
-            print("Releasing object from claw.")
+            telemetry.info("CLAW", "releasing", "Releasing object from claw.")
 
     def evaluate_claw_state(self, pressure, mass):
         safe_mass = False
         
         if 15 <= pressure <= 40:
-            print("Grip strength is secure.")
+            grip = "secure"
             self.secure_grip = True
         elif pressure < 15:
-            print("Grip strength is weak.")
+            grip = "weak"
             self.secure_grip = False
-        elif pressure > 40:
-            print("Grip strength is too strong.")
+        else:
+            grip = "too strong"
             self.secure_grip = False
 
         if 0 <= mass <= 10:
-            print("Object mass is within the safe range.")
+            mass_state = "within the safe range"
             self.object_mass = mass
             safe_mass = True
         elif mass < 0:
-            print("Object mass is negative.")
+            mass_state = "negative"
             safe_mass = False
-        elif mass > 10:
-            print("Object mass is too heavy.")
+        else:
+            mass_state = "too heavy"
             safe_mass = False
 
         self.object_held = self.secure_grip and safe_mass
-        print("Object is being held securely." if self.object_held else "Object is not being held securely.")
+        telemetry.debug(
+            "CLAW", "grip_evaluated",
+            "Grip strength is {grip}, object mass is {mass_state}; held securely: {held}",
+            grip=grip, mass=mass, mass_state=mass_state,
+            pressure=pressure, held=self.object_held,
+        )
         return self.object_held
 
 class WheelServoController:
@@ -114,40 +235,40 @@ class WheelServoController:
 
     def set_speed(self, speed):
         self.current_speed = speed
-        print(f"[WHEEL] Speed set to {speed} units")
+        telemetry.debug("WHEEL", "speed_set", "Speed set to {speed} units", speed=speed)
 
     def set_direction(self, direction):
         self.current_direction = direction
-        print(f"[WHEEL] Direction set to {direction}")
+        telemetry.debug("WHEEL", "direction_set", "Direction set to {direction}", direction=direction)
 
     def stop(self):
         self.current_speed = 0
         self.current_direction = "stopped"
-        print("[WHEEL] Wheel stopped")
+        telemetry.info("WHEEL", "stopped", "Wheel stopped")
 
     def update_encoder_feedback(self, value):
         self.encoder_feedback = value
-        print(f"[WHEEL] Encoder feedback: {value}")
+        telemetry.debug("WHEEL", "encoder", "Encoder feedback: {value}", value=value)
 
 class SolarPanel:
-    def __init__(self):
+    def __init__(self, log_capacity=10000, spill_path=None):
         self.is_deployed = False
         self.power_generated = 0.0
-        self.generation_log = []
+        self.generation_log = EventLog(("value",), capacity=log_capacity, spill_path=spill_path)
 
     def deploy(self):
         self.is_deployed = True
-        print("[SOLAR] Deployed.")
+        telemetry.info("SOLAR", "deployed", "Deployed.")
 
     def retract(self):
         self.is_deployed = False
-        print("[SOLAR] Retracted.")
+        telemetry.info("SOLAR", "retracted", "Retracted.")
 
     def update_power_generated(self, sunlight_intensity):
         if self.is_deployed:
             self.power_generated = sunlight_intensity * 0.8
             self.generation_log.append((time.time(), self.power_generated))
-            print(f"[SOLAR] Power generated: {self.power_generated:.2f}W")
+            telemetry.debug("SOLAR", "generated", "Power generated: {power:.2f}W", power=self.power_generated)
         else:
             self.power_generated = 0.0
-            print("[SOLAR] Panel retracted. No power generated.") 
\ No newline at end of file
+            telemetry.debug("SOLAR", "generated", "Panel retracted. No power generated.", power=0.0) 
\ No newline at end of file
@@ -0,0 +1,386 @@
+"""
+Low-overhead, Prometheus-style metrics.
+
+MetricsRegistry hands out counters, gauges and log-linear ("HDR-style")
+latency histograms and renders them in the Prometheus text exposition
+format. Labelled metrics return a child per label combination; binding the
+child once at import time keeps each observation to a lock and a couple of
+additions (under a microsecond).
+
+Histograms record into fixed relative-precision buckets: every power of two
+between min_value and max_value is split into sub_buckets linear steps, so
+quantiles are accurate to about 1/sub_buckets of the value regardless of
+scale. The exposition groups them into one `le` bucket per power of two.
+
+Processes without an HTTP server (vehicle.py) write their registry to a
+text file that the dashboard appends to its own /metrics output.
+
+The registry is process-wide state, so this file must only ever be loaded
+as robotics.metrics: vehicle.py and app.py import it through the package
+(see _package.py) rather than as a top-level module.
+"""
+
+import math
+import os
+import threading
+import time
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_frexp = math.frexp
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=(), **options):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._options = options
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **kwargs):
+        """Child for one label combination; bind it once and reuse it on hot paths."""
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        key = tuple(str(value) for value in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _only_child(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels; use .labels()")
+        return self._children[()]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(child.render(self.name, self.labelnames, key))
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1.0):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self.value += amount
+
+    def render(self, name, labelnames, key):
+        return [f"{name}_total{_label_text(labelnames, key)} {_format_value(self.value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1.0):
+        self._only_child().inc(amount)
+
+
+class _GaugeChild:
+    __slots__ = ("value", "function", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self.function = None
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1.0):
+        self.inc(-amount)
+
+    def set_function(self, function):
+        """Read the value from function() at render time instead."""
+        self.function = function
+
+    def get(self):
+        return self.function() if self.function is not None else self.value
+
+    def render(self, name, labelnames, key):
+        return [f"{name}{_label_text(labelnames, key)} {_format_value(float(self.get()))}"]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self._only_child().set(value)
+
+    def inc(self, amount=1.0):
+        self._only_child().inc(amount)
+
+    def dec(self, amount=1.0):
+        self._only_child().dec(amount)
+
+    def set_function(self, function):
+        self._only_child().set_function(function)
+
+    def get(self):
+        return self._only_child().get()
+
+
+class _HistogramChild:
+    __slots__ = ("counts", "sum", "_lock", "_min_exp", "_max_exp", "_sub", "_two_sub", "_offset", "_overflow")
+
+    def __init__(self, min_exp, max_exp, sub_buckets):
+        self._min_exp = min_exp
+        self._max_exp = max_exp
+        self._sub = sub_buckets
+        self._two_sub = 2 * sub_buckets
+        # mantissa is in [0.5, 1), so int(2 * sub * mantissa) - sub is the linear
+        # step within the octave; fold every constant term into one offset.
+        self._offset = 1 - sub_buckets - min_exp * sub_buckets
+        # Slot 0 holds values below 2**(min_exp - 1); the last slot those of 2**max_exp and above.
+        self._overflow = (max_exp - min_exp + 1) * sub_buckets + 1
+        self.counts = [0] * (self._overflow + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def observe(self, value):
+        mantissa, exponent = _frexp(value)
+        if value <= 0 or exponent < self._min_exp:
+            index = 0
+        elif exponent > self._max_exp:
+            index = self._overflow
+        else:
+            index = exponent * self._sub + int(self._two_sub * mantissa) + self._offset
+        # acquire/release rather than `with`: this is the hot path.
+        lock = self._lock
+        lock.acquire()
+        self.counts[index] += 1
+        self.sum += value
+        lock.release()
+
+    def time(self):
+        return _Timer(self)
+
+    def _bucket_upper(self, index):
+        if index == 0:
+            return math.ldexp(0.5, self._min_exp)
+        if index == self._overflow:
+            return math.inf
+        octave, step = divmod(index - 1, self._sub)
+        return math.ldexp(0.5 + (step + 1) / (2 * self._sub), self._min_exp + octave)
+
+    def quantile(self, q):
+        """Upper edge of the bucket holding the q-quantile, or None when empty."""
+        with self._lock:
+            counts = list(self.counts)
+        total = sum(counts)
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if count and seen >= rank:
+                return self._bucket_upper(index)
+        return math.inf
+
+    def snapshot(self):
+        with self._lock:
+            count, total = sum(self.counts), self.sum
+        return {
+            "count": count,
+            "sum": total,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "p999": self.quantile(0.999),
+        }
+
+    def render(self, name, labelnames, key):
+        with self._lock:
+            counts = list(self.counts)
+            total = self.sum
+        count = sum(counts)
+        lines = []
+        cumulative = counts[0]
+        # One exposition bucket per power of two; those edges coincide with sub-bucket edges.
+        for octave in range(self._max_exp - self._min_exp + 1):
+            start = octave * self._sub + 1
+            cumulative += sum(counts[start:start + self._sub])
+            upper = math.ldexp(1.0, self._min_exp + octave)
+            lines.append(f"{name}_bucket{_label_text(labelnames, key, [('le', _format_value(upper))])} {cumulative}")
+        lines.append(f"{name}_bucket{_label_text(labelnames, key, [('le', '+Inf')])} {count}")
+        lines.append(f"{name}_sum{_label_text(labelnames, key)} {_format_value(total)}")
+        lines.append(f"{name}_count{_label_text(labelnames, key)} {count}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("child", "start")
+
+    def __init__(self, child):
+        self.child = child
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.start)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), min_value=1e-6, max_value=60.0, sub_buckets=16):
+        """
+        Args:
+            min_value: Smallest value resolved; anything below shares one bucket
+            max_value: Largest value resolved; anything above shares one bucket
+            sub_buckets: Linear steps per power of two (relative precision ~1/sub_buckets)
+        """
+        self._min_exp = math.frexp(min_value)[1]
+        self._max_exp = math.frexp(max_value)[1]
+        self._sub = sub_buckets
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self._min_exp, self._max_exp, self._sub)
+
+    def observe(self, value):
+        self._only_child().observe(value)
+
+    def time(self):
+        return self._only_child().time()
+
+    def quantile(self, q):
+        return self._only_child().quantile(q)
+
+    def snapshot(self):
+        return self._only_child().snapshot()
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **options):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **options)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered with a different type or labels")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), **options):
+        return self._get_or_create(Histogram, name, documentation, labelnames, **options)
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def render(self):
+        """Every metric in the text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_textfile(self, path):
+        """Atomically replace path with the current exposition, for another process to serve."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+
+REGISTRY = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency and outcome per route template
+    (e.g. /vehicles/{vehicle_id}/status, so ids do not explode the label set).
+    """
+
+    def __init__(self, app, registry=REGISTRY, prefix="http"):
+        self.app = app
+        self.latency = registry.histogram(f"{prefix}_request_duration_seconds",
+                                          "Request latency by route", ("method", "route"))
+        self.requests = registry.counter(f"{prefix}_requests", "Requests by route and status code",
+                                         ("method", "route", "status"))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            self.latency.labels(scope["method"], path).observe(time.perf_counter() - start)
+            self.requests.labels(scope["method"], path, status[0]).inc()
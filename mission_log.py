@@ -0,0 +1,420 @@
+"""
+Binary mission logs for deterministic record and replay.
+
+MissionRecorder appends length-prefixed records to a single file as a
+mission runs: one TICK per VehicleSim step (carrying the commands applied
+in it), STATUS snapshots, sensor FRAMEs, decision EVENTs and periodic
+CHECKPOINTs of the full simulation state including the RNG. MissionReplay
+re-drives a fresh VehicleSim and AutonomousDecisionEngine from the log as
+fast as they can run, optionally checking every recorded status and
+decision against the replayed one. Seeking restores the nearest earlier
+checkpoint and replays forward from there, so any timestamp is at most one
+checkpoint interval of ticks away. A checkpoint is written when recording
+starts and then every checkpoint interval, timed by sim ticks or, for an
+engine-only recording, by engine updates.
+
+File layout: a fixed header (magic, version, seed, start time, tick
+interval) followed by records of (type, timestamp, payload length, payload).
+A log cut short by a crash stays readable up to its last complete record.
+
+Kept free of package-relative imports so vehicle.py can use it directly.
+"""
+
+import json
+import struct
+import warnings
+import zlib
+from bisect import bisect_right
+
+import numpy as np
+
+MAGIC = b"RVML"
+VERSION = 1
+HEADER = struct.Struct("<4sHqdd")
+RECORD = struct.Struct("<Bdi")
+
+REC_TICK = 1
+REC_FRAME = 2
+REC_EVENT = 3
+REC_STATUS = 4
+REC_CHECKPOINT = 5
+
+FRAME_JSON = 0
+FRAME_FLOAT64 = 1
+
+ENGINE_SOURCE = "decision"
+
+
+SEED_RANGE = range(-2**63, 2**63)  # HEADER stores the seed as a signed 64-bit int
+
+
+def _jsonable(value):
+    # Sensor readings are not always plain JSON; a recorder must never raise
+    # into the control loop, so numpy values become their Python equivalents,
+    # sets become lists and anything else is stored as its repr.
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return repr(value)
+
+
+def _json_bytes(value):
+    try:
+        return json.dumps(value, separators=(",", ":"), default=_jsonable).encode()
+    except (TypeError, ValueError) as e:
+        # Keys json cannot write, or a reference cycle.
+        warnings.warn(f"Recording unencodable value as its repr: {e}", RuntimeWarning, stacklevel=3)
+        return json.dumps(repr(value)).encode()
+
+
+def _encode_frame(source, data):
+    name = source.encode()
+    if isinstance(data, dict):
+        kind, body = FRAME_JSON, _json_bytes(data)
+    else:
+        kind, body = FRAME_FLOAT64, np.asarray(data, dtype="<f8").tobytes()
+    return struct.pack("<BB", kind, len(name)) + name + body
+
+
+def _decode_frame(payload):
+    kind, name_length = struct.unpack_from("<BB", payload)
+    source = payload[2:2 + name_length].decode()
+    body = payload[2 + name_length:]
+    if kind == FRAME_JSON:
+        return source, json.loads(body)
+    return source, np.frombuffer(body, dtype="<f8")
+
+
+def _decode(kind, payload):
+    if kind == REC_TICK:
+        return json.loads(payload) if payload else []
+    if kind == REC_FRAME:
+        return _decode_frame(payload)
+    if kind == REC_EVENT:
+        event = json.loads(payload)
+        return event["kind"], event["data"]
+    return json.loads(zlib.decompress(payload))
+
+
+class MissionRecorder:
+    def __init__(self, path, sim=None, engine=None, seed=0, tick_interval=0.0, start_time=0.0,
+                 checkpoint_interval=60.0):
+        """
+        Args:
+            path: Log file to create (overwritten if it exists)
+            sim: VehicleSim to record; its seed goes in the header
+            engine: AutonomousDecisionEngine to record
+            seed: Seed to store when no sim is given
+            tick_interval: Nominal seconds between ticks, for reference
+            start_time: Mission start timestamp
+            checkpoint_interval: Mission seconds between state checkpoints
+
+        Raises:
+            ValueError: If the seed does not fit the header's signed 64 bits
+        """
+        seed = sim.seed if sim is not None else seed
+        if seed not in SEED_RANGE:
+            raise ValueError(f"Seed {seed} does not fit a mission log (signed 64-bit)")
+        self.path = path
+        self.sim = sim
+        self.engine = engine
+        self.checkpoint_interval = checkpoint_interval
+        self.last_checkpoint = None
+        self.records = 0
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, seed, start_time, tick_interval))
+        if sim is not None:
+            sim.recorder = self
+        if engine is not None:
+            engine.recorder = self
+        # Replay starts from a checkpoint, so without this nothing recorded
+        # before the first periodic one could be replayed.
+        self.checkpoint(start_time)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write(self, kind, timestamp, payload=b""):
+        self._file.write(RECORD.pack(kind, timestamp, len(payload)))
+        self._file.write(payload)
+        self.records += 1
+
+    def checkpoint(self, timestamp):
+        """Write the current sim/engine state; see checkpoint_if_due for the automatic ones."""
+        state = {
+            "sim": self.sim.get_state() if self.sim is not None else None,
+            "engine": self.engine.get_state() if self.engine is not None else None,
+        }
+        self._write(REC_CHECKPOINT, timestamp, zlib.compress(_json_bytes(state)))
+        self.last_checkpoint = timestamp
+        self._file.flush()
+
+    def checkpoint_if_due(self, timestamp):
+        if self.last_checkpoint is None or timestamp - self.last_checkpoint >= self.checkpoint_interval:
+            self.checkpoint(timestamp)
+
+    def record_tick(self, timestamp, commands):
+        """Start of a sim step, before its commands are applied."""
+        self.checkpoint_if_due(timestamp)
+        self._write(REC_TICK, timestamp, _json_bytes(commands) if commands else b"")
+
+    def record_status(self, timestamp, status):
+        self._write(REC_STATUS, timestamp, zlib.compress(_json_bytes(status)))
+
+    def record_frame(self, timestamp, source, data):
+        """A sensor frame: a dict of readings or a sequence of numbers."""
+        self._write(REC_FRAME, timestamp, _encode_frame(source, data))
+
+    def record_event(self, timestamp, kind, data):
+        self._write(REC_EVENT, timestamp, _json_bytes({"kind": kind, "data": data}))
+
+    def engine_update(self, timestamp):
+        """
+        Called by the engine before it changes state. Sim ticks pace the
+        checkpoints when there is a sim; an engine-only recording has no
+        ticks, so its checkpoints are taken here instead.
+        """
+        if self.sim is None:
+            self.checkpoint_if_due(timestamp)
+
+    def record_engine_input(self, timestamp, data):
+        self.record_frame(timestamp, ENGINE_SOURCE, data)
+
+    def record_engine_decision(self, timestamp, decision):
+        self.record_event(timestamp, ENGINE_SOURCE, decision)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.close()
+        if self.sim is not None and self.sim.recorder is self:
+            self.sim.recorder = None
+        if self.engine is not None and self.engine.recorder is self:
+            self.engine.recorder = None
+
+
+class MissionLog:
+    """Read-only view of a mission log file."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} is too short to be a mission log")
+        magic, version, self.seed, self.start_time, self.tick_interval = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a mission log")
+        if version != VERSION:
+            raise ValueError(f"Unsupported mission log version {version}")
+        self._checkpoints = None
+        self._ticks = 0
+        self._end_time = self.start_time
+
+    def _scan(self):
+        # Reads record headers only, seeking over payloads.
+        checkpoints = []
+        ticks = 0
+        end_time = self.start_time
+        with open(self.path, "rb") as f:
+            size = f.seek(0, 2)
+            offset = HEADER.size
+            while offset + RECORD.size <= size:
+                f.seek(offset)
+                kind, timestamp, length = RECORD.unpack(f.read(RECORD.size))
+                if offset + RECORD.size + length > size:
+                    break
+                if kind == REC_CHECKPOINT:
+                    checkpoints.append((timestamp, offset))
+                elif kind == REC_TICK:
+                    ticks += 1
+                end_time = timestamp
+                offset += RECORD.size + length
+        self._checkpoints = checkpoints
+        self._ticks = ticks
+        self._end_time = end_time
+
+    @property
+    def checkpoints(self):
+        """(timestamp, file offset) of every checkpoint, oldest first."""
+        if self._checkpoints is None:
+            self._scan()
+        return self._checkpoints
+
+    @property
+    def ticks(self):
+        if self._checkpoints is None:
+            self._scan()
+        return self._ticks
+
+    @property
+    def end_time(self):
+        if self._checkpoints is None:
+            self._scan()
+        return self._end_time
+
+    def records(self, offset=HEADER.size):
+        """
+        Decode records starting at a file offset.
+
+        Yields:
+            (type, timestamp, payload, next_offset) with the payload decoded
+            per record type
+        """
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            while True:
+                head = f.read(RECORD.size)
+                if len(head) < RECORD.size:
+                    return
+                kind, timestamp, length = RECORD.unpack(head)
+                payload = f.read(length)
+                if len(payload) < length:
+                    return
+                offset += RECORD.size + length
+                yield kind, timestamp, _decode(kind, payload), offset
+
+    def frames(self, source=None, start=None, end=None):
+        """(timestamp, source, data) for recorded sensor frames, optionally filtered."""
+        for kind, timestamp, payload, _ in self.records():
+            if kind != REC_FRAME or (start is not None and timestamp < start):
+                continue
+            if end is not None and timestamp > end:
+                return
+            if source is None or payload[0] == source:
+                yield timestamp, payload[0], payload[1]
+
+
+class MissionReplay:
+    def __init__(self, log, sim_factory=None, engine_factory=None, verify=True):
+        """
+        Args:
+            log: MissionLog or path to one
+            sim_factory: Callable(seed, clock, write_files) returning a
+                VehicleSim, e.g. VehicleSim itself; None skips the sim
+            engine_factory: Callable(clock) returning an
+                AutonomousDecisionEngine; None skips the engine
+            verify: Compare replayed status snapshots and decisions with the
+                recorded ones and collect mismatches in `divergences`
+        """
+        self.log = log if isinstance(log, MissionLog) else MissionLog(log)
+        self.sim_factory = sim_factory
+        self.engine_factory = engine_factory
+        self.verify = verify
+        self.sim = None
+        self.engine = None
+        self.now = self.log.start_time
+        self.ticks = 0
+        self.divergences = []
+        self._offset = HEADER.size
+        self._restored = False
+        self._last_status = None
+
+    def _clock(self):
+        return self.now
+
+    def _restore(self, state):
+        self.sim = self.engine = None
+        if self.sim_factory is not None and state["sim"] is not None:
+            self.sim = self.sim_factory(seed=self.log.seed, clock=self._clock, write_files=False)
+            self.sim.restore_state(state["sim"])
+        if self.engine_factory is not None and state["engine"] is not None:
+            self.engine = self.engine_factory(clock=self._clock)
+            self.engine.restore_state(state["engine"])
+        if self.sim is None and self.engine is None:
+            recorded = [part for part in ("sim", "engine") if state[part] is not None]
+            raise ValueError(f"Nothing to replay: the log records {' and '.join(recorded) or 'no state'} "
+                             f"but no matching factory was given")
+        self._last_status = None
+        self._restored = True
+
+    def seek(self, timestamp):
+        """
+        Put the replay in the state it had just after the last record at or
+        before timestamp.
+
+        Returns:
+            Number of ticks replayed from the checkpoint
+        """
+        checkpoints = self.log.checkpoints
+        if not checkpoints:
+            raise ValueError("Mission log has no checkpoints to seek from")
+        index = max(bisect_right([ts for ts, _ in checkpoints], timestamp) - 1, 0)
+        self._offset = checkpoints[index][1]
+        self._restored = False
+        return self.run(until=timestamp)
+
+    def run(self, until=None, on_tick=None, on_frame=None):
+        """
+        Replay from the current position without sleeping.
+
+        Args:
+            until: Stop before the first record later than this timestamp
+            on_tick: Optional callback(sim, status) after every replayed tick
+            on_frame: Optional callback(timestamp, source, data) for frames
+                not consumed by the engine
+
+        Returns:
+            Number of ticks replayed
+
+        Raises:
+            ValueError: If the log has no checkpoint to start from, or holds
+                nothing the given factories can replay
+        """
+        if not self._restored and not self.log.checkpoints:
+            raise ValueError("Mission log has no checkpoints to replay from")
+        ticks = 0
+        skipped = 0
+        for kind, timestamp, payload, next_offset in self.log.records(self._offset):
+            if until is not None and timestamp > until:
+                break
+            self.now = timestamp
+            if kind == REC_CHECKPOINT:
+                if not self._restored:
+                    self._restore(payload)
+            elif self._restored:
+                ticks += self._apply(kind, timestamp, payload, on_tick, on_frame)
+            else:
+                skipped += 1
+            self._offset = next_offset
+        if skipped:
+            # Only logs written before recordings began with a checkpoint.
+            warnings.warn(f"Skipped {skipped} records before the first checkpoint; they were not replayed "
+                          f"or verified", RuntimeWarning, stacklevel=2)
+        self.ticks += ticks
+        return ticks
+
+    def _apply(self, kind, timestamp, payload, on_tick, on_frame):
+        if kind == REC_TICK:
+            if self.sim is None:
+                return 0
+            self._last_status = self.sim.step(commands=payload, now=timestamp)
+            if on_tick is not None:
+                on_tick(self.sim, self._last_status)
+            return 1
+        if kind == REC_STATUS:
+            if self.verify and self._last_status is not None:
+                replayed = json.loads(_json_bytes(self._last_status))
+                if replayed != payload:
+                    fields = sorted(k for k in payload.keys() | replayed.keys() if payload.get(k) != replayed.get(k))
+                    self.divergences.append({"timestamp": timestamp, "kind": "status", "fields": fields})
+        elif kind == REC_FRAME:
+            source, data = payload
+            if source == ENGINE_SOURCE and self.engine is not None:
+                self.engine.update_sensor_input(data)
+            elif on_frame is not None:
+                on_frame(timestamp, source, data)
+        elif kind == REC_EVENT:
+            event, data = payload
+            if event == ENGINE_SOURCE and self.engine is not None:
+                decision = self.engine.evaluate_mission()
+                if self.verify and decision != data:
+                    self.divergences.append({"timestamp": timestamp, "kind": "decision",
+                                             "expected": data, "actual": decision})
+        return 0
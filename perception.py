@@ -0,0 +1,180 @@
+"""
+Asynchronous, micro-batched perception.
+
+PerceptionPipeline takes frames from the control loop without blocking it,
+groups them into micro-batches and runs them through a detector backend on
+a worker pool. Each submitted frame gets a concurrent.futures.Future (and an
+optional callback) that resolves with the backend's result for that frame.
+
+A backend is any object with detect_batch(frames) -> list of results, one
+per frame, e.g. VisionAIModule.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .telemetry import telemetry
+
+
+class PerceptionPipeline:
+    def __init__(self, backend, batch_size=8, max_batch_delay=0.005, queue_size=64, workers=2,
+                 overflow="reject"):
+        """
+        Args:
+            backend: Detector with detect_batch(frames)
+            batch_size: Most frames handed to the backend at once
+            max_batch_delay: Seconds to wait for a batch to fill before running it partly full
+            queue_size: Frames that may wait for a worker; beyond this, overflow applies
+            workers: Concurrent backend calls
+            overflow: "reject" refuses new frames when full, "drop_oldest"
+                discards the oldest queued frame to make room
+        """
+        if overflow not in ("reject", "drop_oldest"):
+            raise ValueError("overflow must be 'reject' or 'drop_oldest'")
+        self.backend = backend
+        self.batch_size = batch_size
+        self.max_batch_delay = max_batch_delay
+        self.overflow = overflow
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="perception")
+        # Bounds in-flight batches so a slow backend pushes back on the queue.
+        self._slots = threading.Semaphore(workers)
+        self._stop = threading.Event()
+        self._dispatcher = None
+        self._stats_lock = threading.Lock()
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "dropped": 0, "rejected": 0,
+                       "batches": 0, "latency_sum": 0.0, "latency_max": 0.0}
+
+    def start(self):
+        if self._dispatcher and self._dispatcher.is_alive():
+            return self
+        self._stop.clear()
+        self._dispatcher = threading.Thread(target=self._dispatch, name="perception-dispatch", daemon=True)
+        self._dispatcher.start()
+        return self
+
+    def stop(self, wait=True):
+        self._stop.set()
+        if self._dispatcher:
+            self._dispatcher.join()
+            self._dispatcher = None
+        self._executor.shutdown(wait=wait)
+        while True:
+            try:
+                _, future, _, _ = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            future.cancel()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def submit(self, frame, callback=None):
+        """
+        Queue a frame without blocking.
+
+        Args:
+            frame: Anything the backend accepts
+            callback: Optional callable(result) run on a worker thread
+
+        Returns:
+            Future for the frame's result, or None if the queue is full and
+            overflow is "reject"
+        """
+        future = Future()
+        item = (frame, future, callback, time.perf_counter())
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                break
+            except queue.Full:
+                if self.overflow == "reject":
+                    self._count("rejected")
+                    return None
+                try:
+                    _, dropped, _, _ = self._queue.get_nowait()
+                except queue.Empty:
+                    continue
+                dropped.cancel()
+                self._count("dropped")
+        self._count("submitted")
+        return future
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def _dispatch(self):
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            batch = [first]
+            deadline = time.perf_counter() + self.max_batch_delay
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            self._slots.acquire()
+            try:
+                self._executor.submit(self._run_batch, batch)
+            except RuntimeError:
+                self._slots.release()
+                for _, future, _, _ in batch:
+                    future.cancel()
+                return
+
+    def _run_batch(self, batch):
+        try:
+            try:
+                results = self.backend.detect_batch([frame for frame, _, _, _ in batch])
+                if len(results) != len(batch):
+                    raise ValueError("Detector returned a different number of results than frames")
+            except Exception as e:
+                self._count("failed", len(batch))
+                telemetry.error("PERCEPTION", "batch_failed", "Detector batch failed: {error}", error=str(e))
+                for _, future, _, _ in batch:
+                    future.set_exception(e)
+                return
+            finished = time.perf_counter()
+            latencies = [finished - submitted for _, _, _, submitted in batch]
+            with self._stats_lock:
+                self._stats["batches"] += 1
+                self._stats["completed"] += len(batch)
+                self._stats["latency_sum"] += sum(latencies)
+                self._stats["latency_max"] = max(self._stats["latency_max"], max(latencies))
+            for (_, future, callback, _), result in zip(batch, results):
+                future.set_result(result)
+                if callback is not None:
+                    try:
+                        callback(result)
+                    except Exception as e:
+                        telemetry.error("PERCEPTION", "callback_failed", "Perception callback failed: {error}",
+                                        error=str(e))
+        finally:
+            self._slots.release()
+
+    def get_stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        completed = stats.pop("completed")
+        latency_sum = stats.pop("latency_sum")
+        stats["completed"] = completed
+        stats["mean_batch_size"] = completed / stats["batches"] if stats["batches"] else 0.0
+        stats["latency_mean"] = latency_sum / completed if completed else 0.0
+        stats["queued"] = self.pending()
+        return stats
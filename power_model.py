@@ -0,0 +1,109 @@
+"""
+Online battery drain estimation.
+
+DrainRateEstimator learns the vehicle's load drain (battery percent per
+minute) from successive battery readings, adding back whatever the solar
+panel supplied over each interval so that a sunny stretch does not look
+like a light load. Each interval's rate is weighted by the interval's
+length, so a burst of short, quantized readings moves the estimate no more
+than one reading covering the same time would, and their deviations are
+scaled to a reference_min interval before entering the variance.
+Updates and runtime predictions are O(1).
+
+Kept free of package-relative imports so vehicle.py can use it directly.
+"""
+
+import math
+
+
+class DrainRateEstimator:
+    def __init__(self, alpha=0.1, solar_gain_per_watt_min=0.0, prior_rate=None, reference_min=1.0):
+        """
+        Args:
+            alpha: EWMA weight of a drain observation spanning reference_min
+            solar_gain_per_watt_min: Battery percent gained per watt-minute of solar input
+            prior_rate: Drain rate (%/min) to assume before any observation
+            reference_min: Interval length (minutes) that alpha applies to; an
+                interval of k * reference_min gets weight 1 - (1 - alpha) ** k
+        """
+        self.alpha = alpha
+        self.reference_min = reference_min
+        self.solar_gain_per_watt_min = solar_gain_per_watt_min
+        self.rate = prior_rate
+        self.variance = 0.0
+        self.samples = 0
+        self._last = None
+
+    def update(self, timestamp, level, solar_w=0.0):
+        """Fold in a battery reading taken at timestamp (seconds) with the current solar input."""
+        if self._last is not None:
+            last_time, last_level, last_solar = self._last
+            minutes = (timestamp - last_time) / 60.0
+            if minutes > 0:
+                solar_credit = 0.5 * (last_solar + solar_w) * self.solar_gain_per_watt_min
+                observed = (last_level - level) / minutes + solar_credit
+                if self.rate is None:
+                    self.rate = observed
+                else:
+                    span = minutes / self.reference_min
+                    weight = 1.0 - (1.0 - self.alpha) ** span
+                    diff = observed - self.rate
+                    self.rate += weight * diff
+                    # A rate read over a fraction of reference_min carries
+                    # proportionally more quantization noise; scale it back.
+                    self.variance = (1 - weight) * (self.variance + weight * diff * diff * min(span, 1.0))
+                self.samples += 1
+        self._last = (timestamp, level, solar_w)
+
+    def pause(self):
+        """
+        Forget the last reading, e.g. while the load is off. The next reading
+        starts a new interval instead of folding the idle gap in as a low drain.
+        """
+        self._last = None
+
+    def get_state(self):
+        return {"rate": self.rate, "variance": self.variance, "samples": self.samples, "last": self._last}
+
+    def restore_state(self, state):
+        self.rate = state["rate"]
+        self.variance = state["variance"]
+        self.samples = state["samples"]
+        self._last = tuple(state["last"]) if state["last"] is not None else None
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def net_rate(self, solar_w=0.0):
+        """Expected net drain (%/min) at the given solar input, or None before any data."""
+        if self.rate is None:
+            return None
+        return self.rate - solar_w * self.solar_gain_per_watt_min
+
+    def runtime(self, level, threshold=0.0, solar_w=0.0, z=1.96):
+        """
+        Minutes until level drops to threshold.
+
+        Returns:
+            Dict with the point estimate and lower/upper bounds (rate +/- z
+            standard deviations) in minutes, plus the net drain rate used.
+            Bounds are inf when the corresponding rate is not a drain.
+        """
+        net = self.net_rate(solar_w)
+        available = max(level - threshold, 0.0)
+        if net is None:
+            return {"minutes": None, "lower": None, "upper": None, "net_rate": None}
+
+        def minutes_at(rate):
+            if available == 0.0:
+                return 0.0
+            return available / rate if rate > 0 else math.inf
+
+        spread = z * self.std
+        return {
+            "minutes": minutes_at(net),
+            "lower": minutes_at(net + spread),
+            "upper": minutes_at(net - spread),
+            "net_rate": net,
+        }
@@ -0,0 +1,157 @@
+"""
+On-demand sampling profiler for a running process.
+
+SamplingProfiler starts a daemon thread that, every interval, reads the
+current stack of one target thread via sys._current_frames() and counts it.
+After the requested duration the counts are written in collapsed-stack
+format, one "outer;...;inner count" line per distinct stack, which
+flamegraph.pl, speedscope and inferno read directly.
+
+Nothing is installed in the target thread (no sys.settrace or setprofile),
+so an idle profiler costs nothing and a running one costs only the sampler
+thread's brief hold of the GIL per sample.
+
+Kept free of package-relative imports so vehicle.py can use it directly.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+DEFAULT_INTERVAL = 0.005  # seconds between samples
+MAX_DURATION = 300.0  # seconds; longer requests are clamped
+
+
+def _frame_label(frame, lines):
+    code = frame.f_code
+    where = os.path.basename(code.co_filename)
+    if lines:
+        return f"{code.co_name} ({where}:{frame.f_lineno})"
+    return f"{code.co_name} ({where})"
+
+
+def collapse(frame, lines=True):
+    """Collapsed-stack key for a frame and its callers, outermost first."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame, lines))
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels)
+
+
+def write_collapsed(stacks, path):
+    """Atomically write stack counts to path, heaviest stacks first."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    os.replace(tmp, path)
+
+
+class SamplingProfiler:
+    """
+    One profiling session at a time for a single target thread.
+
+    Args:
+        interval: Seconds between samples
+        lines: Include line numbers in frame labels (finer but wider flame graphs)
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, lines=True):
+        self.interval = interval
+        self.lines = lines
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.last_result = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration, output_path, thread_id=None, on_complete=None):
+        """
+        Sample thread_id (default: the calling thread) for duration seconds
+        in the background, then write collapsed stacks to output_path.
+
+        on_complete, if given, is called from the sampler thread with the
+        result dictionary (see profile()).
+
+        Returns:
+            False if a session is already running, else True
+        """
+        duration = min(max(float(duration), 0.0), MAX_DURATION)
+        target = threading.get_ident() if thread_id is None else thread_id
+        with self._lock:
+            if self.running:
+                return False
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._session, args=(target, duration, output_path, on_complete),
+                name="sampling-profiler", daemon=True,
+            )
+            self._thread.start()
+        return True
+
+    def stop(self):
+        """End the current session early; its samples are still written."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _session(self, target, duration, output_path, on_complete):
+        result = self.profile(target, duration)
+        result["path"] = output_path
+        try:
+            write_collapsed(result.pop("stacks"), output_path)
+        except OSError as e:
+            result["error"] = str(e)
+        self.last_result = result
+        if on_complete is not None:
+            on_complete(result)
+
+    def profile(self, thread_id, duration):
+        """
+        Sample thread_id in the calling thread until duration elapses, the
+        target thread exits or stop() is called.
+
+        Returns:
+            Dictionary with the stack Counter, samples taken, elapsed
+            seconds and the sampler's own CPU time per sample
+        """
+        stacks = Counter()
+        samples = 0
+        lines = self.lines
+        started = time.perf_counter()
+        cpu_started = time.thread_time()
+        deadline = started + duration
+        next_sample = started
+        while not self._stop.is_set():
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                break
+            stacks[collapse(frame, lines)] += 1
+            del frame
+            samples += 1
+            next_sample += self.interval
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            if next_sample > now:
+                self._stop.wait(min(next_sample, deadline) - now)
+            else:
+                # Fell behind (e.g. starved of the GIL); do not burst to catch up.
+                next_sample = now
+        elapsed = time.perf_counter() - started
+        cpu = time.thread_time() - cpu_started
+        return {
+            "stacks": stacks,
+            "samples": samples,
+            "distinct_stacks": len(stacks),
+            "elapsed_s": elapsed,
+            "sampler_cpu_us_per_sample": cpu / samples * 1e6 if samples else 0.0,
+        }
@@ -6,28 +6,356 @@ Handles all security-related functionality for the autonomous vehicle system.
 import jwt
 import bcrypt
 import logging
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, List, Tuple, Union
 import hashlib
+import os
+import select
 import ssl
 import socket
 import threading
 import time
+import weakref
+
+try:
+    from .metrics import REGISTRY
+except ImportError:
+    # Imported as a top-level module (`import security`): use the package's
+    # registry rather than loading metrics.py a second time.
+    from _package import load_module
+    REGISTRY = load_module("metrics").REGISTRY
+
+# A bare str is rejected rather than guessed at: encrypt_data() and
+# verify_data_integrity() treat str as content, so paths must be os.PathLike.
+ByteSource = Union[bytes, os.PathLike, BinaryIO, Iterable[bytes]]
+
+def _iter_chunks(source: ByteSource, chunk_size: int) -> Iterator[memoryview]:
+    """
+    Yield fixed-size chunks of source as memoryviews over one reused buffer.
+
+    Each view is only valid until the next chunk is requested. Bytes-like
+    sources are sliced in place, paths (os.PathLike) and binary file objects
+    are read with readinto(), and other iterables of bytes are re-chunked so
+    every chunk except the last is exactly chunk_size.
+
+    Raises:
+        TypeError: If source is a str, which could be either a path or content
+    """
+    if isinstance(source, str):
+        raise TypeError(
+            "str sources are ambiguous: pass a pathlib.Path for a file, or encode the text to bytes"
+        )
+    if isinstance(source, os.PathLike):
+        with open(source, 'rb', buffering=0) as f:
+            yield from _iter_chunks(f, chunk_size)
+        return
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = memoryview(source).cast('B')
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+        return
+
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    if hasattr(source, 'readinto'):
+        while True:
+            filled = 0
+            while filled < chunk_size:
+                n = source.readinto(view[filled:])
+                if not n:
+                    break
+                filled += n
+            if filled:
+                yield view[:filled]
+            if filled < chunk_size:
+                return
+
+    filled = 0
+    for piece in source:
+        piece = memoryview(piece).cast('B')
+        while piece:
+            take = min(chunk_size - filled, len(piece))
+            view[filled:filled + take] = piece[:take]
+            piece = piece[take:]
+            filled += take
+            if filled == chunk_size:
+                yield view
+                filled = 0
+    if filled:
+        yield view[:filled]
+
+def _sha256_prefixed(prefix: bytes, chunk) -> bytes:
+    # Domain-separate leaves (0x00) from interior nodes (0x01).
+    h = hashlib.sha256(prefix)
+    h.update(chunk)
+    return h.digest()
+
+def merkle_root(leaves: List[bytes]) -> bytes:
+    """
+    Compute the Merkle root of a list of leaf digests.
+
+    Interior nodes are sha256(0x01 || left || right); an odd node at the
+    end of a level is promoted unchanged.
+    """
+    if not leaves:
+        return hashlib.sha256(b'').digest()
+    level = list(leaves)
+    while len(level) > 1:
+        nxt = [_sha256_prefixed(b'\x01', level[i] + level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            nxt.append(level[-1])
+        level = nxt
+    return level[0]
+
+class TLSConnectionPool:
+    """
+    Pool of reusable TLS client connections keyed by (host, port).
+
+    The SSL context is built once and shared by every connection, idle
+    sockets are handed back out instead of reconnecting, and the last
+    session seen for each endpoint is offered on new handshakes so the
+    server can resume it instead of doing a full handshake.
+    """
+
+    def __init__(self, context: Optional[ssl.SSLContext] = None, max_idle_per_host: int = 4,
+                 idle_timeout: float = 60.0, connect_timeout: float = 10.0):
+        self.logger = logging.getLogger(__name__)
+        self.context = context or self._default_context()
+        self.max_idle_per_host = max_idle_per_host
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self._idle: Dict[Tuple[str, int], List[Tuple[ssl.SSLSocket, float]]] = {}
+        self._sessions: Dict[Tuple[str, int], ssl.SSLSession] = {}
+        # Keyed weakly by the socket itself: callers that close or drop a
+        # socket instead of releasing it leave no entry (or id() reuse) behind.
+        self._checked_out = weakref.WeakKeyDictionary()  # SSLSocket -> (host, port)
+        self._pool_lock = threading.Lock()
+        self._stats = {'connects': 0, 'reuses': 0, 'resumed': 0, 'evicted': 0, 'unhealthy': 0}
+
+    @staticmethod
+    def _default_context() -> ssl.SSLContext:
+        context = ssl.create_default_context()
+        context.check_hostname = True
+        context.verify_mode = ssl.CERT_REQUIRED
+        return context
+
+    def acquire(self, host: str, port: int) -> ssl.SSLSocket:
+        """
+        Get a connected TLS socket for host:port, reusing an idle one if possible.
+
+        Args:
+            host: Host to connect to
+            port: Port to connect to
+
+        Returns:
+            SSL socket for secure communication
+        """
+        key = (host, port)
+        now = time.time()
+        while True:
+            with self._pool_lock:
+                idle = self._idle.get(key)
+                if not idle:
+                    break
+                sock, released_at = idle.pop()
+            if now - released_at > self.idle_timeout:
+                self._discard(sock, 'evicted')
+            elif not self._is_healthy(sock):
+                self._discard(sock, 'unhealthy')
+            else:
+                with self._pool_lock:
+                    self._stats['reuses'] += 1
+                    self._checked_out[sock] = key
+                return sock
+
+        sock = self._connect(host, port)
+        with self._pool_lock:
+            self._checked_out[sock] = key
+        return sock
+
+    def release(self, sock: ssl.SSLSocket):
+        """
+        Return a socket obtained from acquire() to the pool.
+
+        Args:
+            sock: Socket previously returned by acquire()
+        """
+        with self._pool_lock:
+            key = self._checked_out.pop(sock, None)
+        if key is None or sock.fileno() == -1:
+            return
+        if not self._drain(sock):
+            self._discard(sock, 'unhealthy')
+            return
+        session = sock.session
+        with self._pool_lock:
+            if session is not None:
+                self._sessions[key] = session
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append((sock, time.time()))
+                return
+        self._discard(sock, 'evicted')
+
+    def discard(self, sock: ssl.SSLSocket):
+        """Close a checked-out socket instead of returning it, e.g. after an I/O error."""
+        with self._pool_lock:
+            self._checked_out.pop(sock, None)
+        self._discard(sock, 'unhealthy')
+
+    @contextmanager
+    def connection(self, host: str, port: int):
+        """Context manager that acquires a socket and releases or discards it on exit."""
+        sock = self.acquire(host, port)
+        try:
+            yield sock
+        except (OSError, ssl.SSLError):
+            self.discard(sock)
+            raise
+        else:
+            self.release(sock)
+
+    def evict_idle(self) -> int:
+        """
+        Close idle connections that exceeded idle_timeout or are no longer healthy.
+
+        Returns:
+            Number of connections closed
+        """
+        now = time.time()
+        stale = []
+        with self._pool_lock:
+            self._prune_checked_out()
+            for key, idle in self._idle.items():
+                keep = []
+                for sock, released_at in idle:
+                    if now - released_at > self.idle_timeout or not self._is_healthy(sock):
+                        stale.append(sock)
+                    else:
+                        keep.append((sock, released_at))
+                self._idle[key] = keep
+        for sock in stale:
+            self._discard(sock, 'evicted')
+        return len(stale)
+
+    def close(self):
+        """Close every idle connection and forget cached sessions."""
+        with self._pool_lock:
+            idle = [sock for conns in self._idle.values() for sock, _ in conns]
+            self._idle.clear()
+            self._sessions.clear()
+        for sock in idle:
+            self._discard(sock, None)
+
+    def get_stats(self) -> dict:
+        """
+        Get pool usage counters.
+
+        Returns:
+            Dictionary with connect/reuse/resumption counters and idle socket count
+        """
+        with self._pool_lock:
+            stats = dict(self._stats)
+            stats['idle'] = sum(len(conns) for conns in self._idle.values())
+            self._prune_checked_out()
+            stats['checked_out'] = len(self._checked_out)
+        return stats
+
+    def _prune_checked_out(self):
+        # Sockets the caller closed itself (the secure_communication contract
+        # before pooling) are never released; forget them. Caller holds _pool_lock.
+        for sock in [sock for sock in self._checked_out if sock.fileno() == -1]:
+            del self._checked_out[sock]
+
+    def _connect(self, host: str, port: int) -> ssl.SSLSocket:
+        key = (host, port)
+        with self._pool_lock:
+            session = self._sessions.get(key)
+        raw = socket.create_connection(key, timeout=self.connect_timeout)
+        try:
+            sock = self.context.wrap_socket(raw, server_hostname=host, session=session)
+        except Exception:
+            raw.close()
+            raise
+        with self._pool_lock:
+            self._stats['connects'] += 1
+            if sock.session_reused:
+                self._stats['resumed'] += 1
+        return sock
+
+    @classmethod
+    def _is_healthy(cls, sock: ssl.SSLSocket) -> bool:
+        if sock.fileno() == -1:
+            return False
+        if sock.pending():
+            return False
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        # Readable can mean TLS records nobody consumed (e.g. TLS 1.3 session
+        # tickets on a send-only connection) rather than EOF; drain to tell.
+        return not readable or cls._drain(sock)
+
+    @staticmethod
+    def _drain(sock: ssl.SSLSocket) -> bool:
+        """
+        Consume already-received TLS records without blocking.
+
+        Returns:
+            True if only protocol records (e.g. session tickets) were pending;
+            False on EOF, close_notify, application data or a socket error
+        """
+        timeout = sock.gettimeout()
+        try:
+            sock.setblocking(False)
+            # An idle connection has no business receiving data: EOF (b'')
+            # and any application byte both mean it cannot be reused.
+            sock.recv(1)
+            return False
+        except ssl.SSLWantReadError:
+            return True
+        except (OSError, ValueError):
+            return False
+        finally:
+            try:
+                sock.settimeout(timeout)
+            except OSError:
+                pass
+
+    def _discard(self, sock: ssl.SSLSocket, reason: Optional[str]):
+        if reason is not None:
+            with self._pool_lock:
+                self._stats[reason] += 1
+        try:
+            sock.close()
+        except OSError as e:
+            self.logger.debug(f"Error closing pooled connection: {str(e)}")
+
+AUTH_OUTCOMES = REGISTRY.counter('security_auth', 'Authentication attempts by outcome', ('outcome',))
+TOKEN_CHECKS = REGISTRY.counter('security_token_checks', 'Token verifications by outcome', ('outcome',))
+_AUTH = {outcome: AUTH_OUTCOMES.labels(outcome) for outcome in ('success', 'blocked', 'locked_out', 'bad_credentials')}
+_TOKEN = {outcome: TOKEN_CHECKS.labels(outcome) for outcome in ('valid', 'unknown', 'ip_mismatch', 'expired', 'error')}
+
 
 class VehicleSecurity:
-    def __init__(self):
+    def __init__(self, tls_context: Optional[ssl.SSLContext] = None):
         self.logger = logging.getLogger(__name__)
         self._access_tokens: Dict[str, dict] = {}
         self._failed_attempts: Dict[str, int] = {}
         self._blocked_ips: List[str] = []
         self._last_cleanup = time.time()
         self._security_lock = threading.Lock()
+        self._tls_pool = TLSConnectionPool(context=tls_context)
         
         # Security configuration
         self.MAX_FAILED_ATTEMPTS = 5
         self.BLOCK_DURATION = 3600  # 1 hour in seconds
         self.TOKEN_EXPIRY = 3600  # 1 hour in seconds
         self.CLEANUP_INTERVAL = 300  # 5 minutes in seconds
+        self.STREAM_CHUNK_SIZE = 1024 * 1024  # 1 MiB per hashed chunk
         
         # Initialize security monitoring
         self._start_security_monitor()
@@ -43,6 +371,7 @@ class VehicleSecurity:
             try:
                 self._cleanup_expired_data()
                 self._check_system_integrity()
+                self._tls_pool.evict_idle()
                 time.sleep(60)  # Check every minute
             except Exception as e:
                 self.logger.error(f"Security monitor error: {str(e)}")
@@ -61,16 +390,19 @@ class VehicleSecurity:
         """
         if ip_address in self._blocked_ips:
             self.logger.warning(f"Blocked IP attempt: {ip_address}")
+            _AUTH['blocked'].inc()
             return None
 
         if self._failed_attempts.get(ip_address, 0) >= self.MAX_FAILED_ATTEMPTS:
             self._block_ip(ip_address)
+            _AUTH['locked_out'].inc()
             return None
 
         # In a real system, verify against a secure database
         # This is a simplified example
         if not self._verify_credentials(username, password):
             self._failed_attempts[ip_address] = self._failed_attempts.get(ip_address, 0) + 1
+            _AUTH['bad_credentials'].inc()
             return None
 
         # Generate JWT token
@@ -80,7 +412,7 @@ class VehicleSecurity:
             'ip_address': ip_address,
             'created_at': datetime.utcnow()
         }
-        
+        _AUTH['success'].inc()
         return token
 
     def verify_token(self, token: str, ip_address: str) -> bool:
@@ -96,22 +428,27 @@ class VehicleSecurity:
         """
         try:
             if token not in self._access_tokens:
+                _TOKEN['unknown'].inc()
                 return False
 
             token_data = self._access_tokens[token]
             if token_data['ip_address'] != ip_address:
                 self.logger.warning(f"IP mismatch for token: {ip_address}")
+                _TOKEN['ip_mismatch'].inc()
                 return False
 
             # Check token expiration
             created_at = token_data['created_at']
             if datetime.utcnow() - created_at > timedelta(seconds=self.TOKEN_EXPIRY):
                 del self._access_tokens[token]
+                _TOKEN['expired'].inc()
                 return False
 
+            _TOKEN['valid'].inc()
             return True
         except Exception as e:
             self.logger.error(f"Token verification error: {str(e)}")
+            _TOKEN['error'].inc()
             return False
 
     def _verify_credentials(self, username: str, password: str) -> bool:
@@ -183,6 +520,9 @@ class VehicleSecurity:
     def secure_communication(self, host: str, port: int) -> ssl.SSLSocket:
         """
         Establish a secure SSL connection.
+
+        Connections come from a shared pool; hand the socket back with
+        release_connection() once done so later calls can reuse it.
         
         Args:
             host: Host to connect to
@@ -191,14 +531,18 @@ class VehicleSecurity:
         Returns:
             SSL socket for secure communication
         """
-        context = ssl.create_default_context()
-        context.check_hostname = True
-        context.verify_mode = ssl.CERT_REQUIRED
-        
-        sock = socket.create_connection((host, port))
-        return context.wrap_socket(sock, server_hostname=host)
+        return self._tls_pool.acquire(host, port)
+
+    def release_connection(self, sock: ssl.SSLSocket):
+        """
+        Return a socket from secure_communication() to the connection pool.
 
-    def encrypt_data(self, data: str) -> bytes:
+        Args:
+            sock: Socket to return
+        """
+        self._tls_pool.release(sock)
+
+    def encrypt_data(self, data: Union[str, bytes]) -> bytes:
         """
         Encrypt sensitive data.
         
@@ -209,9 +553,114 @@ class VehicleSecurity:
             Encrypted data
         """
         # In a real system, use proper encryption
-        return hashlib.sha256(data.encode()).digest()
+        if isinstance(data, str):
+            data = data.encode()
+        return hashlib.sha256(data).digest()
+
+    def hash_stream(self, source: ByteSource, chunk_size: Optional[int] = None) -> bytes:
+        """
+        Hash a file, file object or iterable of bytes without loading it into memory.
+
+        The digest matches encrypt_data() for the same bytes; encrypt_data(text)
+        hashes text.encode(), so compare against hash_stream(text.encode()).
+        A str source raises TypeError rather than being read as a path.
+
+        Args:
+            source: Bytes, os.PathLike file path, binary file object or iterable of bytes
+            chunk_size: Read size in bytes (defaults to STREAM_CHUNK_SIZE)
 
-    def verify_data_integrity(self, data: str, hash_value: bytes) -> bool:
+        Returns:
+            SHA-256 digest of the full content
+        """
+        h = hashlib.sha256()
+        for chunk in _iter_chunks(source, chunk_size or self.STREAM_CHUNK_SIZE):
+            h.update(chunk)
+        return h.digest()
+
+    def build_integrity_manifest(self, source: ByteSource, chunk_size: Optional[int] = None) -> dict:
+        """
+        Hash source in fixed-size chunks and build a Merkle manifest for it.
+
+        Args:
+            source: Bytes, os.PathLike file path, binary file object or iterable of bytes
+            chunk_size: Chunk size in bytes (defaults to STREAM_CHUNK_SIZE)
+
+        Returns:
+            Dictionary with chunk_size, size, per-chunk leaf digests (hex),
+            Merkle root (hex) and the whole-content SHA-256 (hex)
+        """
+        chunk_size = chunk_size or self.STREAM_CHUNK_SIZE
+        whole = hashlib.sha256()
+        leaves = []
+        size = 0
+        for chunk in _iter_chunks(source, chunk_size):
+            whole.update(chunk)
+            leaves.append(_sha256_prefixed(b'\x00', chunk))
+            size += len(chunk)
+        return {
+            'chunk_size': chunk_size,
+            'size': size,
+            'chunks': [leaf.hex() for leaf in leaves],
+            'root': merkle_root(leaves).hex(),
+            'sha256': whole.hexdigest(),
+        }
+
+    def find_corrupted_chunks(self, source: ByteSource, manifest: dict) -> List[int]:
+        """
+        Re-hash source chunk by chunk and compare against a manifest.
+
+        Args:
+            source: Bytes, os.PathLike file path, binary file object or iterable of bytes
+            manifest: Manifest from build_integrity_manifest()
+
+        Returns:
+            Indices of chunks that differ, are missing or are extra;
+            an empty list means the content is intact
+        """
+        expected = manifest['chunks']
+        if merkle_root([bytes.fromhex(leaf) for leaf in expected]).hex() != manifest['root']:
+            self.logger.warning("Integrity manifest is inconsistent with its Merkle root")
+            return list(range(len(expected)))
+
+        corrupted = []
+        count = 0
+        for index, chunk in enumerate(_iter_chunks(source, manifest['chunk_size'])):
+            count += 1
+            if index >= len(expected) or _sha256_prefixed(b'\x00', chunk).hex() != expected[index]:
+                corrupted.append(index)
+        corrupted.extend(range(count, len(expected)))
+        return corrupted
+
+    def verify_chunk(self, path: Union[str, os.PathLike], index: int, manifest: dict) -> bool:
+        """
+        Re-verify a single chunk of a file without rehashing the rest of it.
+
+        Args:
+            path: File to read
+            index: Chunk index from find_corrupted_chunks()
+            manifest: Manifest from build_integrity_manifest()
+
+        Returns:
+            True if the chunk matches its recorded digest, False otherwise
+        """
+        chunk_size = manifest['chunk_size']
+        expected = manifest['chunks']
+        if not 0 <= index < len(expected):
+            return False
+        expected_len = min(chunk_size, manifest['size'] - index * chunk_size)
+        buffer = bytearray(expected_len)
+        with open(path, 'rb', buffering=0) as f:
+            f.seek(index * chunk_size)
+            filled = 0
+            view = memoryview(buffer)
+            while filled < expected_len:
+                n = f.readinto(view[filled:])
+                if not n:
+                    return False
+                filled += n
+        return _sha256_prefixed(b'\x00', buffer).hex() == expected[index]
+
+    def verify_data_integrity(self, data: Union[str, bytes], hash_value: bytes) -> bool:
         """
         Verify data integrity using hash.
         
@@ -222,7 +671,7 @@ class VehicleSecurity:
         Returns:
             True if data integrity is verified, False otherwise
         """
-        return hashlib.sha256(data.encode()).digest() == hash_value
+        return self.encrypt_data(data) == hash_value
 
     def emergency_shutdown(self):
         """Execute emergency shutdown procedures."""
@@ -232,6 +681,9 @@ class VehicleSecurity:
             
             # Clear all access tokens
             self._access_tokens.clear()
+
+            # Drop pooled connections
+            self._tls_pool.close()
             
             # Block all IPs
             self._blocked_ips.extend(self._failed_attempts.keys())
@@ -245,6 +697,9 @@ class VehicleSecurity:
     def get_security_status(self) -> dict:
         """
         Get current security status.
+
+        Authentication and token-check outcome counts are also exported
+        through the metrics registry (security_auth, security_token_checks).
         
         Returns:
             Dictionary containing security status information
@@ -253,5 +708,6 @@ class VehicleSecurity:
             'active_tokens': len(self._access_tokens),
             'blocked_ips': len(self._blocked_ips),
             'failed_attempts': sum(self._failed_attempts.values()),
-            'last_cleanup': self._last_cleanup
+            'last_cleanup': self._last_cleanup,
+            'tls_pool': self._tls_pool.get_stats()
         } 
\ No newline at end of file
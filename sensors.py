@@ -1,8 +1,326 @@
 import time
 import random
 import math
+import operator
+import numpy as np
 import matplotlib.pyplot as plt
 
+from .telemetry import telemetry
+
+_RULE_OPS = {
+    ">": (operator.gt, np.greater),
+    ">=": (operator.ge, np.greater_equal),
+    "<": (operator.lt, np.less),
+    "<=": (operator.le, np.less_equal),
+}
+
+# (label, [(channel, op, threshold), ...]) -- every clause must hold.
+ENVIRONMENT_CONDITION_RULES = [
+    ("High Temperature", [("temperature", ">", 45)]),
+    ("Poor Air Quality", [("air_quality", ">", 100)]),
+    ("Radiation Risk", [("radiation", ">", 0.05)]),
+    ("Low Visibility", [("light_level", "<", 50)]),
+    ("High Noise", [("sound_level", ">", 85)]),
+]
+
+class EnvironmentRuleTable:
+    """
+    Threshold rules over environment channels, evaluated either on a single
+    reading dict or on a columnar batch (channel -> array) with NumPy masks.
+    Both paths use the same compiled table so they always agree.
+    """
+
+    def __init__(self, rules):
+        self.labels = tuple(label for label, _ in rules)
+        self.channels = tuple(sorted({channel for _, clauses in rules for channel, _, _ in clauses}))
+        self._compiled = []
+        for label, clauses in rules:
+            compiled = []
+            for channel, op, threshold in clauses:
+                if op not in _RULE_OPS:
+                    raise ValueError(f"Unsupported rule operator: {op}")
+                compiled.append((channel, _RULE_OPS[op][0], _RULE_OPS[op][1], threshold))
+            self._compiled.append((label, tuple(compiled)))
+
+    def evaluate(self, reading):
+        """Return the labels of every rule that holds for one reading dict."""
+        return [label for label, clauses in self._compiled
+                if all(op(reading[channel], threshold) for channel, op, _, threshold in clauses)]
+
+    def classify(self, reading, default="normal"):
+        """Return the label of the first rule that holds, or default."""
+        for label, clauses in self._compiled:
+            if all(op(reading[channel], threshold) for channel, op, _, threshold in clauses):
+                return label
+        return default
+
+    def match_batch(self, columns):
+        """
+        Evaluate every rule over a columnar batch.
+
+        Args:
+            columns: Mapping of channel name to a 1-D array of readings
+
+        Returns:
+            Boolean array of shape (n_rows, n_rules), columns ordered as self.labels
+        """
+        arrays = {channel: np.asarray(columns[channel]) for channel in self.channels}
+        n = len(next(iter(arrays.values()))) if arrays else 0
+        mask = np.empty((n, len(self._compiled)), dtype=bool)
+        for i, (_, clauses) in enumerate(self._compiled):
+            out = mask[:, i]
+            out[:] = True
+            for channel, _, np_op, threshold in clauses:
+                out &= np_op(arrays[channel], threshold)
+        return mask
+
+    def classify_batch(self, columns, default="normal"):
+        """
+        First-match classification of a columnar batch.
+
+        Returns:
+            (labels, counts): per-row label array and a {label: count} dict
+        """
+        mask = self.match_batch(columns)
+        names = self.labels + (default,)
+        choices = np.array(names)
+        if mask.shape[1]:
+            first = np.where(mask.any(axis=1), mask.argmax(axis=1), len(self.labels))
+        else:
+            first = np.zeros(mask.shape[0], dtype=np.intp)
+        per_label = np.bincount(first, minlength=len(choices))
+        return choices[first], {label: int(count) for label, count in zip(names, per_label)}
+
+    def count_batch(self, mask):
+        """Count rows matching each rule in a mask from match_batch()."""
+        return {label: int(count) for label, count in zip(self.labels, mask.sum(axis=0))}
+
+# (bucket width in seconds, buckets kept): 1 h of 1 s, 1 day of 1 min, 6 weeks of 1 h
+DEFAULT_ROLLUPS = ((1, 3600), (60, 1440), (3600, 1008))
+
+class SensorTimeSeries:
+    """
+    Fixed-memory time-series store for a fixed set of sensor channels.
+
+    Raw samples go into a float32 ring buffer; every sample is also folded
+    into downsampled mean/min/max rollups (1 s / 1 min / 1 h by default),
+    each its own ring buffer, so memory never grows with mission length.
+    Per-channel trend slopes come from a least-squares fit over the last
+    trend_window samples, maintained incrementally with running sums.
+
+    Indexing and len() follow the old list-of-(timestamp, readings) log
+    over the retained raw window, so existing callers keep working.
+    """
+
+    def __init__(self, channels, capacity=3600, rollups=DEFAULT_ROLLUPS, trend_window=60, trend_tolerance=0.01):
+        if not 2 <= trend_window < capacity:
+            raise ValueError("trend_window must be at least 2 and smaller than capacity")
+        self.channels = tuple(channels)
+        self._index = {channel: i for i, channel in enumerate(self.channels)}
+        self.capacity = capacity
+        self.trend_window = trend_window
+        self.trend_tolerance = trend_tolerance
+        n = len(self.channels)
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._values = np.zeros((capacity, n), dtype=np.float32)
+        self._head = 0
+        self._size = 0
+        self._rollups = [self._new_rollup(width, buckets, n) for width, buckets in rollups]
+        self._reset_fit(0.0)
+
+    @staticmethod
+    def _new_rollup(width, buckets, n):
+        return {
+            "width": width,
+            "starts": np.zeros(buckets, dtype=np.float64),
+            "mean": np.zeros((buckets, n), dtype=np.float32),
+            "min": np.zeros((buckets, n), dtype=np.float32),
+            "max": np.zeros((buckets, n), dtype=np.float32),
+            "count": np.zeros(buckets, dtype=np.int32),
+            "head": 0,
+            "size": 0,
+            "open": None,  # start of the bucket being accumulated
+            "acc_sum": np.zeros(n, dtype=np.float64),
+            "acc_min": np.full(n, np.inf),
+            "acc_max": np.full(n, -np.inf),
+            "acc_count": 0,
+        }
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("SensorTimeSeries index out of range")
+        slot = (self._head - self._size + index) % self.capacity
+        return float(self._times[slot]), dict(zip(self.channels, self._values[slot].tolist()))
+
+    def append(self, sample):
+        """Add a (timestamp, readings) pair; readings for unknown channels are ignored."""
+        timestamp, readings = sample
+        row = np.array([readings.get(channel, np.nan) for channel in self.channels], dtype=np.float64)
+        slot = self._head
+        self._times[slot] = timestamp
+        self._values[slot] = row
+        self._head = (slot + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        for rollup in self._rollups:
+            self._fold(rollup, timestamp, row)
+        self._update_fit(timestamp, self._values[slot].astype(np.float64))
+
+    # Incremental least squares over the last trend_window samples. Times are
+    # taken relative to a reference that is rebased on every full recompute.
+
+    def _reset_fit(self, reference):
+        n = len(self.channels)
+        self._fit_ref = reference
+        self._fit_n = 0
+        self._fit_t = 0.0
+        self._fit_tt = 0.0
+        self._fit_y = np.zeros(n)
+        self._fit_ty = np.zeros(n)
+        self._fit_since_rebase = 0
+
+    def _update_fit(self, timestamp, values):
+        if self._fit_since_rebase >= self.trend_window:
+            self._recompute_fit()
+            return
+        if self._fit_n == 0:
+            # Epoch-scale times would cancel in n*tt - t*t; start near zero.
+            self._fit_ref = timestamp
+        t = timestamp - self._fit_ref
+        self._fit_n += 1
+        self._fit_t += t
+        self._fit_tt += t * t
+        self._fit_y += values
+        self._fit_ty += t * values
+        self._fit_since_rebase += 1
+        if self._fit_n > self.trend_window:
+            slot = (self._head - self.trend_window - 1) % self.capacity
+            old_t = self._times[slot] - self._fit_ref
+            old_y = self._values[slot].astype(np.float64)
+            self._fit_n -= 1
+            self._fit_t -= old_t
+            self._fit_tt -= old_t * old_t
+            self._fit_y -= old_y
+            self._fit_ty -= old_t * old_y
+
+    def _recompute_fit(self):
+        count = min(self._size, self.trend_window)
+        slots = (self._head - count + np.arange(count)) % self.capacity
+        times = self._times[slots]
+        values = self._values[slots].astype(np.float64)
+        self._reset_fit(float(times[0]))
+        t = times - self._fit_ref
+        self._fit_n = count
+        self._fit_t = float(t.sum())
+        self._fit_tt = float((t * t).sum())
+        self._fit_y = values.sum(axis=0)
+        self._fit_ty = (t[:, None] * values).sum(axis=0)
+
+    def slope(self, channel):
+        """Least-squares slope (units per second) over the trend window, or 0.0."""
+        i = self._index[channel]
+        n = self._fit_n
+        denom = n * self._fit_tt - self._fit_t * self._fit_t
+        if n < 2 or denom <= 0.0:
+            return 0.0
+        return float((n * self._fit_ty[i] - self._fit_t * self._fit_y[i]) / denom)
+
+    def trend(self, channel):
+        """Classify the trend window as "rising", "falling" or "stable"."""
+        n = self._fit_n
+        if n < 2:
+            return "stable"
+        i = self._index[channel]
+        span = self._times[(self._head - 1) % self.capacity] - self._times[(self._head - n) % self.capacity]
+        change = self.slope(channel) * span
+        scale = max(abs(self._fit_y[i] / n), 1e-12)
+        if change > self.trend_tolerance * scale:
+            return "rising"
+        if change < -self.trend_tolerance * scale:
+            return "falling"
+        return "stable"
+
+    def _fold(self, rollup, timestamp, row):
+        start = timestamp - timestamp % rollup["width"]
+        if rollup["open"] is not None and start != rollup["open"]:
+            self._close_bucket(rollup)
+        if rollup["acc_count"] == 0:
+            rollup["open"] = start
+        rollup["acc_sum"] += row
+        np.minimum(rollup["acc_min"], row, out=rollup["acc_min"])
+        np.maximum(rollup["acc_max"], row, out=rollup["acc_max"])
+        rollup["acc_count"] += 1
+
+    def _close_bucket(self, rollup):
+        count = rollup["acc_count"]
+        if count:
+            slot = rollup["head"]
+            rollup["starts"][slot] = rollup["open"]
+            rollup["mean"][slot] = rollup["acc_sum"] / count
+            rollup["min"][slot] = rollup["acc_min"]
+            rollup["max"][slot] = rollup["acc_max"]
+            rollup["count"][slot] = count
+            rollup["head"] = (slot + 1) % len(rollup["starts"])
+            rollup["size"] = min(rollup["size"] + 1, len(rollup["starts"]))
+        rollup["acc_sum"][:] = 0.0
+        rollup["acc_min"][:] = np.inf
+        rollup["acc_max"][:] = -np.inf
+        rollup["acc_count"] = 0
+        rollup["open"] = None
+
+    def rollup(self, width, start=None, end=None):
+        """
+        Downsampled buckets for one resolution, oldest first.
+
+        Args:
+            width: Bucket width in seconds (one of the configured rollups)
+            start, end: Optional timestamp bounds on bucket start
+
+        Returns:
+            Dict with "timestamp" and "count" arrays plus "mean", "min" and
+            "max" dicts of per-channel arrays; the still-open bucket is included
+        """
+        matches = [r for r in self._rollups if r["width"] == width]
+        if not matches:
+            raise ValueError(f"No rollup with width {width}s")
+        rollup = matches[0]
+        size = rollup["size"]
+        slots = (rollup["head"] - size + np.arange(size)) % len(rollup["starts"])
+        starts = rollup["starts"][slots]
+        stats = {key: rollup[key][slots] for key in ("mean", "min", "max")}
+        counts = rollup["count"][slots]
+        if rollup["acc_count"]:
+            acc_count = rollup["acc_count"]
+            starts = np.append(starts, rollup["open"])
+            counts = np.append(counts, acc_count)
+            stats["mean"] = np.vstack([stats["mean"], (rollup["acc_sum"] / acc_count)[None, :]]).astype(np.float32)
+            stats["min"] = np.vstack([stats["min"], rollup["acc_min"][None, :]]).astype(np.float32)
+            stats["max"] = np.vstack([stats["max"], rollup["acc_max"][None, :]]).astype(np.float32)
+        keep = np.ones(len(starts), dtype=bool)
+        if start is not None:
+            keep &= starts >= start
+        if end is not None:
+            keep &= starts <= end
+        return {
+            "timestamp": starts[keep],
+            "count": counts[keep],
+            **{key: {channel: stats[key][keep, i] for i, channel in enumerate(self.channels)} for key in stats},
+        }
+
+    def nbytes(self):
+        """Total bytes held by the fixed-size buffers."""
+        total = self._times.nbytes + self._values.nbytes
+        for rollup in self._rollups:
+            total += sum(rollup[k].nbytes for k in ("starts", "mean", "min", "max", "count"))
+        return total
+
 class EnvironmentalSensors:
     def __init__(self, collision=False, line_tracking=False, proximity_detection=False, obstacle_avoidance=False):
         self.collision = collision
@@ -12,10 +330,10 @@ class EnvironmentalSensors:
 
     def check_collision(self):
         if self.collision:
-            print("Collision detected!")
+            telemetry.warning("SENSORS", "collision", "Collision detected!")
 
 class EnvironmentalSensor:
-    def __init__(self):
+    def __init__(self, log_capacity=3600, trend_window=60):
         self.readings = {
             "temperature": 25.0,
             "humidity": 40.0,
@@ -25,37 +343,37 @@ class EnvironmentalSensor:
             "sound_level": 30.0,
             "pressure": 1013.25
         }
-        self.log = []
+        self.log = SensorTimeSeries(self.readings, capacity=log_capacity, trend_window=trend_window)
+        self.condition_rules = EnvironmentRuleTable(ENVIRONMENT_CONDITION_RULES)
 
     def read_all_sensors(self):
         self.log_environment()
-        print("[ENVIRONMENT] Sensor values updated.")
+        telemetry.debug("ENVIRONMENT", "updated", "Sensor values updated.")
         return self.readings
 
     def evaluate_conditions(self):
-        evaluations = []
-        if self.readings["temperature"] > 45:
-            evaluations.append("High Temperature")
-        if self.readings["air_quality"] > 100:
-            evaluations.append("Poor Air Quality")
-        if self.readings["radiation"] > 0.05:
-            evaluations.append("Radiation Risk")
-        if self.readings["light_level"] < 50:
-            evaluations.append("Low Visibility")
-        if self.readings["sound_level"] > 85:
-            evaluations.append("High Noise")
-        return evaluations
+        return self.condition_rules.evaluate(self.readings)
+
+    def evaluate_conditions_batch(self, columns):
+        """
+        Evaluate the condition rules over a columnar batch of recorded readings.
+
+        Returns:
+            (mask, counts): (n_rows, n_rules) boolean array ordered as
+            condition_rules.labels, and a {label: count} dict
+        """
+        mask = self.condition_rules.match_batch(columns)
+        return mask, self.condition_rules.count_batch(mask)
 
     def log_environment(self):
-        self.log.append((time.time(), self.readings.copy()))
-        print("[ENVIRONMENT] Readings logged.")
+        self.log.append((time.time(), self.readings))
+        telemetry.debug("ENVIRONMENT", "logged", "Readings logged.")
 
     def trend_summary(self):
         if not self.log:
             return "No data"
-        latest = self.log[-1][1]
-        trend = {k: "rising" if latest[k] > 50 else "stable" for k in latest}
-        print(f"[ENVIRONMENT] Trend summary: {trend}")
+        trend = {k: self.log.trend(k) for k in self.log.channels}
+        telemetry.debug("ENVIRONMENT", "trend_summary", "Trend summary: {trend}", trend=trend)
         return trend
 
 class LiDARScanner:
@@ -71,7 +389,7 @@ class LiDARScanner:
         self.current_location = location
         if location not in self.map_log:
             self.map_log.append(location)
-        print(f"Location pinned on map: {location}")
+        telemetry.info("LIDAR", "pinned", "Location pinned on map: {location}", location=location)
     
     def perform_scan(self):
         scan_data = []
@@ -81,7 +399,7 @@ class LiDARScanner:
             scan_data.append((angle, distance))
             angle += self.scan_resolution
         self.last_scan_data = scan_data
-        print(f"Performed scan with {len(scan_data)} data points.")
+        telemetry.debug("LIDAR", "scanned", "Performed scan with {points} data points.", points=len(scan_data))
     
     def get_scan_summary(self):
         if not self.last_scan_data:
@@ -98,7 +416,7 @@ class LiDARScanner:
 
     def plot_scan(self):
         if not self.last_scan_data:
-            print("No scan data to plot.")
+            telemetry.warning("LIDAR", "plot_empty", "No scan data to plot.")
             return
 
         angles = [math.radians(angle) for angle, _ in self.last_scan_data]
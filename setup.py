@@ -9,6 +9,7 @@ setup(
         "uvicorn>=0.15.0",
         "numpy>=1.21.0",
         "opencv-python>=4.5.0",
+        "Pillow>=8.0.0",
         "pytest>=6.2.5",
         "python-multipart>=0.0.5",
         "python-jose[cryptography]>=3.3.0",
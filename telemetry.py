@@ -0,0 +1,176 @@
+"""
+Structured, level-gated telemetry shared by every robotics module.
+
+Call sites emit events as (source, event, message template, fields) instead
+of printing formatted strings. Events below the configured level return
+before anything is built or formatted, so disabled telemetry costs one
+comparison per call. Templates are only rendered by sinks that need text.
+
+    from .telemetry import telemetry
+    telemetry.info("WHEEL", "speed_set", "Speed set to {speed} units", speed=speed)
+
+The default level comes from the ROBOTICS_TELEMETRY_LEVEL environment
+variable (WARNING if unset) and events go to the console in the legacy
+"[SOURCE] message" format.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+CRITICAL = 50
+OFF = 100
+
+LEVEL_NAMES = {
+    DEBUG: "DEBUG",
+    INFO: "INFO",
+    WARNING: "WARNING",
+    ERROR: "ERROR",
+    CRITICAL: "CRITICAL",
+    OFF: "OFF",
+}
+_LEVELS_BY_NAME = {name: level for level, name in LEVEL_NAMES.items()}
+
+
+def parse_level(level):
+    """Accept a numeric level or a level name such as "info"."""
+    if isinstance(level, int):
+        return level
+    try:
+        return _LEVELS_BY_NAME[str(level).upper()]
+    except KeyError:
+        raise ValueError(f"Unknown telemetry level: {level}") from None
+
+
+class TelemetryEvent(NamedTuple):
+    timestamp: float
+    level: int
+    source: str
+    event: str
+    message: str
+    fields: dict
+
+    def render(self):
+        """Format the message template with the event fields."""
+        return self.message.format(**self.fields) if self.fields else self.message
+
+    def to_dict(self):
+        return {
+            "ts": self.timestamp,
+            "level": LEVEL_NAMES.get(self.level, self.level),
+            "source": self.source,
+            "event": self.event,
+            "message": self.render(),
+            "fields": self.fields,
+        }
+
+
+class RingSink:
+    """Keeps the most recent events in memory."""
+
+    def __init__(self, capacity=1000):
+        self.buffer = deque(maxlen=capacity)
+
+    def handle(self, event):
+        self.buffer.append(event)
+
+    def events(self, source=None, min_level=DEBUG):
+        return [e for e in self.buffer if e.level >= min_level and (source is None or e.source == source)]
+
+    def clear(self):
+        self.buffer.clear()
+
+
+class ConsoleSink:
+    """Prints events as "[SOURCE] message", matching the old print() output."""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def handle(self, event):
+        print(f"[{event.source}] {event.render()}", file=self.stream or sys.stdout)
+
+
+class JsonLinesSink:
+    """Writes one JSON object per event to a path or an open text stream."""
+
+    def __init__(self, target):
+        self._owns_stream = isinstance(target, (str, os.PathLike))
+        self.stream = open(target, "a") if self._owns_stream else target
+        self._lock = threading.Lock()
+
+    def handle(self, event):
+        line = json.dumps(event.to_dict(), default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+
+    def flush(self):
+        self.stream.flush()
+
+    def close(self):
+        if self._owns_stream:
+            self.stream.close()
+
+
+class Telemetry:
+    def __init__(self, level=WARNING, sinks=None):
+        self.level = parse_level(level)
+        self.sinks = list(sinks) if sinks is not None else []
+
+    def set_level(self, level):
+        self.level = parse_level(level)
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        return sink
+
+    def remove_sink(self, sink):
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+
+    def is_enabled(self, level):
+        """Cheap guard for call sites that need to compute fields first."""
+        return level >= self.level and bool(self.sinks)
+
+    def emit(self, level, source, event, message="", /, **fields):
+        if level >= self.level and self.sinks:
+            self._dispatch(level, source, event, message, fields)
+
+    def debug(self, source, event, message="", /, **fields):
+        if DEBUG >= self.level and self.sinks:
+            self._dispatch(DEBUG, source, event, message, fields)
+
+    def info(self, source, event, message="", /, **fields):
+        if INFO >= self.level and self.sinks:
+            self._dispatch(INFO, source, event, message, fields)
+
+    def warning(self, source, event, message="", /, **fields):
+        if WARNING >= self.level and self.sinks:
+            self._dispatch(WARNING, source, event, message, fields)
+
+    def error(self, source, event, message="", /, **fields):
+        if ERROR >= self.level and self.sinks:
+            self._dispatch(ERROR, source, event, message, fields)
+
+    def critical(self, source, event, message="", /, **fields):
+        if CRITICAL >= self.level and self.sinks:
+            self._dispatch(CRITICAL, source, event, message, fields)
+
+    def _dispatch(self, level, source, event, message, fields):
+        record = TelemetryEvent(time.time(), level, source, event, message, fields)
+        for sink in self.sinks:
+            sink.handle(record)
+
+
+telemetry = Telemetry(
+    level=os.environ.get("ROBOTICS_TELEMETRY_LEVEL", "WARNING"),
+    sinks=[ConsoleSink()],
+)
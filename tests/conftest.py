@@ -0,0 +1,23 @@
+"""
+The repository root is itself the package (see __init__.py), so tests load
+it under the name used in the README, ``robotics``, and put the root on
+sys.path for the top-level scripts (vehicle.py, app.py) that import their
+sibling modules directly.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+from _package import PACKAGE_NAME, load_package  # noqa: E402
+
+load_package()
+
+
+@pytest.fixture
+def robotics():
+    return sys.modules[PACKAGE_NAME]
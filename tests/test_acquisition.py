@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from robotics.acquisition import SharedFrameRing
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def test_reader_process_exit_leaves_ring_in_place():
+    ring = SharedFrameRing.create(["lidar"], capacity=8, max_values=4)
+    try:
+        ring.publish(0, [1.0, 2.0], timestamp=1.0)
+        reader = (
+            f"import sys; sys.path.insert(0, {ROOT!r}); import acquisition; "
+            f"ring = acquisition.SharedFrameRing.attach({ring.name!r}); "
+            f"print(ring.latest('lidar')['values'].tolist()); ring.close()"
+        )
+        result = subprocess.run([sys.executable, '-c', reader], capture_output=True, text=True, timeout=30)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "[1.0, 2.0]"
+        assert "leaked" not in result.stderr
+
+        # The owner can still read and attach after the reader has gone.
+        assert ring.latest('lidar')['values'].tolist() == [1.0, 2.0]
+        again = SharedFrameRing.attach(ring.name)
+        assert again.latest('lidar')['seq'] == 0
+        again.close()
+    finally:
+        ring.close()
+
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'), reason="needs POSIX shared memory under /dev/shm")
+def test_owner_close_tolerates_missing_segment():
+    ring = SharedFrameRing.create(["imu"], capacity=4, max_values=2)
+    # What a reader's resource tracker did on older Pythons.
+    os.unlink(os.path.join('/dev/shm', ring.name.lstrip('/')))
+    ring.close()
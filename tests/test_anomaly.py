@@ -0,0 +1,58 @@
+import numpy as np
+
+
+def _readings(rng, n):
+    values = np.column_stack([
+        rng.normal(25.0, 2.0, n),       # temperature
+        rng.normal(1013.0, 0.5, n),     # pressure
+        np.full(n, 40.0),               # humidity, stuck
+        np.zeros(n),                    # vibration, idle
+    ])
+    # Outliers, including the first change on each constant sensor.
+    values[[60, 140], 0] = [60.0, -10.0]
+    values[90, 1] = 1030.0
+    values[120, 2] = 41.0
+    values[150, 3] = 0.5
+    return values
+
+
+def test_update_batch_matches_update_row_by_row(robotics):
+    sensors = ['temperature', 'pressure', 'humidity', 'vibration']
+    values = _readings(np.random.default_rng(7), 200)
+    timestamps = np.arange(len(values), dtype=np.float64)
+
+    single = robotics.StreamingAnomalyDetector()
+    expected = np.zeros(values.shape, dtype=bool)
+    for i, row in enumerate(values.tolist()):
+        hits = single.update(dict(zip(sensors, row)), timestamp=timestamps[i])
+        expected[i] = [key in hits for key in sensors]
+    batched = robotics.StreamingAnomalyDetector()
+    # Two batches, so the second starts from existing statistics.
+    flagged = np.vstack([
+        batched.update_batch(sensors, values[:100], timestamps[:100]),
+        batched.update_batch(sensors, values[100:], timestamps[100:]),
+    ])
+
+    np.testing.assert_array_equal(flagged, expected)
+    assert [entry[:3] for entry in batched.anomalies] == [entry[:3] for entry in single.anomalies]
+    np.testing.assert_allclose([entry[3] for entry in batched.anomalies], [entry[3] for entry in single.anomalies])
+    for key in sensors:
+        assert batched.stats[key][0] == single.stats[key][0]
+        np.testing.assert_allclose(batched.stats[key][1:], single.stats[key][1:], atol=1e-9)
+
+
+def test_constant_sensor_flags_its_first_change(robotics):
+    detector = robotics.StreamingAnomalyDetector()
+    for _ in range(50):
+        assert detector.update({'humidity': 40.0, 'vibration': 0.0}) == []
+    assert detector.update({'humidity': 40.5, 'vibration': 0.0}) == ['humidity']
+    assert detector.update({'humidity': 40.0, 'vibration': 0.01}) == ['vibration']
+
+
+def test_per_sensor_min_std(robotics):
+    detector = robotics.StreamingAnomalyDetector(min_std={'humidity': 1.0})
+    for _ in range(50):
+        detector.update({'humidity': 40.0, 'vibration': 0.0})
+    # Within 4 floors of the mean for humidity; vibration keeps the default floor.
+    assert detector.update({'humidity': 43.0, 'vibration': 0.01}) == ['vibration']
+    assert detector.update({'humidity': 46.0}) == ['humidity']
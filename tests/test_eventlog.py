@@ -0,0 +1,23 @@
+import json
+
+
+def test_full_log_overwrites_one_entry_at_a_time(robotics):
+    log = robotics.eventlog.EventLog(capacity=4)
+    for i in range(5):
+        log.append((float(i), 'tick', i))
+    assert len(log) == 4
+    assert [entry[0] for entry in log] == [1.0, 2.0, 3.0, 4.0]
+    log.append((5.0, 'tick', 5))
+    assert [entry[0] for entry in log] == [2.0, 3.0, 4.0, 5.0]
+    assert log[0] == (2.0, 'tick', 2.0)
+    assert log[-1] == (5.0, 'tick', 5.0)
+
+
+def test_full_log_spills_oldest_half(robotics, tmp_path):
+    spill = tmp_path / 'events.jsonl'
+    log = robotics.eventlog.EventLog(capacity=4, spill_path=str(spill))
+    for i in range(5):
+        log.append((float(i), 'tick', i))
+    assert [entry[0] for entry in log] == [2.0, 3.0, 4.0]
+    assert log.spilled == 2
+    assert [json.loads(line)['timestamp'] for line in spill.read_text().splitlines()] == [0.0, 1.0]
@@ -0,0 +1,131 @@
+import email.utils
+import importlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+from robotics import images
+from robotics.images import CachedImage, ImageNotReady, ImageService, not_modified, parse_range
+
+DATA = bytes(range(256)) * 4
+
+
+@pytest.mark.parametrize('header, expected', [
+    (None, None),
+    ('', None),
+    ('bytes=0-4', (0, 4)),
+    ('bytes=1000-', (1000, 1023)),
+    ('bytes=1000-5000', (1000, 1023)),
+    ('bytes=-24', (1000, 1023)),
+    ('bytes=-5000', (0, 1023)),
+    ('items=0-4', None),
+    ('bytes=0-1,4-5', None),
+    # Syntactically invalid: ignored, so the whole file is served.
+    ('bytes=x-', None),
+    ('bytes=5', None),
+    ('bytes=-', None),
+    ('bytes=5-2', None),
+    ('bytes=--5', None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, len(DATA)) == expected
+
+
+@pytest.mark.parametrize('header', ['bytes=1024-', 'bytes=5000-6000', 'bytes=-0'])
+def test_parse_range_unsatisfiable(header):
+    with pytest.raises(ValueError):
+        parse_range(header, len(DATA))
+
+
+def test_parse_range_empty_file():
+    with pytest.raises(ValueError):
+        parse_range('bytes=-10', 0)
+
+
+def test_not_modified():
+    image = CachedImage(DATA, (1_700_000_000_500_000_000, len(DATA)))
+    assert not not_modified(image)
+    assert not_modified(image, if_none_match=image.etag)
+    assert not_modified(image, if_none_match=f'"other", W/{image.etag}')
+    assert not_modified(image, if_none_match='*')
+    assert not not_modified(image, if_none_match='"other"')
+    # If-None-Match takes precedence over If-Modified-Since.
+    assert not not_modified(image, if_none_match='"other"', if_modified_since=image.http_date)
+    # HTTP dates have whole-second resolution; the sub-second mtime must not count as newer.
+    assert not_modified(image, if_modified_since=image.http_date)
+    assert not not_modified(image, if_modified_since=email.utils.formatdate(1_699_999_999, usegmt=True))
+    assert not not_modified(image, if_modified_since='not a date')
+
+
+def _growing(monkeypatch, path, writes):
+    # Append to the file each time it is stat'ed, as a writer would mid-save.
+    stamp = images._stamp
+    remaining = [writes]
+
+    def stamp_and_write(st):
+        if remaining[0]:
+            remaining[0] -= 1
+            with open(path, 'ab') as f:
+                f.write(b'x')
+        return stamp(st)
+
+    monkeypatch.setattr(images, '_stamp', stamp_and_write)
+    monkeypatch.setattr(images, 'READ_RETRY_DELAY', 0)
+
+
+def test_get_rereads_a_file_caught_mid_write(tmp_path, monkeypatch):
+    path = tmp_path / 'snapshot.jpg'
+    path.write_bytes(DATA)
+    _growing(monkeypatch, path, writes=2)
+    image = ImageService().get(str(path))
+    assert image.data == DATA + b'xx'
+    assert image.stamp[1] == len(image.data)
+
+
+def test_get_gives_up_on_a_file_that_keeps_changing(tmp_path, monkeypatch):
+    path = tmp_path / 'snapshot.jpg'
+    path.write_bytes(DATA)
+    _growing(monkeypatch, path, writes=2 * images.READ_ATTEMPTS)
+    with pytest.raises(ImageNotReady):
+        ImageService().get(str(path))
+
+
+@pytest.fixture
+def recon(tmp_path, monkeypatch):
+    app = importlib.import_module('app')
+    (tmp_path / 'recon_image_100.jpg').write_bytes(DATA)
+    monkeypatch.setattr(app, 'default_vehicle', app.VehicleHandle('test', str(tmp_path), app.file_pool))
+    client = TestClient(app.app)
+    url = '/recon/images/recon_image_100.jpg'
+    return client, url, client.get(url).headers['etag']
+
+
+def test_range_requests(recon):
+    client, url, etag = recon
+    response = client.get(url, headers={'Range': 'bytes=-24'})
+    assert response.status_code == 206
+    assert response.headers['content-range'] == 'bytes 1000-1023/1024'
+    assert response.content == DATA[-24:]
+
+    response = client.get(url, headers={'Range': 'bytes=2000-'})
+    assert response.status_code == 416
+    assert response.headers['content-range'] == 'bytes */1024'
+
+    response = client.get(url, headers={'Range': 'bytes=x-'})
+    assert response.status_code == 200
+    assert response.content == DATA
+
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+
+def test_if_range(recon):
+    client, url, etag = recon
+    response = client.get(url, headers={'Range': 'bytes=0-9', 'If-Range': etag})
+    assert response.status_code == 206
+    assert response.content == DATA[:10]
+
+    # The client holds another version: send the whole current image.
+    for stale in ('"0-0"', 'W/' + etag):
+        response = client.get(url, headers={'Range': 'bytes=0-9', 'If-Range': stale})
+        assert response.status_code == 200
+        assert response.content == DATA
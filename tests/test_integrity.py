@@ -0,0 +1,66 @@
+import io
+import os
+
+import pytest
+
+from robotics.security import VehicleSecurity
+
+CHUNK = 4096
+
+
+@pytest.fixture
+def security():
+    return VehicleSecurity()
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = tmp_path / 'recon_archive.bin'
+    path.write_bytes(os.urandom(CHUNK * 5 + 123))
+    return path
+
+
+def _flip(path, offset):
+    with open(path, 'r+b') as f:
+        f.seek(offset)
+        byte = f.read(1)
+        f.seek(offset)
+        f.write(bytes([byte[0] ^ 0x01]))
+
+
+def test_find_corrupted_chunks_locates_a_flipped_byte(security, archive):
+    manifest = security.build_integrity_manifest(archive, CHUNK)
+    assert len(manifest['chunks']) == 6
+    assert security.find_corrupted_chunks(archive, manifest) == []
+
+    _flip(archive, 3 * CHUNK + 17)
+    assert security.find_corrupted_chunks(archive, manifest) == [3]
+    assert not security.verify_chunk(archive, 3, manifest)
+    assert security.verify_chunk(archive, 2, manifest)
+    # The short final chunk and an out-of-range index.
+    assert security.verify_chunk(str(archive), 5, manifest)
+    assert not security.verify_chunk(archive, 6, manifest)
+
+
+def test_find_corrupted_chunks_reports_truncation(security, archive):
+    manifest = security.build_integrity_manifest(archive, CHUNK)
+    with open(archive, 'r+b') as f:
+        f.truncate(CHUNK * 4)
+    assert security.find_corrupted_chunks(archive, manifest) == [4, 5]
+    assert not security.verify_chunk(archive, 5, manifest)
+
+
+def test_sources_agree(security, archive):
+    data = archive.read_bytes()
+    digest = security.hash_stream(archive, CHUNK)
+    assert security.hash_stream(data, CHUNK) == digest
+    assert security.hash_stream(io.BytesIO(data), CHUNK) == digest
+    assert security.hash_stream(iter([data[:100], data[100:5000], data[5000:]]), CHUNK) == digest
+    assert security.encrypt_data(data) == digest
+    assert security.build_integrity_manifest(io.BytesIO(data), CHUNK) == security.build_integrity_manifest(archive, CHUNK)
+
+
+def test_str_source_is_rejected(security, archive):
+    with pytest.raises(TypeError, match='ambiguous'):
+        security.hash_stream(str(archive))
+    assert security.hash_stream('telemetry'.encode()) == security.encrypt_data('telemetry')
@@ -0,0 +1,33 @@
+import importlib
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+from conftest import ROOT
+
+
+def test_dashboard_metrics_include_package_metrics(robotics):
+    security = importlib.import_module('robotics.security')
+    app = importlib.import_module('app')
+    importlib.import_module('vehicle')
+    # The scripts go through the package instead of loading metrics.py again.
+    assert app.REGISTRY is robotics.REGISTRY
+    assert 'metrics' not in sys.modules
+
+    successes = security.AUTH_OUTCOMES.labels('success')
+    before = successes.value
+    assert security.VehicleSecurity().authenticate_user('operator', 'secret', '192.0.2.1')
+    body = TestClient(app.app).get('/metrics').text
+
+    assert '# TYPE security_auth counter' in body
+    assert f'security_auth_total{{outcome="success"}} {int(before) + 1}' in body
+
+
+def test_security_imports_as_a_top_level_module():
+    code = (
+        "import sys, security, vehicle\n"
+        "assert security.REGISTRY is vehicle.REGISTRY is sys.modules['robotics.metrics'].REGISTRY\n"
+        "assert 'metrics' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True)
@@ -0,0 +1,95 @@
+import random
+
+import numpy as np
+import pytest
+
+from robotics.control import AutonomousDecisionEngine
+from robotics.mission_log import MissionLog, MissionRecorder, MissionReplay
+
+START = 1_700_000_000.0
+
+
+def record_engine_only(path, decisions=100, checkpoint_interval=10.0):
+    now = [START]
+    engine = AutonomousDecisionEngine(clock=lambda: now[0])
+    engine.timeout_limit = decisions + 1
+    engine.set_mission_objective("survey")
+    rng = random.Random(7)
+    expected = []
+    with MissionRecorder(path, engine=engine, start_time=START, checkpoint_interval=checkpoint_interval):
+        for i in range(decisions):
+            now[0] = START + i
+            engine.update_sensor_input({"obstacle_detected": rng.random() < 0.3, "battery": 100 - i})
+            expected.append(engine.evaluate_mission())
+    return expected
+
+
+def test_engine_only_recording_replays_and_verifies(tmp_path):
+    path = tmp_path / "engine.rvml"
+    record_engine_only(str(path))
+    log = MissionLog(str(path))
+    assert len(log.checkpoints) >= 10
+
+    replay = MissionReplay(log, engine_factory=lambda clock: AutonomousDecisionEngine(clock=clock))
+    replay.run()
+    assert replay.engine is not None
+    assert replay.divergences == []
+
+    replay.seek(START + 55)
+    assert replay.engine.last_sensor_input["battery"] == 45
+
+
+def test_engine_only_replay_reports_divergent_decisions(tmp_path):
+    path = tmp_path / "engine.rvml"
+    expected = record_engine_only(str(path))
+
+    class Stubborn(AutonomousDecisionEngine):
+        def _evaluate(self):
+            return "continue"
+
+    replay = MissionReplay(str(path), engine_factory=lambda clock: Stubborn(clock=clock))
+    replay.run()
+    assert len(replay.divergences) == sum(decision != "continue" for decision in expected) > 0
+
+
+def test_replay_without_matching_factory_raises(tmp_path):
+    path = tmp_path / "engine.rvml"
+    record_engine_only(str(path))
+    with pytest.raises(ValueError, match="Nothing to replay"):
+        MissionReplay(str(path), sim_factory=lambda **kwargs: None).run()
+
+
+def test_unencodable_readings_do_not_stop_the_recording(tmp_path):
+    path = tmp_path / "engine.rvml"
+    now = [START]
+    engine = AutonomousDecisionEngine(clock=lambda: now[0])
+    engine.set_mission_objective("survey")
+    with MissionRecorder(str(path), engine=engine, start_time=START) as recorder:
+        engine.update_sensor_input({"obstacle_detected": np.bool_(False), "battery": np.float32(80.0)})
+        engine.evaluate_mission()
+        recorder.record_frame(START, "lidar", {"ranges": np.arange(3.0), "tags": {"dusty"}, "raw": object()})
+        with pytest.warns(RuntimeWarning, match="unencodable"):
+            recorder.record_frame(START, "imu", {(0, 1): 2.0})
+
+    frames = {source: data for _, source, data in MissionLog(str(path)).frames()}
+    assert frames["decision"] == {"obstacle_detected": False, "battery": 80.0}
+    assert frames["lidar"]["ranges"] == [0.0, 1.0, 2.0]
+    assert frames["lidar"]["tags"] == ["dusty"]
+    assert frames["lidar"]["raw"].startswith("<object object")
+    assert frames["imu"] == "{(0, 1): 2.0}"
+
+    replay = MissionReplay(str(path), engine_factory=lambda clock: AutonomousDecisionEngine(clock=clock))
+    replay.run()
+    assert replay.divergences == []
+
+
+@pytest.mark.parametrize("seed", [2**63, -2**63 - 1])
+def test_seed_outside_the_header_range_is_rejected(tmp_path, seed):
+    with pytest.raises(ValueError, match="signed 64-bit"):
+        MissionRecorder(str(tmp_path / "seed.rvml"), seed=seed)
+
+
+def test_largest_seed_round_trips(tmp_path):
+    path = tmp_path / "seed.rvml"
+    MissionRecorder(str(path), seed=2**63 - 1).close()
+    assert MissionLog(str(path)).seed == 2**63 - 1
@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+
+class EchoBackend:
+    """Detects whatever shape name it is handed."""
+
+    def detect_batch(self, frames):
+        return list(frames)
+
+
+class FailingBackend:
+    def detect_batch(self, frames):
+        raise RuntimeError("camera unplugged")
+
+
+@pytest.fixture
+def controller(robotics):
+    def attach(backend, **options):
+        controller = robotics.RobotController(None, None, None, robotics.ShapeVolumeDetection())
+        # Not started yet: frames stay queued, so the queue fills deterministically.
+        pipeline = robotics.PerceptionPipeline(backend, queue_size=2, **options)
+        controller.attach_perception(pipeline)
+        pipelines.append(pipeline)
+        return controller, pipeline
+
+    pipelines = []
+    yield attach
+    for pipeline in pipelines:
+        pipeline.stop()
+
+
+def test_reject_refuses_frames_when_full(controller):
+    ctrl, pipeline = controller(EchoBackend(), overflow="reject")
+    queued = [ctrl.request_object_analysis('cube'), ctrl.request_object_analysis('sphere')]
+    assert ctrl.request_object_analysis('cylinder') is None
+    assert pipeline.get_stats()['rejected'] == 1
+
+    pipeline.start()
+    detector = ctrl.shape_volume_detector
+    assert [f.result(timeout=5) for f in queued] == [
+        ('cube', detector.evaluate('cube')), ('sphere', detector.evaluate('sphere'))]
+
+
+def test_drop_oldest_cancels_the_dropped_analysis(controller):
+    ctrl, pipeline = controller(EchoBackend(), overflow="drop_oldest")
+    results = []
+    first = ctrl.request_object_analysis('cube', on_result=results.append)
+    second = ctrl.request_object_analysis('sphere', on_result=results.append)
+    third = ctrl.request_object_analysis('unknown', on_result=results.append)
+    assert first.cancelled()
+    assert pipeline.get_stats()['dropped'] == 1
+
+    pipeline.start()
+    assert second.result(timeout=5)[0] == 'sphere'
+    assert third.result(timeout=5) == ('unknown', None)
+    assert [shape for shape, _ in results] == ['sphere', 'unknown']
+
+
+def test_detector_failure_reaches_the_caller(controller):
+    ctrl, pipeline = controller(FailingBackend())
+    called = threading.Event()
+    analysis = ctrl.request_object_analysis('cube', on_result=lambda result: called.set())
+    pipeline.start()
+    with pytest.raises(RuntimeError, match="camera unplugged"):
+        analysis.result(timeout=5)
+    assert not called.is_set()
+    assert pipeline.get_stats()['failed'] == 1
+
+
+def test_analysis_needs_a_pipeline(robotics):
+    ctrl = robotics.RobotController(None, None, None, robotics.ShapeVolumeDetection())
+    with pytest.raises(RuntimeError):
+        ctrl.request_object_analysis('cube')
@@ -0,0 +1,50 @@
+import importlib
+
+import pytest
+
+from robotics.power_model import DrainRateEstimator
+
+
+def test_split_intervals_weigh_like_one_interval():
+    whole = DrainRateEstimator(prior_rate=1.0)
+    whole.update(0.0, 100.0)
+    whole.update(600.0, 97.0)  # 0.3 %/min over 10 minutes
+
+    split = DrainRateEstimator(prior_rate=1.0)
+    for i in range(61):
+        split.update(i * 10.0, 100.0 - 0.3 * i * 10.0 / 60.0)
+
+    assert split.rate == pytest.approx(whole.rate)
+    assert split.rate == pytest.approx(0.3 + 0.7 * 0.9 ** 10)
+
+
+def test_quantized_readings_do_not_inflate_variance():
+    # True drain 0.3 %/min read every second with 0.1 % resolution.
+    weighted = DrainRateEstimator(prior_rate=0.3)
+    # reference_min of one reading interval: every reading weighs the same.
+    per_reading = DrainRateEstimator(prior_rate=0.3, reference_min=1 / 60)
+    for second in range(3600):
+        level = round(100.0 - 0.3 * second / 60.0, 1)
+        weighted.update(float(second), level)
+        per_reading.update(float(second), level)
+    assert weighted.rate == pytest.approx(0.3, rel=0.05)
+    assert weighted.std < 0.25 * per_reading.std
+    assert weighted.runtime(50.0)['lower'] > 4 * per_reading.runtime(50.0)['lower']
+
+
+def test_stop_does_not_count_as_low_drain():
+    vehicle = importlib.import_module('vehicle')
+    sim = vehicle.VehicleSim(seed=1, write_files=False)
+    sim.route = [(37.7749, -122.4194), (47.6062, -122.3321)]
+    sim.position = sim.route[0]
+    prior = sim.drain_estimator.rate
+    now = 1.76e9
+    sim.step(commands=[{'action': 'start'}], now=now)
+    for _ in range(5):
+        now += vehicle.TICK_INTERVAL
+        sim.step(commands=[], now=now)
+    sim.step(commands=[{'action': 'stop'}], now=now + vehicle.TICK_INTERVAL)
+    now += 60.0
+    sim.step(commands=[{'action': 'start'}], now=now)
+    sim.step(commands=[], now=now + vehicle.TICK_INTERVAL)
+    assert sim.drain_estimator.rate == pytest.approx(prior)
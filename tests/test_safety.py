@@ -0,0 +1,58 @@
+import pytest
+
+
+def test_rules_are_edge_triggered(robotics):
+    safety = robotics.SafetySystem()
+    assert safety.check_conditions({'temperature': 70.0}, timestamp=0.0) == ['overheat', 'High Temperature']
+    assert safety.check_conditions({'temperature': 71.0}, timestamp=1.0) == []
+    assert safety.emergency_override
+    # Hysteresis: 59 is below the trip point but not 2 degrees below it.
+    assert safety.rule_engine.evaluate({'temperature': 59.0}, 2.0) == ([], [])
+    assert safety.rule_engine.evaluate({'temperature': 57.0}, 3.0) == ([], ['overheat'])
+    assert safety.check_conditions({'temperature': 65.0}, timestamp=4.0) == ['overheat']
+
+
+def test_missing_channel_holds_its_last_value(robotics):
+    safety = robotics.SafetySystem()
+    safety.check_conditions({'temperature': 70.0, 'collision_risk': False}, timestamp=0.0)
+    overrides = [entry for entry in safety.safety_log if entry[1] == 'emergency_override']
+    assert len(overrides) == 1
+
+    for t, frame in enumerate([{}, {'temperature': None}, {'collision_risk': False}, {'temperature': 70.0}], 1):
+        assert safety.rule_engine.evaluate(frame, float(t)) == ([], [])
+    assert 'overheat' in safety.rule_engine.active_rules()
+    assert len([entry for entry in safety.safety_log if entry[1] == 'emergency_override']) == 1
+
+    engine = safety.rule_engine
+    vector = engine.frame_vector({'temperature': 50.0})
+    assert engine.evaluate(vector, 10.0) == ([], ['overheat'])
+    # NaN in a vector frame also means "no new reading".
+    assert engine.evaluate(engine.frame_vector({}), 11.0) == ([], [])
+
+
+def test_multi_condition_rules(robotics, monkeypatch):
+    monkeypatch.setattr(robotics.control, 'ENVIRONMENT_CONDITION_RULES', [
+        ('Fire Risk', [('temperature', '>', 45), ('humidity', '<', 20)]),
+        ('High Noise', [('sound_level', '>', 85)]),
+    ])
+    engine = robotics.SafetyRuleEngine(robotics.control.default_safety_rules())
+    assert engine.evaluate({'temperature': 50.0, 'humidity': 30.0, 'sound_level': 40.0}, 0.0) == ([], [])
+    assert engine.evaluate({'humidity': 10.0, 'sound_level': 90.0}, 1.0) == (['Fire Risk', 'High Noise'], [])
+    assert engine.evaluate({'temperature': 40.0}, 2.0) == ([], ['Fire Risk'])
+
+
+def test_debounce(robotics):
+    engine = robotics.SafetyRuleEngine([
+        {'name': 'hot', 'channel': 'temperature', 'op': '>=', 'threshold': 60, 'debounce': 1.0},
+    ])
+    assert engine.evaluate({'temperature': 60.0}, 0.0) == ([], [])
+    assert engine.evaluate({'temperature': 61.0}, 0.5) == ([], [])
+    assert engine.evaluate({'temperature': 61.0}, 1.0) == (['hot'], [])
+    assert engine.evaluate({'temperature': 59.0}, 1.5) == ([], ['hot'])
+
+
+@pytest.mark.parametrize('threshold', [20, 35])
+def test_low_power_rule_follows_power_monitor(robotics, threshold):
+    safety = robotics.SafetySystem(power_monitor=robotics.PowerMonitor(threshold=threshold))
+    assert safety.check_conditions({'battery_level': threshold + 1.0}, timestamp=0.0) == []
+    assert safety.check_conditions({'battery_level': float(threshold)}, timestamp=1.0) == ['low_power']
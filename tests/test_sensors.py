@@ -0,0 +1,27 @@
+import pytest
+
+T0 = 1.76e9  # time.time() scale
+
+
+@pytest.mark.parametrize('samples', [2, 5, 10, 30, 59, 60, 61, 150])
+def test_slope_over_first_window_with_epoch_timestamps(robotics, samples):
+    log = robotics.SensorTimeSeries(['temperature', 'humidity'], capacity=600, trend_window=60)
+    for i in range(samples):
+        log.append((T0 + i, {'temperature': 30.0 - 0.5 * i, 'humidity': 40.0}))
+    assert log.slope('temperature') == pytest.approx(-0.5, rel=1e-6)
+    assert log.slope('humidity') == pytest.approx(0.0, abs=1e-9)
+    assert log.trend('temperature') == 'falling'
+    assert log.trend('humidity') == 'stable'
+
+
+def test_trend_summary_on_first_reads(robotics, monkeypatch):
+    sensors = robotics.EnvironmentalSensor()
+    clock = iter(T0 + i for i in range(10))
+    monkeypatch.setattr(robotics.sensors.time, 'time', lambda: next(clock))
+    for i in range(10):
+        sensors.readings = {channel: 20.0 for channel in sensors.log.channels}
+        sensors.readings[sensors.log.channels[0]] = 20.0 + 2.0 * i
+        sensors.log_environment()
+    summary = sensors.trend_summary()
+    assert summary[sensors.log.channels[0]] == 'rising'
+    assert all(summary[channel] == 'stable' for channel in sensors.log.channels[1:])
@@ -0,0 +1,180 @@
+import datetime
+import gc
+import socket
+import ssl
+import threading
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from robotics.security import TLSConnectionPool
+
+HOST = 'localhost'
+
+
+@pytest.fixture(scope='module')
+def certificate(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('tls')
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, HOST)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=5))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName(HOST)]), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+    cert_path = directory / 'cert.pem'
+    key_path = directory / 'key.pem'
+    cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ))
+    return str(cert_path), str(key_path)
+
+
+def _serve(certificate, echo=True, close_after_line=False):
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(*certificate)
+    listener = socket.create_server((HOST, 0))
+
+    def serve(conn):
+        try:
+            with context.wrap_socket(conn, server_side=True) as tls:
+                for line in tls.makefile('rb'):
+                    if echo:
+                        tls.sendall(line)
+                    if close_after_line:
+                        return
+        except (OSError, ssl.SSLError):
+            pass
+
+    def accept_loop():
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=serve, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=accept_loop, daemon=True).start()
+    return listener
+
+
+@pytest.fixture
+def client_context(certificate):
+    return ssl.create_default_context(cafile=certificate[0])
+
+
+def _roundtrip(sock, payload=b'ping\n'):
+    sock.sendall(payload)
+    received = b''
+    while not received.endswith(b'\n'):
+        chunk = sock.recv(4096)
+        assert chunk, 'server closed connection'
+        received += chunk
+    return received
+
+
+def test_reuses_idle_connection(certificate, client_context):
+    listener = _serve(certificate)
+    port = listener.getsockname()[1]
+    pool = TLSConnectionPool(context=client_context)
+    try:
+        for _ in range(5):
+            with pool.connection(HOST, port) as sock:
+                assert _roundtrip(sock) == b'ping\n'
+        stats = pool.get_stats()
+        assert stats['connects'] == 1
+        assert stats['reuses'] == 4
+        assert stats['idle'] == 1
+    finally:
+        pool.close()
+        listener.close()
+
+
+def test_send_only_connection_is_reused(certificate, client_context):
+    # TLS 1.3 servers send session tickets the client never reads here.
+    listener = _serve(certificate, echo=False)
+    port = listener.getsockname()[1]
+    pool = TLSConnectionPool(context=client_context)
+    try:
+        for _ in range(5):
+            with pool.connection(HOST, port) as sock:
+                sock.sendall(b'telemetry\n')
+        stats = pool.get_stats()
+        assert stats['connects'] == 1
+        assert stats['reuses'] == 4
+        assert stats['unhealthy'] == 0
+    finally:
+        pool.close()
+        listener.close()
+
+
+def test_new_connection_resumes_session(certificate, client_context):
+    listener = _serve(certificate)
+    port = listener.getsockname()[1]
+    pool = TLSConnectionPool(context=client_context, max_idle_per_host=0)
+    try:
+        for _ in range(3):
+            with pool.connection(HOST, port) as sock:
+                _roundtrip(sock)
+        stats = pool.get_stats()
+        assert stats['connects'] == 3
+        assert stats['resumed'] == 2
+    finally:
+        pool.close()
+        listener.close()
+
+
+def test_connection_closed_by_server_is_replaced(certificate, client_context):
+    listener = _serve(certificate, echo=False, close_after_line=True)
+    port = listener.getsockname()[1]
+    pool = TLSConnectionPool(context=client_context)
+    try:
+        sock = pool.acquire(HOST, port)
+        sock.sendall(b'last\n')
+        sock.settimeout(5)
+        assert sock.recv(1) == b''  # wait for the server's close
+        pool.release(sock)
+        with pool.connection(HOST, port):
+            pass
+        stats = pool.get_stats()
+        assert stats['connects'] == 2
+        assert stats['unhealthy'] == 1
+    finally:
+        pool.close()
+        listener.close()
+
+
+def test_sockets_closed_by_the_caller_are_forgotten(certificate, client_context):
+    listener = _serve(certificate)
+    port = listener.getsockname()[1]
+    pool = TLSConnectionPool(context=client_context)
+    try:
+        # The pre-pool secure_communication contract: the caller closes the socket.
+        for _ in range(3):
+            sock = pool.acquire(HOST, port)
+            _roundtrip(sock)
+            sock.close()
+        dropped = pool.acquire(HOST, port)
+        kept = pool.acquire(HOST, port)
+        del dropped
+        gc.collect()
+        assert pool.get_stats()['checked_out'] == 1
+        pool.release(kept)
+        stats = pool.get_stats()
+        assert stats['checked_out'] == 0
+        assert stats['idle'] == 1
+    finally:
+        pool.close()
+        listener.close()
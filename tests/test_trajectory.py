@@ -0,0 +1,53 @@
+import pytest
+
+from robotics.mechanical import ArmRotation, ArmTrajectory, RobotArm
+
+
+@pytest.fixture
+def arm():
+    arm = RobotArm()
+    arm.active = True
+    rotation = ArmRotation(arm)
+    rotation.active = True
+    return arm, rotation
+
+
+@pytest.mark.parametrize('options', [{'step': 0}, {'step': -1.0}, {'rotation_step': 0}])
+def test_plan_rejects_non_positive_steps(options):
+    with pytest.raises(ValueError):
+        ArmTrajectory.plan((0, 0, 0, 0), [(3, 0, 0)], **options)
+
+
+def test_on_pose_sees_the_arm_at_each_pose(arm):
+    arm, rotation = arm
+    trajectory = ArmTrajectory.plan((0, 0, 0, 0), [(3, 0, 0, 30)], rotation_step=10.0)
+    seen = []
+    arm.follow_trajectory(trajectory, rotation=rotation,
+                          on_pose=lambda pose, t: seen.append((*arm.position, rotation.rotation_angle)))
+    assert seen == [tuple(float(v) for v in pose) for pose in trajectory.poses]
+    assert (*arm.position, rotation.rotation_angle) == trajectory.final_pose
+
+
+def test_failing_callback_leaves_the_arm_at_the_last_pose_reached(arm):
+    arm, rotation = arm
+    trajectory = ArmTrajectory.plan((0, 0, 0, 0), [(5, 0, 0)])
+
+    def stop_at_third(pose, t):
+        if pose[0] == 3:
+            raise RuntimeError("setpoint rejected")
+
+    with pytest.raises(RuntimeError):
+        arm.follow_trajectory(trajectory, rotation=rotation, on_pose=stop_at_third)
+    assert arm.position == (3.0, 0.0, 0.0)
+
+
+def test_simulate_leaves_the_arm_in_place(arm):
+    arm, rotation = arm
+    trajectory = ArmTrajectory.plan((0, 0, 0, 0), [(2, 2, 2, 45)])
+    poses = []
+    final = arm.follow_trajectory(trajectory, rotation=rotation, simulate=True,
+                                  on_pose=lambda pose, t: poses.append(pose))
+    assert final == (2.0, 2.0, 2.0, 45.0)
+    assert len(poses) == len(trajectory)
+    assert arm.position == (0, 0, 0)
+    assert rotation.rotation_angle == 0
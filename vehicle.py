@@ -3,7 +3,15 @@ import json
 import time
 import math
 import random
-from datetime import datetime
+from datetime import datetime, timezone
+from power_model import DrainRateEstimator
+from mission_log import MissionRecorder
+from _package import load_package
+from profiler import MAX_DURATION as PROFILE_MAX_DURATION, SamplingProfiler
+
+# metrics through the package, so there is one registry per process.
+load_package()
+from robotics.metrics import REGISTRY  # noqa: E402
 
 DATA_DIR = os.path.dirname(__file__)
 STATUS_FILE = os.path.join(DATA_DIR, 'vehicle_status.json')
@@ -11,6 +19,7 @@ LOG_FILE = os.path.join(DATA_DIR, 'vehicle_logs.txt')
 COMMAND_FILE = os.path.join(DATA_DIR, 'vehicle_commands.json')
 RECON_FILE = os.path.join(DATA_DIR, 'recon_data.json')
 RECON_LOG = os.path.join(DATA_DIR, 'recon_log.txt')
+METRICS_FILE = os.path.join(DATA_DIR, 'vehicle_metrics.prom')
 
 # Default route: list of (lat, lon) tuples
 DEFAULT_ROUTE = [
@@ -20,12 +29,54 @@ DEFAULT_ROUTE = [
     (37.4419, -122.1430),  # Palo Alto
 ]
 
+TICK_INTERVAL = 2  # seconds between simulation updates
+BATTERY_DRAIN_PER_TICK = 0.01
+BATTERY_RESERVE = 10.0  # percent to keep in hand when planning a route
+CHECKPOINT_HISTORY = 50  # hazards/recon entries kept in mission log checkpoints
+PROFILE_DURATION = 10.0  # default seconds sampled by a 'profile' command
+
 HAZARD_TYPES = [
     'snow', 'wind', 'hurricane', 'tornado', 'tree', 'car crash', 'flood', 'fire', 'ice', 'fog', 'rockslide'
 ]
 
+TICK_SECONDS = REGISTRY.histogram('vehicle_tick_seconds', 'Duration of one VehicleSim step')
+TICK_PHASE_SECONDS = REGISTRY.histogram('vehicle_tick_phase_seconds', 'Duration of each phase of a step', ('phase',))
+_COMMANDS_PHASE = TICK_PHASE_SECONDS.labels('commands')
+_MOVE_PHASE = TICK_PHASE_SECONDS.labels('move')
+_STATUS_PHASE = TICK_PHASE_SECONDS.labels('status')
+TICK_OVERRUNS = REGISTRY.counter('vehicle_tick_overruns', 'Steps that took longer than TICK_INTERVAL')
+COMMAND_QUEUE_DEPTH = REGISTRY.gauge('vehicle_command_queue_depth', 'Commands found in the last read of the command file')
+COMMAND_AGE_SECONDS = REGISTRY.histogram('vehicle_command_age_seconds', 'Time from a command being issued to it being applied')
+COMMANDS_APPLIED = REGISTRY.counter('vehicle_commands', 'Commands applied by action', ('action',))
+STATUS_WRITE_SECONDS = REGISTRY.histogram('vehicle_status_write_seconds', 'Time to write the status file')
+RECON_WRITE_SECONDS = REGISTRY.histogram('vehicle_recon_write_seconds', 'Time to write the recon data file')
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None).isoformat()
+
 class VehicleSim:
-    def __init__(self):
+    def __init__(self, seed=None, clock=time.time, write_files=True, data_dir=None):
+        """
+        seed fixes every random draw the simulation makes, clock supplies
+        timestamps and write_files=False keeps status, logs and recon data
+        in memory only (used when replaying a mission log). data_dir puts
+        this vehicle's files somewhere other than DATA_DIR, e.g. its own
+        directory under the dashboard's VEHICLE_FLEET_DIR.
+        """
+        data_dir = data_dir or DATA_DIR
+        self.status_file = os.path.join(data_dir, os.path.basename(STATUS_FILE))
+        self.log_file = os.path.join(data_dir, os.path.basename(LOG_FILE))
+        self.command_file = os.path.join(data_dir, os.path.basename(COMMAND_FILE))
+        self.recon_file = os.path.join(data_dir, os.path.basename(RECON_FILE))
+        self.recon_log = os.path.join(data_dir, os.path.basename(RECON_LOG))
+        self.metrics_file = os.path.join(data_dir, os.path.basename(METRICS_FILE))
+        self.data_dir = data_dir
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2**63)
+        self.rng = random.Random(self.seed)
+        self.clock = clock
+        self.write_files = write_files
+        self.now = None
+        self.recorder = None
         self.route = DEFAULT_ROUTE.copy()
         self.current_idx = 0
         self.position = self.route[0]
@@ -37,6 +88,10 @@ class VehicleSim:
         self.recon_mode = False
         self.hazards = []  # List of detected hazards
         self.recon_data = []  # Recon log for dashboard
+        self.drain_estimator = DrainRateEstimator(
+            prior_rate=BATTERY_DRAIN_PER_TICK * 60 / TICK_INTERVAL, reference_min=TICK_INTERVAL / 60
+        )
+        self.profiler = SamplingProfiler()
 
     def move_towards_next_waypoint(self):
         if not self.route or self.current_idx >= len(self.route):
@@ -59,25 +114,72 @@ class VehicleSim:
         else:
             self.position = (lat + dlat/dist*self.speed, lon + dlon/dist*self.speed)
             self.status = 'enroute'
-            if self.recon_mode and random.random() < 0.1:
+            if self.recon_mode and self.rng.random() < 0.1:
                 self.perform_recon_scan(self.position)
-        self.battery = max(0.0, self.battery - 0.01)
+        self.battery = max(0.0, self.battery - BATTERY_DRAIN_PER_TICK)
+        self.drain_estimator.update(self._now(), self.battery)
 
-    def handle_commands(self):
-        if not os.path.exists(COMMAND_FILE):
-            return
+    def remaining_distance(self, route=None, start_idx=None):
+        route = self.route if route is None else route
+        idx = self.current_idx if start_idx is None else start_idx
+        total = 0.0
+        lat, lon = self.position
+        for tlat, tlon in route[idx:]:
+            total += math.hypot(tlat - lat, tlon - lon)
+            lat, lon = tlat, tlon
+        return total
+
+    def check_route_feasibility(self, route=None, start_idx=None, reserve=BATTERY_RESERVE):
+        """Compare the time a route needs with the pessimistic runtime left above reserve."""
+        required_min = self.remaining_distance(route, start_idx) / self.speed * TICK_INTERVAL / 60
+        runtime = self.drain_estimator.runtime(self.battery, reserve)
+        return {
+            'feasible': runtime['lower'] is not None and runtime['lower'] >= required_min,
+            'required_min': required_min,
+            'runtime_min': runtime['minutes'],
+            'runtime_min_lower': runtime['lower'],
+        }
+
+    def _log_if_infeasible(self):
+        check = self.check_route_feasibility()
+        if not check['feasible']:
+            self.log_event(
+                f"Warning: route needs ~{check['required_min']:.0f} min but battery allows "
+                f"~{check['runtime_min_lower']:.0f} min above {BATTERY_RESERVE}% reserve"
+            )
+
+    def _now(self):
+        # Frozen for the duration of a step so recorded and replayed ticks match.
+        return self.now if self.now is not None else self.clock()
+
+    def read_commands(self):
+        """Consume pending commands from the command file."""
+        if not os.path.exists(self.command_file):
+            return []
         try:
-            with open(COMMAND_FILE) as f:
+            with open(self.command_file) as f:
                 commands = json.load(f)
         except Exception:
             commands = []
-        if not commands:
-            return
+        COMMAND_QUEUE_DEPTH.set(len(commands))
+        if commands:
+            with open(self.command_file, 'w') as f:
+                json.dump([], f)
+        return commands
+
+    def handle_commands(self):
+        self.apply_commands(self.read_commands())
+
+    def apply_commands(self, commands):
         for cmd in commands:
             cmd_id = str(cmd)
             if cmd_id == self.last_command_id:
                 continue
             action = cmd.get('action')
+            COMMANDS_APPLIED.labels(action).inc()
+            issued_at = cmd.get('issued_at')
+            if isinstance(issued_at, (int, float)):
+                COMMAND_AGE_SECONDS.observe(max(self._now() - issued_at, 0.0))
             if action == 'start':
                 self.status = 'enroute'
                 self.log_event('Vehicle started')
@@ -93,6 +195,7 @@ class VehicleSim:
                 self.position = self.route[0]
                 self.status = 'enroute'
                 self.log_event(f"Route added: {self.route}")
+                self._log_if_infeasible()
             elif action == 'delete_route':
                 self.route = []
                 self.current_idx = 0
@@ -104,6 +207,7 @@ class VehicleSim:
                 self.position = self.route[0]
                 self.status = 'enroute'
                 self.log_event(f"Route updated: {self.route}")
+                self._log_if_infeasible()
             elif action == 'reroute':
                 self.route = self.simulate_reroute()
                 self.current_idx = 0
@@ -117,20 +221,51 @@ class VehicleSim:
             elif action == 'stop_recon':
                 self.recon_mode = False
                 self.log_event('Recon mission stopped')
+            elif action == 'profile':
+                self.start_profile(cmd.get('duration', PROFILE_DURATION), cmd.get('interval'))
             self.last_command_id = cmd_id
-        with open(COMMAND_FILE, 'w') as f:
-            json.dump([], f)
+
+    def start_profile(self, duration=PROFILE_DURATION, interval=None):
+        """
+        Sample the calling thread (normally the run loop) for duration
+        seconds and write a collapsed-stack profile_<ts>.folded to data_dir.
+        Replays (write_files=False) skip it.
+        """
+        if not self.write_files:
+            return
+        if self.profiler.running:
+            self.log_event('Profile already in progress; request ignored')
+            return
+        try:
+            duration = min(max(float(duration), 0.0), PROFILE_MAX_DURATION)
+            if interval is not None:
+                self.profiler.interval = max(float(interval), 0.001)
+        except (TypeError, ValueError):
+            self.log_event(f"Invalid profile request: duration={duration!r} interval={interval!r}")
+            return
+        path = os.path.join(self.data_dir, f"profile_{int(self._now())}.folded")
+        self.profiler.start(duration, path, on_complete=self._profile_done)
+        self.log_event(f"Profiling for {duration:g} s every {self.profiler.interval * 1000:g} ms")
+
+    def _profile_done(self, result):
+        if 'error' in result:
+            self.log_event(f"Profile could not be written to {result['path']}: {result['error']}")
+            return
+        self.log_event(
+            f"Profile written to {os.path.basename(result['path'])}: {result['samples']} samples, "
+            f"{result['distinct_stacks']} distinct stacks over {result['elapsed_s']:.1f} s"
+        )
 
     def perform_recon_scan(self, location):
         # Simulate detection of hazards/objects
         detected = []
-        if random.random() < 0.4:  # 40% chance to detect something
-            hazard_type = random.choice(HAZARD_TYPES)
+        if self.rng.random() < 0.4:  # 40% chance to detect something
+            hazard_type = self.rng.choice(HAZARD_TYPES)
             hazard = {
                 'type': hazard_type,
                 'location': {'lat': location[0], 'lon': location[1]},
-                'timestamp': datetime.utcnow().isoformat() + 'Z',
-                'severity': random.choice(['minor', 'moderate', 'severe'])
+                'timestamp': _iso(self._now()) + 'Z',
+                'severity': self.rng.choice(['minor', 'moderate', 'severe'])
             }
             self.hazards.append(hazard)
             detected.append(hazard)
@@ -143,27 +278,31 @@ class VehicleSim:
         # Simulate recon image/sensor data
         recon_entry = {
             'location': {'lat': location[0], 'lon': location[1]},
-            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'timestamp': _iso(self._now()) + 'Z',
             'detected': detected,
-            'image': f"recon_image_{int(time.time())}.jpg",
+            'image': f"recon_image_{int(self._now())}.jpg",
             'sensors': {
-                'temperature': round(random.uniform(-10, 40), 1),
-                'wind_speed': round(random.uniform(0, 100), 1),
-                'humidity': round(random.uniform(10, 90), 1)
+                'temperature': round(self.rng.uniform(-10, 40), 1),
+                'wind_speed': round(self.rng.uniform(0, 100), 1),
+                'humidity': round(self.rng.uniform(10, 90), 1)
             }
         }
         self.recon_data.append(recon_entry)
         self.log_recon(f"Recon scan at {location}: {recon_entry}")
         # Save recon data to file
-        with open(RECON_FILE, 'w') as f:
-            json.dump(self.recon_data, f, indent=2)
+        if not self.write_files:
+            return
+        with RECON_WRITE_SECONDS.time():
+            with open(self.recon_file, 'w') as f:
+                json.dump(self.recon_data, f, indent=2)
 
     def simulate_reroute(self):
         lat, lon = self.position
-        new_wp = (lat + random.uniform(0.01, 0.05), lon + random.uniform(0.01, 0.05))
+        new_wp = (lat + self.rng.uniform(0.01, 0.05), lon + self.rng.uniform(0.01, 0.05))
         return [self.position, new_wp, DEFAULT_ROUTE[-1]]
 
     def write_status(self):
+        runtime_min = self.drain_estimator.runtime(self.battery)['minutes']
         status = {
             'position': {'lat': self.position[0], 'lon': self.position[1]},
             'battery': self.battery,
@@ -173,27 +312,115 @@ class VehicleSim:
             'reroute_reason': self.reroute_reason,
             'hazards': self.hazards[-10:],  # last 10 hazards
             'recon_mode': self.recon_mode,
-            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'estimated_runtime_min': runtime_min if runtime_min is not None and math.isfinite(runtime_min) else None,
+            'timestamp': _iso(self._now()) + 'Z',
         }
-        with open(STATUS_FILE, 'w') as f:
-            json.dump(status, f, indent=2)
+        if self.write_files:
+            with STATUS_WRITE_SECONDS.time():
+                with open(self.status_file, 'w') as f:
+                    json.dump(status, f, indent=2)
+        return status
 
     def log_event(self, msg):
-        with open(LOG_FILE, 'a') as f:
-            f.write(f"[{datetime.utcnow().isoformat()}] {msg}\n")
+        if not self.write_files:
+            return
+        with open(self.log_file, 'a') as f:
+            f.write(f"[{_iso(self._now())}] {msg}\n")
 
     def log_recon(self, msg):
-        with open(RECON_LOG, 'a') as f:
-            f.write(f"[{datetime.utcnow().isoformat()}] {msg}\n")
+        if not self.write_files:
+            return
+        with open(self.recon_log, 'a') as f:
+            f.write(f"[{_iso(self._now())}] {msg}\n")
 
-    def run(self):
-        while True:
-            self.handle_commands()
+    def get_state(self):
+        """JSON-serializable simulation state for mission log checkpoints."""
+        version, internal, gauss_next = self.rng.getstate()
+        return {
+            'route': self.route,
+            'current_idx': self.current_idx,
+            'position': self.position,
+            'speed': self.speed,
+            'battery': self.battery,
+            'status': self.status,
+            'reroute_reason': self.reroute_reason,
+            'last_command_id': self.last_command_id,
+            'recon_mode': self.recon_mode,
+            'hazards': self.hazards[-CHECKPOINT_HISTORY:],
+            'recon_data': self.recon_data[-CHECKPOINT_HISTORY:],
+            'drain_estimator': self.drain_estimator.get_state(),
+            'rng': [version, internal, gauss_next],
+        }
+
+    def restore_state(self, state):
+        self.route = [tuple(waypoint) for waypoint in state['route']]
+        self.current_idx = state['current_idx']
+        self.position = tuple(state['position'])
+        self.speed = state['speed']
+        self.battery = state['battery']
+        self.status = state['status']
+        self.reroute_reason = state['reroute_reason']
+        self.last_command_id = state['last_command_id']
+        self.recon_mode = state['recon_mode']
+        self.hazards = list(state['hazards'])
+        self.recon_data = list(state['recon_data'])
+        self.drain_estimator.restore_state(state['drain_estimator'])
+        version, internal, gauss_next = state['rng']
+        self.rng.setstate((version, tuple(internal), gauss_next))
+
+    def step(self, commands=None, now=None):
+        """
+        One simulation tick: apply commands (read from the command file when
+        not given), move if under way and write the status.
+
+        Returns:
+            The status snapshot
+        """
+        self.now = self.clock() if now is None else now
+        started = time.perf_counter()
+        try:
+            if commands is None:
+                commands = self.read_commands()
+            if self.recorder is not None:
+                self.recorder.record_tick(self.now, commands)
+            self.apply_commands(commands)
+            moved = time.perf_counter()
+            _COMMANDS_PHASE.observe(moved - started)
             if (self.status.startswith('enroute') or self.status == 'rerouted') and not self.status.startswith('paused'):
                 self.move_towards_next_waypoint()
-            self.write_status()
-            time.sleep(2)
+            else:
+                # Battery only drains while moving; don't average the stop in.
+                self.drain_estimator.pause()
+            wrote = time.perf_counter()
+            _MOVE_PHASE.observe(wrote - moved)
+            status = self.write_status()
+            if self.recorder is not None:
+                self.recorder.record_status(self.now, status)
+            finished = time.perf_counter()
+            _STATUS_PHASE.observe(finished - wrote)
+            TICK_SECONDS.observe(finished - started)
+            if finished - started > TICK_INTERVAL:
+                TICK_OVERRUNS.inc()
+            return status
+        finally:
+            self.now = None
+
+    def run(self):
+        while True:
+            self.step()
+            if self.write_files:
+                REGISTRY.write_textfile(self.metrics_file)
+            time.sleep(TICK_INTERVAL)
 
 if __name__ == '__main__':
-    sim = VehicleSim()
-    sim.run() 
\ No newline at end of file
+    seed = os.environ.get('VEHICLE_SEED')
+    sim = VehicleSim(seed=int(seed) if seed else None, data_dir=os.environ.get('VEHICLE_DATA_DIR'))
+    mission_log = os.environ.get('VEHICLE_MISSION_LOG')
+    recorder = None
+    if mission_log:
+        recorder = MissionRecorder(mission_log, sim=sim, tick_interval=TICK_INTERVAL, start_time=time.time())
+    try:
+        sim.run()
+    finally:
+        if recorder is not None:
+            recorder.close() 
\ No newline at end of file